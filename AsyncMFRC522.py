@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from MFRC522 import MFRC522, CardPresence
+
+
+class AsyncMFRC522:
+    """
+    asyncio front-end for `MFRC522`.
+
+    Every call is serialized with an asyncio lock and executed on a single worker thread,
+    so the RF exchange (including busy-polling or blocking on the IRQ pin) never stalls the
+    event loop, and the driver is only ever touched by one thread.
+
+    ```
+    MIFAREReader = AsyncMFRC522()
+    async for (event, uid) in MIFAREReader.cards():
+        if event == MIFAREReader.CARD_ARRIVED:
+            await MIFAREReader.select_tag(uid)
+            data = await MIFAREReader.dump_classic1k_data(key, uid)
+    ```
+
+    Args:
+        reader (MFRC522): The driver to wrap. If omitted, one is created from `kwargs`.
+        **kwargs: Passed on to `MFRC522` if no reader is given.
+    """
+    CARD_ARRIVED = MFRC522.CARD_ARRIVED
+    CARD_DEPARTED = MFRC522.CARD_DEPARTED
+
+    def __init__(self, reader=None, **kwargs):
+        self.__executor__ = ThreadPoolExecutor(max_workers=1)
+        self.__lock__ = None
+        if reader is None:
+            # Created on the worker thread, like every later access
+            reader = self.__executor__.submit(MFRC522, **kwargs).result()
+        self.reader = reader
+
+    async def run(self, function, *args, **kwargs):
+        """
+        Run any method of the wrapped reader, e.g. `await run(MIFAREReader.reader.Read, 8)`.
+        Calls are executed one after the other in the order they acquired the lock.
+        """
+        if self.__lock__ is None:
+            # Created lazily so that it binds to the running event loop
+            self.__lock__ = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+        async with self.__lock__:
+            return await loop.run_in_executor(self.__executor__, lambda: function(*args, **kwargs))
+
+    def close(self):
+        """Shut down the worker thread."""
+        self.__executor__.shutdown(wait=True)
+
+    async def request(self, reqMode=MFRC522.PICC_REQIDL):
+        return await self.run(self.reader.Request, reqMode)
+
+    async def anticoll(self):
+        return await self.run(self.reader.Anticoll)
+
+    async def select_tag(self, uid):
+        return await self.run(self.reader.SelectTag, uid)
+
+    async def select_cascade(self):
+        return await self.run(self.reader.SelectCascade)
+
+    async def halt(self):
+        return await self.run(self.reader.Halt)
+
+    async def inventory(self, reqMode=MFRC522.PICC_REQALL, maxTags=16):
+        return await self.run(self.reader.Inventory, reqMode, maxTags)
+
+    async def auth(self, authMode, blockAddr, key, uid):
+        return await self.run(self.reader.Auth, authMode, blockAddr, key, uid)
+
+    async def auth_with(self, key, blockAddr, uid, authMode=MFRC522.PICC_AUTHENT1A):
+        return await self.run(self.reader.AuthWith, key, blockAddr, uid, authMode)
+
+    async def stop_crypto1(self):
+        return await self.run(self.reader.StopCrypto1)
+
+    async def read(self, blockAddr):
+        return await self.run(self.reader.Read, blockAddr)
+
+    async def write(self, blockAddr, data):
+        return await self.run(self.reader.Write, blockAddr, data)
+
+    async def format_value(self, blockAddr, value, addr=None):
+        return await self.run(self.reader.FormatValue, blockAddr, value, addr)
+
+    async def read_value(self, blockAddr):
+        return await self.run(self.reader.ReadValue, blockAddr)
+
+    async def increment(self, blockAddr, delta, transferAddr=None):
+        return await self.run(self.reader.Increment, blockAddr, delta, transferAddr)
+
+    async def decrement(self, blockAddr, delta, transferAddr=None):
+        return await self.run(self.reader.Decrement, blockAddr, delta, transferAddr)
+
+    async def update_values(self, key, uid, deltas, authMode=MFRC522.PICC_AUTHENT1A):
+        return await self.run(self.reader.UpdateValues, key, uid, deltas, authMode)
+
+    async def write_all(self, key, uid, value):
+        return await self.run(self.reader.WriteAll, key, uid, value)
+
+    async def write_text(self, key, uid, text):
+        return await self.run(self.reader.WriteText, key, uid, text)
+
+    async def read_image(self, key, uid, sectors=None, authMode=MFRC522.PICC_AUTHENT1A, partial=False, data_only=False):
+        return await self.run(self.reader.ReadImage, key, uid, sectors, authMode, partial, data_only)
+
+    async def dump_classic1k(self, key, uid, pretty=True):
+        return await self.run(self.reader.PrettyDumpClassic1K, key, uid, pretty)
+
+    async def dump_classic1k_data(self, key, uid):
+        return await self.run(self.reader.DumpClassic1K_Data, key, uid)
+
+    async def dump_classic1k_text(self, key, uid, print_text=False):
+        return await self.run(self.reader.DumpClassic1K_Text, key, uid, print_text)
+
+    async def poll(self):
+        return await self.run(self.reader.Poll)
+
+    async def cards(self, min_interval=0.01, max_interval=0.5, present_interval=0.05, backoff=2.0, debounce=2):
+        """
+        Asynchronous version of `MFRC522.cards()`. Waiting between polls happens with
+        `asyncio.sleep`, and the lock is released in between so other calls get through.
+        """
+        presence = CardPresence(min_interval, max_interval, present_interval, backoff, debounce)
+        while True:
+            for event in presence.update(await self.poll()):
+                yield event
+            await asyncio.sleep(presence.interval)
@@ -22,38 +22,31 @@ signal.signal(signal.SIGINT, end_read)
 # Create an object of the class MFRC522
 MIFAREReader = MFRC522.MFRC522()
 
-# This loop keeps checking for chips. If one is near it will get the UID and authenticate
-while continue_reading:
+# Wait for tags. The stream backs off while the field is empty
+for (event, uid) in MIFAREReader.cards(stop=lambda: not continue_reading):
 
-    # Scan for cards
-    (status, TagType) = MIFAREReader.Request(MIFAREReader.PICC_REQIDL)
+    # Only act on newly arrived tags
+    if event != MIFAREReader.CARD_ARRIVED:
+        continue
 
-    # If a card is found
-    if status == MIFAREReader.MI_OK:
-        print("Card detected")
+    print("Card detected")
 
-    # Get the UID of the card
-    (status, uid) = MIFAREReader.Anticoll()
+    # Print UID
+    print("Card read UID: " + str(uid[0]) + "," + str(uid[1]) + "," + str(uid[2]) + "," + str(uid[3]))
 
-    # If we have the UID, continue
-    if status == MIFAREReader.MI_OK:
+    # This is the default key for authentication
+    key = [0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF]
 
-        # Print UID
-        print("Card read UID: " + str(uid[0]) + "," + str(uid[1]) + "," + str(uid[2]) + "," + str(uid[3]))
+    # Select the scanned tag
+    MIFAREReader.SelectTag(uid)
 
-        # This is the default key for authentication
-        key = [0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF]
+    # Dump the data
+    # if your terminal can't display xterm256 colors, use either
+    # PrettyDumpClassic1K(key, uid, pretty=False)
+    # or
+    # DumpClassic1K(key, uid)
+    MIFAREReader.PrettyDumpClassic1K(key, uid)
 
-        # Select the scanned tag
-        MIFAREReader.SelectTag(uid)
+    MIFAREReader.StopCrypto1()
 
-        # Dump the data
-        # if your terminal can't display xterm256 colors, use either
-        # PrettyDumpClassic1K(key, uid, pretty=False)
-        # or
-        # DumpClassic1K(key, uid)
-        MIFAREReader.PrettyDumpClassic1K(key, uid)
-
-        MIFAREReader.StopCrypto1()
-
-        continue_reading = False
+    break
@@ -1,11 +1,18 @@
 #!/usr/bin/env python
 # -*- coding: utf8 -*-
 
-import RPi.GPIO as GPIO
-import spi
+import math
 import signal
+import struct
 import time
 import errors
+import calibration
+import crc
+from image import ClassicImage, decode_value, encode_value
+from keys import KeyRing
+from layout import CLASSIC_1K, layout_for_sak
+from metrics import timed
+from retry import OperationResult, RetryPolicy
 from xterm256_Colors import tcolors
 
 
@@ -27,13 +34,59 @@ class MFRC522:
     Actions that read/write to multiple sectors can ommit the authentication part, since
     it is done internally multiple times for the different sectors.
 
+    The reader remembers the sector it is authenticated for. Calling `Auth` again for the
+    same sector, uid and key is answered from that session, and `Read`/`Write` on a block
+    of another sector reauthenticate with the last used key on their own.
+
+    Selecting a tag also picks its memory layout from the SAK (see `layout.layout_for_sak`),
+    so the bulk helpers and dumps cover MIFARE Classic Mini, 1K, 2K and 4K tags alike.
+
     Args:
         dev (string): The socket to use. "/dev/spidev0.0" by default.
-        spd (int): The speed at which to clock. 1000000 by default.
+        spd (int): The speed at which to clock. The one found by `Calibrate` for `dev`, or 1000000 if it was never calibrated.
+        transport (object): The bus to talk over. If omitted, a `transport.SpiTransport`
+            is opened on `dev`. Pass a `simulator.SimulatedTransport` to run without hardware.
+        crc_check (boolean): Whether or not to cross-check every host side CRC with the CalcCRC
+            command of the chip. False by default.
+        use_irq (boolean): Whether or not to block on the IRQ pin instead of polling the interrupt
+            request registers. Requires the IRQ line to be wired (see `irq_pin`). False by default.
+        irq_timeout (int): The time in milliseconds to wait for the IRQ pin, or for the timer of the chip when polling. 100 by default.
+        reset_pin (int): The board pin wired to the RST line. .NRSTPD by default.
+        irq_pin (int): The board pin wired to the IRQ line. .IRQ by default.
+        cs_pin (int): The board pin driving the SDA line, for several readers on one socket. None by default.
+        metrics (metrics.Metrics): Instrumentation to record into. None (disabled) by default.
+        cache (cache.ImageCache): Cache for `ReadImage` and the `Dump*` helpers. None (disabled) by default.
+        timeouts (dict): Timeouts in microseconds overriding .TIMEOUTS, e.g. {"request": 500}.
+        trace (string): Record every SPI transaction to this file, see `spitrace`. Nothing is recorded by default.
+        retry (retry.RetryPolicy): How to retry failed exchanges. 3 attempts with a short backoff by default.
     """
+    # Readers are created in numbers (see MFRC522Pool) and polled continuously, so no per instance dict
+    __slots__ = (
+        "crc_check", "metrics", "cache", "shadow", "use_irq", "irq_timeout", "auth_session", "auth_credentials", "transport",
+        "timeouts", "timer_prescaler", "timer_reloads", "retry", "results", "denied", "layout",
+        "__register_frame__", "__write_frame__", "__read_frames__", "__frame__", "__frame_view__", "__back__", "__back_view__",
+    )
+
     NRSTPD = 22
+    IRQ = 18
 
     MAX_LEN = 16
+    FIFO_SIZE = 64
+
+    # Clock of the timer unit in Hz
+    TIMER_CLOCK = 13560000
+    # Time the tag gets to start its answer, per kind of exchange, in microseconds. The timer starts
+    # once the frame is sent and stops with the first received bit, so these only cover the frame
+    # delay of the tag. An empty field is detected after the "request" timeout. HALT and the second
+    # phase of value operations are never answered, their timeout is how long silence takes.
+    TIMEOUTS = {
+        "request": 1000,  # REQA, WUPA, anticollision and select
+        "halt": 1000,
+        "read": 10000,
+        "auth": 10000,
+        "write": 10000,  # Including the EEPROM programming, value operations and transfer
+        "value": 2000,
+    }
 
     PCD_IDLE       = 0x00
     PCD_AUTHENT    = 0x0E
@@ -46,6 +99,9 @@ class MFRC522:
     PICC_REQIDL    = 0x26
     PICC_REQALL    = 0x52
     PICC_ANTICOLL  = 0x93
+    PICC_ANTICOLL2 = 0x95
+    PICC_ANTICOLL3 = 0x97
+    PICC_CT        = 0x88
     PICC_SElECTTAG = 0x93
     PICC_AUTHENT1A = 0x60
     PICC_AUTHENT1B = 0x61
@@ -61,6 +117,9 @@ class MFRC522:
     MI_NOTAGERR = 1
     MI_ERR      = 2
 
+    CARD_ARRIVED  = "arrived"
+    CARD_DEPARTED = "departed"
+
     Reserved00     = 0x00
     CommandReg     = 0x01
     CommIEnReg     = 0x02
@@ -129,21 +188,17 @@ class MFRC522:
     Reserved33      = 0x3E
     Reserved34      = 0x3F
 
-    data_blocks = [4, 5, 6,
-                   8, 9, 10,
-                   12, 13, 14,
-                   16, 17, 18,
-                   20, 21, 22,
-                   24, 25, 26,
-                   28, 29, 30,
-                   32, 33, 34,
-                   36, 37, 38,
-                   40, 41, 42,
-                   44, 45, 46,
-                   48, 49, 50,
-                   52, 53, 54,
-                   56, 57, 58,
-                   60, 61, 62]
+    # Configuration registers only ever changed by the host. Their last written value is kept
+    # in a shadow, so reading them (e.g. for SetBitMask/ClearBitMask) needs no bus access.
+    # Status, interrupt request, FIFO and command registers are changed by the chip and never shadowed.
+    SHADOW_REGS = frozenset([
+        CommIEnReg, DivlEnReg, WaterLevelReg, BitFramingReg,
+        ModeReg, TxModeReg, RxModeReg, TxControlReg, TxAutoReg, TxSelReg, RxSelReg, RxThresholdReg, DemodReg, MifareReg,
+        ModWidthReg, RFCfgReg, GsNReg, CWGsPReg, ModGsPReg, TModeReg, TPrescalerReg, TReloadRegH, TReloadRegL,
+    ])
+
+    # The data blocks of a 1K tag, see `layout.Layout.data_blocks` for the other types
+    data_blocks = list(CLASSIC_1K.data_blocks)
     serNum = []
 
     __default_block_print__ = tcolors.GRAY_50 + "Block{{:>3s}} |{color}{{dataA}}{{dataAB}}{{dataP}}{{dataB}}{end}"
@@ -155,49 +210,247 @@ class MFRC522:
         3: __default_block_print__.format(color=tcolors.ENDC, end="")
     }
 
-    def __init__(self, dev='/dev/spidev0.0', spd=1000000):
-        spi.openSPI(device=dev, speed=spd)
-        GPIO.setmode(GPIO.BOARD)
-        GPIO.setup(22, GPIO.OUT)
-        GPIO.output(self.NRSTPD, 1)
+    def __init__(self, dev='/dev/spidev0.0', spd=None, transport=None, crc_check=False, use_irq=False, irq_timeout=100,
+                 reset_pin=None, irq_pin=None, cs_pin=None, metrics=None, cache=None, timeouts=None, trace=None,
+                 retry=None):
+        self.crc_check = crc_check
+        self.metrics = metrics
+        # Optional cache.ImageCache for ReadImage and the Dump* helpers
+        self.cache = cache
+        self.shadow = {}
+        if self.metrics is not None:
+            self.metrics.register_names = self.RegisterNames()
+        self.use_irq = use_irq
+        self.irq_timeout = irq_timeout
+        self.timeouts = dict(self.TIMEOUTS)
+        self.timeouts.update(timeouts or {})
+        (self.timer_prescaler, self.timer_reloads) = self.TimerSettings(self.timeouts)
+        self.retry = retry if retry is not None else RetryPolicy()
+        # retry.OperationResult of every operation of the last Read, Write or bulk helper
+        self.results = []
+        # Whether or not the tag refused the last failed block operation (a NAK), retrying does not help then
+        self.denied = False
+        # layout.Layout of the tag selected last, according to its SAK
+        self.layout = CLASSIC_1K
+        # (uid, sector, authMode, key) Crypto1 is currently established for
+        self.auth_session = None
+        # (uid, authMode, key) of the last successful authentication, used for lazy reauthentication
+        self.auth_credentials = None
+        # Preallocated buffers, reused by every transaction: register accesses, FIFO bursts (address + up to
+        # FIFO_SIZE bytes, one read frame per register), PICC frames and the bytes received from the tag
+        self.__register_frame__ = bytearray(2)
+        self.__write_frame__ = bytearray(self.FIFO_SIZE + 1)
+        self.__read_frames__ = {}
+        self.__frame__ = bytearray(self.FIFO_SIZE)
+        self.__frame_view__ = memoryview(self.__frame__)
+        self.__back__ = bytearray(self.MAX_LEN)
+        self.__back_view__ = memoryview(self.__back__)
+        if transport is None:
+            # Imported here so that the driver can be used off the Pi with another transport
+            from transport import SpiTransport
+            reset_pin = reset_pin if reset_pin is not None else self.NRSTPD
+            irq_pin = irq_pin if irq_pin is not None else self.IRQ
+            if spd is None:
+                spd = calibration.load_speed(dev, cs_pin) or 1000000
+            transport = SpiTransport(dev, spd, reset_pin, irq_pin if use_irq else None, cs_pin)
+        if trace is not None:
+            from spitrace import TraceRecorder
+            transport = TraceRecorder(transport, trace)
+        self.transport = transport
+        self.transport.set_reset(1)
         self.Init()
 
     def __del__(self):
-        GPIO.cleanup()
+        if getattr(self, "transport", None) is not None:
+            self.Close()
+
+    def Close(self):
+        """
+        Release the transport, e.g. the GPIO pins of the reader. Calling it again does nothing.
+        """
+        (transport, self.transport) = (self.transport, None)
+        if transport is not None:
+            transport.close()
 
     def __get_pretty_string__(self, block_number):
         if block_number == 0:
             return self.__colored_print__[0]
         elif block_number == 1 or block_number == 2:
             return self.__colored_print__[1]
-        elif block_number % 4 == 3:
+        elif block_number < self.layout.blocks and self.layout.trailer_flags[block_number]:
             return self.__colored_print__[2]
         else:
             return self.__colored_print__[3]
 
     def Init(self):
-        GPIO.output(self.NRSTPD, 1)
+        self.transport.set_reset(1)
 
         self.Reset()
 
-        self.Write_MFRC522(self.TModeReg, 0x8D)
-        self.Write_MFRC522(self.TPrescalerReg, 0x3E)
-        self.Write_MFRC522(self.TReloadRegL, 30)
-        self.Write_MFRC522(self.TReloadRegH, 0)
+        # TAuto: the timer starts at the end of every transmission
+        self.Write_MFRC522(self.TModeReg, 0x80 | (self.timer_prescaler >> 8))
+        self.Write_MFRC522(self.TPrescalerReg, self.timer_prescaler & 0xFF)
+        self.Write_MFRC522(self.TReloadRegL, 0xFF)
+        self.SetTimeout("request")
 
         self.Write_MFRC522(self.TxAutoReg, 0x40)
         self.Write_MFRC522(self.ModeReg, 0x3D)
+        if self.use_irq:
+            # Drive the IRQ pin push-pull, interrupt sources are enabled per command
+            self.Write_MFRC522(self.DivlEnReg, 0x80)
         self.AntennaOn()
 
+    def Calibrate(self, speeds=calibration.SPEEDS, rounds=3, margin=1, persist=True):
+        """
+        Find the fastest SPI clock the wiring reliably works at, see `calibration.calibrate`,
+        and switch to it. Readers created later on for the same socket start at that speed.
+
+        Args:
+            speeds ([int]): The clocks to try in Hz, slowest first. calibration.SPEEDS by default.
+            rounds (int): The number of link checks per speed. 3 by default.
+            margin (int): How many steps to stay below the fastest speed that passed. 1 by default.
+            persist (boolean): Whether or not to remember the speed for the socket. True by default.
+
+        Returns:
+            int: The chosen speed in Hz.
+
+        Raises:
+            errors.LinkException: If the link does not even work at the slowest speed.
+        """
+        spd = calibration.calibrate(self, speeds, rounds, margin)
+        # Only transports on a real socket can be found again
+        dev = getattr(self.transport, "dev", None)
+        if persist and dev is not None:
+            calibration.save_speed(dev, spd, getattr(self.transport, "cs_pin", None))
+        # The checks bypassed the shadow and may have left registers behind at a failing speed
+        self.Init()
+        return spd
+
+    @classmethod
+    def TimerSettings(cls, timeouts):
+        """
+        Convert timeouts into settings of the timer unit. All timeouts share one prescaler, the
+        smallest one that fits the longest timeout. Reload values are rounded up to multiples of
+        256 ticks, so TReloadRegL stays 0xFF and switching between timeouts is a single write of
+        TReloadRegH (none if it is the same as before, see SHADOW_REGS).
+
+        Args:
+            timeouts (dict): Name to timeout in microseconds.
+
+        Returns:
+            (int, dict): The 12 bit prescaler and per name the value of TReloadRegH.
+        """
+        cycles = dict((name, int(math.ceil(us * cls.TIMER_CLOCK / 1000000.0))) for (name, us) in timeouts.items())
+        # One tick takes 2 * prescaler + 1 cycles, the timer counts at most 65536 ticks
+        longest = max(list(cycles.values()) + [1])
+        prescaler = min(int(math.ceil(longest / 65536.0)) // 2, 0xFFF)
+        step = 256 * (2 * prescaler + 1)
+        reloads = dict((name, min(max(0, int(math.ceil(n / float(step))) - 1), 0xFF)) for (name, n) in cycles.items())
+        return (prescaler, reloads)
+
+    def SetTimeout(self, name):
+        """
+        Switch the timer to a timeout profile, see .TIMEOUTS.
+
+        Args:
+            name (string): The name of the profile.
+        """
+        reload = self.timer_reloads[name]
+        if self.shadow.get(self.TReloadRegH) != reload:
+            self.Write_MFRC522(self.TReloadRegH, reload)
+
     def Reset(self):
         self.Write_MFRC522(self.CommandReg, self.PCD_RESETPHASE)
+        # Every register is back at its reset value
+        self.shadow = {}
+
+    @classmethod
+    def RegisterNames(cls):
+        """
+        Returns:
+            dict: The name of every register by address.
+        """
+        return dict((getattr(cls, name), name) for name in dir(cls) if "Reg" in name and isinstance(getattr(cls, name), int))
 
     def Write_MFRC522(self, addr, val):
-        spi.transfer(((addr << 1) & 0x7E, val))
+        if addr in self.SHADOW_REGS:
+            self.shadow[addr] = val
+        if self.metrics is not None:
+            self.metrics.register_write(addr)
+        frame = self.__register_frame__
+        frame[0] = (addr << 1) & 0x7E
+        frame[1] = val
+        self.transport.transfer(frame)
 
     def Read_MFRC522(self, addr):
-        val = spi.transfer((((addr << 1) & 0x7E) | 0x80, 0))
-        return val[1]
+        val = self.shadow.get(addr)
+        if val is not None:
+            return val
+        if self.metrics is not None:
+            self.metrics.register_read(addr)
+        frame = self.__register_frame__
+        frame[0] = ((addr << 1) & 0x7E) | 0x80
+        frame[1] = 0
+        val = self.transport.transfer(frame)[1]
+        if addr in self.SHADOW_REGS:
+            self.shadow[addr] = val
+        return val
+
+    def Write_MFRC522_Burst(self, addr, vals):
+        """
+        Write several values to the same register in a single SPI transaction.
+        The MFRC522 keeps the address of the first byte for all following bytes,
+        which makes this the fast path for filling the FIFO.
+
+        Args:
+            addr (uint8): The register to write to, usually .FIFODataReg.
+            vals ([uint8] or bytes-like): The values to write in order.
+        """
+        count = len(vals)
+        if count == 0:
+            return
+        if self.metrics is not None:
+            self.metrics.register_write(addr, count)
+        if count > self.FIFO_SIZE:
+            self.transport.transfer(bytearray([(addr << 1) & 0x7E]) + bytearray(vals))
+            return
+        frame = self.__write_frame__
+        frame[0] = (addr << 1) & 0x7E
+        frame[1:count + 1] = vals
+        self.transport.transfer(memoryview(frame)[0:count + 1])
+
+    def Read_MFRC522_Burst(self, addr, count, into=None):
+        """
+        Read the same register several times in a single SPI transaction. Every
+        transmitted byte but the last one repeats the address, so the chip returns
+        one value per clocked byte.
+
+        Args:
+            addr (uint8): The register to read from, usually .FIFODataReg.
+            count (int): The number of values to read, at most .FIFO_SIZE.
+            into (bytearray): Where to store the values instead of a new buffer.
+
+        Returns:
+            bytearray: The values read in order, `into` if given.
+        """
+        if into is None:
+            into = bytearray(max(count, 0))
+        if count <= 0:
+            return into
+        if self.metrics is not None:
+            self.metrics.register_read(addr, count)
+        byte = ((addr << 1) & 0x7E) | 0x80
+        frame = self.__read_frames__.get(addr)
+        if frame is None:
+            frame = self.__read_frames__[addr] = bytearray([byte] * (self.FIFO_SIZE + 1))
+        # Terminate the frame after `count` addresses for this transaction only
+        frame[count] = 0
+        try:
+            val = self.transport.transfer(memoryview(frame)[0:count + 1])
+        finally:
+            frame[count] = byte
+        into[0:count] = val[1:count + 1]
+        return into
 
     def SetBitMask(self, reg, mask):
         tmp = self.Read_MFRC522(reg)
@@ -215,8 +468,33 @@ class MFRC522:
     def AntennaOff(self):
         self.ClearBitMask(self.TxControlReg, 0x03)
 
-    def ToCard(self, command, sendData):
-        backData = []
+    def WaitIRq(self, reg):
+        """
+        Block until the IRQ pin signals an enabled interrupt or `irq_timeout` milliseconds passed.
+
+        Args:
+            reg (uint8): The interrupt request register to read once the pin fired.
+
+        Returns:
+            uint8: The content of `reg`, or None on timeout.
+        """
+        if self.transport.wait_for_irq(self.irq_timeout):
+            return self.Read_MFRC522(reg)
+        return None
+
+    def ToCard(self, command, sendData, allowColl=False, timeout=None):
+        """
+        Args:
+            command (uint8): The command to execute, .PCD_TRANSCEIVE or .PCD_AUTHENT.
+            sendData ([uint8] or bytes-like): The bytes to put into the FIFO.
+            allowColl (boolean): Whether a bit collision is part of a successful answer, as during anticollision. False by default.
+            timeout (string): The timeout profile to use, see .TIMEOUTS. The timer is left as it is by default.
+
+        Returns:
+            (int, memoryview, int): The status, the received bytes and the number of received bits. The received
+                bytes are a view of a buffer of the reader that the next exchange overwrites, copy them to keep them.
+        """
+        backData = self.__back_view__[0:0]
         backLen = 0
         status = self.MI_ERR
         irqEn = 0x00
@@ -232,31 +510,49 @@ class MFRC522:
             irqEn = 0x77
             waitIRq = 0x30
 
-        self.Write_MFRC522(self.CommIEnReg, irqEn | 0x80)
-        self.ClearBitMask(self.CommIrqReg, 0x80)
-        self.SetBitMask(self.FIFOLevelReg, 0x80)
+        if timeout is not None:
+            self.SetTimeout(timeout)
+        if self.use_irq:
+            # Only the completion, error and timer interrupts may pull the IRQ pin
+            self.Write_MFRC522(self.CommIEnReg, waitIRq | 0x83)
+        else:
+            self.Write_MFRC522(self.CommIEnReg, irqEn | 0x80)
+        # Set1 cleared, so every marked request bit is cleared. FlushBuffer is the only writable bit.
+        self.Write_MFRC522(self.CommIrqReg, 0x7F)
+        self.Write_MFRC522(self.FIFOLevelReg, 0x80)
 
         self.Write_MFRC522(self.CommandReg, self.PCD_IDLE)
 
-        while(i < len(sendData)):
-            self.Write_MFRC522(self.FIFODataReg, sendData[i])
-            i = i + 1
+        self.Write_MFRC522_Burst(self.FIFODataReg, sendData)
 
         self.Write_MFRC522(self.CommandReg, command)
         if command == self.PCD_TRANSCEIVE:
             self.SetBitMask(self.BitFramingReg, 0x80)
 
-        i = 2000
-        while True:
-            n = self.Read_MFRC522(self.CommIrqReg)
-            i = i - 1
-            if ~((i != 0) and ~(n & 0x01) and ~(n & waitIRq)):
-                break
+        if self.use_irq:
+            n = self.WaitIRq(self.CommIrqReg)
+            i = 0 if n is None else 1
+        else:
+            # The timer of the chip bounds the wait, see TIMEOUTS. The deadline only guards
+            # against a chip that never raises TimerIRq, e.g. because it is not connected.
+            deadline = time.monotonic() + self.irq_timeout / 1000.0
+            i = 1
+            iterations = 0
+            while True:
+                n = self.Read_MFRC522(self.CommIrqReg)
+                iterations += 1
+                if n & (waitIRq | 0x01):
+                    break
+                if time.monotonic() > deadline:
+                    i = 0
+                    break
+            if self.metrics is not None:
+                self.metrics.poll("ToCard", iterations)
 
         self.ClearBitMask(self.BitFramingReg, 0x80)
 
         if i != 0:
-            if (self.Read_MFRC522(self.ErrorReg) & 0x1B) == 0x00:
+            if (self.Read_MFRC522(self.ErrorReg) & (0x13 if allowColl else 0x1B)) == 0x00:
                 status = self.MI_OK
 
                 if n & irqEn & 0x01:
@@ -275,42 +571,56 @@ class MFRC522:
                     if n > self.MAX_LEN:
                         n = self.MAX_LEN
 
-                    i = 0
-                    while i < n:
-                        backData.append(self.Read_MFRC522(self.FIFODataReg))
-                        i = i + 1
+                    self.Read_MFRC522_Burst(self.FIFODataReg, n, self.__back__)
+                    backData = self.__back_view__[0:n]
             else:
                 status = self.MI_ERR
 
+        if self.metrics is not None:
+            if i == 0:
+                self.metrics.error("timeout")
+            elif status == self.MI_NOTAGERR:
+                self.metrics.error("no_tag")
+            elif status != self.MI_OK:
+                self.metrics.error("error")
+
+        if status != self.MI_OK:
+            # The tag most likely fell back to IDLE, Crypto1 is gone with it
+            self.auth_session = None
+
         return (status, backData, backLen)
 
+    @timed("REQA")
     def Request(self, reqMode):
         status = None
         backBits = None
-        TagType = []
 
+        self.auth_session = None
         self.Write_MFRC522(self.BitFramingReg, 0x07)
 
-        TagType.append(reqMode)
-        (status, backData, backBits) = self.ToCard(self.PCD_TRANSCEIVE, TagType)
+        self.__frame__[0] = reqMode
+        (status, backData, backBits) = self.ToCard(self.PCD_TRANSCEIVE, self.__frame_view__[0:1], timeout="request")
 
         if ((status != self.MI_OK) | (backBits != 0x10)):
             status = self.MI_ERR
 
         return (status, backBits)
 
+    @timed("ANTICOLL")
     def Anticoll(self):
-        backData = []
+        """
+        Returns:
+            (int, bytes): The status and the 4 byte uid followed by its check byte.
+        """
         serNumCheck = 0
 
-        serNum = []
-
         self.Write_MFRC522(self.BitFramingReg, 0x00)
 
-        serNum.append(self.PICC_ANTICOLL)
-        serNum.append(0x20)
+        frame = self.__frame__
+        frame[0] = self.PICC_ANTICOLL
+        frame[1] = 0x20
 
-        (status, backData, backBits) = self.ToCard(self.PCD_TRANSCEIVE, serNum)
+        (status, backData, backBits) = self.ToCard(self.PCD_TRANSCEIVE, self.__frame_view__[0:2], timeout="request")
 
         if(status == self.MI_OK):
             i = 0
@@ -323,83 +633,461 @@ class MFRC522:
             else:
                 status = self.MI_ERR
 
-        return (status, backData)
+        return (status, bytes(backData))
+
+    @timed("ANTICOLL")
+    def SelectCascade(self):
+        """
+        Resolve and select one tag after a successful `Request`, running the bit oriented
+        anticollision of every cascade level. Works with several tags in the field and
+        with 4, 7 and 10 byte uids. The tag with a 1 in the first colliding bit wins.
+
+        Returns:
+            (int, bytes, uint8): The status, the complete uid (without cascade tags and check bytes) and the SAK.
+        """
+        uid = []
+        self.auth_session = None
+        # Bits received after a collision must read as 0, the known bits are merged in below
+        self.ClearBitMask(self.CollReg, 0x80)
+        for sel in (self.PICC_ANTICOLL, self.PICC_ANTICOLL2, self.PICC_ANTICOLL3):
+            known = []
+            knownBits = 0
+            while True:
+                count = knownBits // 8
+                extra = knownBits % 8
+                buf = [sel, ((2 + count) << 4) | extra] + known[0:count + (1 if extra else 0)]
+                # The last byte is only sent up to the known bits and the answer is aligned to them
+                self.Write_MFRC522(self.BitFramingReg, (extra << 4) | extra)
+                (status, backData, backBits) = self.ToCard(self.PCD_TRANSCEIVE, buf, allowColl=True, timeout="request")
+                if status != self.MI_OK or len(backData) == 0:
+                    return (self.MI_ERR, None, 0)
+                cascade = known[0:count] + list(backData)
+                if extra:
+                    mask = (1 << extra) - 1
+                    cascade[count] = (known[count] & mask) | (backData[0] & ~mask & 0xFF)
+                coll = self.Read_MFRC522(self.CollReg)
+                if coll & 0x20:
+                    break
+                # Position of the first collision in the answer, 0 stands for 32
+                pos = (coll & 0x1F) or 32
+                if count * 8 + pos <= knownBits or count * 8 + pos > 32:
+                    return (self.MI_ERR, None, 0)
+                knownBits = count * 8 + pos
+                # Continue with the tags that sent a 1 at that position
+                cascade[(knownBits - 1) // 8] |= 1 << ((knownBits - 1) % 8)
+                known = cascade
+
+            if len(cascade) != 5 or cascade[0] ^ cascade[1] ^ cascade[2] ^ cascade[3] != cascade[4]:
+                return (self.MI_ERR, None, 0)
+
+            self.Write_MFRC522(self.BitFramingReg, 0x00)
+            buf = [sel, 0x70] + cascade
+            buf += self.CRC(buf)
+            (status, backData, backBits) = self.ToCard(self.PCD_TRANSCEIVE, buf, timeout="request")
+            if status != self.MI_OK or backBits != 0x18:
+                return (self.MI_ERR, None, 0)
+            sak = backData[0]
+
+            uid += cascade[1:4] if cascade[0] == self.PICC_CT else cascade[0:4]
+            # The cascade bit tells whether the uid continues on the next level
+            if not sak & 0x04:
+                if self.auth_credentials is not None and self.auth_credentials[0] != tuple(uid[-4:]):
+                    self.auth_credentials = None
+                self.layout = layout_for_sak(sak)
+                return (self.MI_OK, bytes(bytearray(uid)), sak)
+        return (self.MI_ERR, None, 0)
+
+    @timed("HALT")
+    def Halt(self):
+        """
+        Put the selected tag into HALT. It then only answers a wake up (.PICC_REQALL) again.
+
+        Returns:
+            int: .MI_OK, or .MI_ERR if the tag answered (with a NAK).
+        """
+        self.Write_MFRC522(self.BitFramingReg, 0x00)
+        frame = self.__frame__
+        frame[0] = self.PICC_HALT
+        frame[1] = 0x00
+        (status, backData, backBits) = self.ToCard(self.PCD_TRANSCEIVE, self.__with_crc__(2), timeout="halt")
+        self.StopCrypto1()
+        # HALT is never acknowledged, silence means success
+        if status == self.MI_OK and backBits > 0:
+            return self.MI_ERR
+        return self.MI_OK
+
+    def Inventory(self, reqMode=PICC_REQALL, maxTags=16):
+        """
+        Find every tag in the field: each one is resolved with `SelectCascade` and halted,
+        so the next request is only answered by the remaining tags. All found tags are left
+        in HALT, wake them up with `Request(.PICC_REQALL)` to talk to them again.
+
+        Args:
+            reqMode (uint8): .PICC_REQALL (default) to include halted tags, .PICC_REQIDL to skip them.
+            maxTags (int): Stop after this many tags. 16 by default.
+
+        Returns:
+            [([uint8], uint8)]: The uid and SAK of every tag found.
+        """
+        tags = []
+        # Tags left READY by the previous round drop to IDLE on the first request and only answer the next one
+        attempts = 2
+        while len(tags) < maxTags and attempts > 0:
+            self.auth_session = None
+            self.Write_MFRC522(self.BitFramingReg, 0x07)
+            # Different uid sizes collide in the ATQA, any answer means there are tags left.
+            # Only the first round may wake up halted tags, later ones would find the tags halted by this inventory.
+            mode = reqMode if len(tags) == 0 else self.PICC_REQIDL
+            (status, backData, backBits) = self.ToCard(self.PCD_TRANSCEIVE, [mode], allowColl=True, timeout="request")
+            if status != self.MI_OK or backBits != 0x10:
+                attempts -= 1
+                continue
+            (status, uid, sak) = self.SelectCascade()
+            if status != self.MI_OK:
+                attempts -= 1
+                continue
+            tags.append((uid, sak))
+            self.Halt()
+            attempts = 2
+        return tags
+
+    def CRC(self, data):
+        """
+        Calculate the CRC_A of a frame on the host. Two byte (command, block) frames are
+        looked up from a precomputed table. If `crc_check` is enabled, the result is
+        compared with the one of the chip (see `CalulateCRC`).
+
+        Args:
+            data ([uint8]): The frame to calculate the CRC for.
+
+        Returns:
+            [uint8]: The two CRC bytes, least significant byte first.
+
+        Raises:
+            errors.CRCMismatchException: If `crc_check` is enabled and the chip disagrees.
+        """
+        if len(data) == 2:
+            result = crc.crc_a_command(data[0], data[1])
+        else:
+            result = crc.crc_a(data)
+        if self.crc_check and self.CalulateCRC(data) != result:
+            raise errors.CRCMismatchException
+        return result
+
+    def __with_crc__(self, length):
+        """
+        Append the CRC_A to the first `length` bytes of the frame buffer, see `CRC`.
+
+        Returns:
+            memoryview: The complete frame.
+        """
+        frame = self.__frame__
+        view = self.__frame_view__
+        if length == 2:
+            result = crc.crc_a_command(frame[0], frame[1])
+            frame[2] = result[0]
+            frame[3] = result[1]
+        else:
+            value = crc.crc_a_update(view[0:length])
+            frame[length] = value & 0xFF
+            frame[length + 1] = value >> 8
+        if self.crc_check and self.CalulateCRC(view[0:length]) != list(view[length:length + 2]):
+            raise errors.CRCMismatchException
+        return view[0:length + 2]
 
     def CalulateCRC(self, pIndata):
-        self.ClearBitMask(self.DivIrqReg, 0x04)
-        self.SetBitMask(self.FIFOLevelReg, 0x80)
-        i = 0
-        while i < len(pIndata):
-            self.Write_MFRC522(self.FIFODataReg, pIndata[i])
-            i = i + 1
+        # Set2 cleared, so only CRCIRq is cleared
+        self.Write_MFRC522(self.DivIrqReg, 0x04)
+        self.Write_MFRC522(self.FIFOLevelReg, 0x80)
+        self.Write_MFRC522_Burst(self.FIFODataReg, pIndata)
+        if self.use_irq:
+            self.Write_MFRC522(self.CommIEnReg, 0x80)
+            self.Write_MFRC522(self.DivlEnReg, 0x84)
         self.Write_MFRC522(self.CommandReg, self.PCD_CALCCRC)
-        i = 0xFF
-        while True:
-            n = self.Read_MFRC522(self.DivIrqReg)
-            i = i - 1
-            if not ((i != 0) and not (n & 0x04)):
-                break
+        if self.use_irq:
+            self.WaitIRq(self.DivIrqReg)
+            self.Write_MFRC522(self.DivlEnReg, 0x80)
+        else:
+            i = 0xFF
+            while True:
+                n = self.Read_MFRC522(self.DivIrqReg)
+                i = i - 1
+                if not ((i != 0) and not (n & 0x04)):
+                    break
+            if self.metrics is not None:
+                self.metrics.poll("CalulateCRC", 0xFF - i)
+                if not (n & 0x04):
+                    self.metrics.error("crc_timeout")
         pOutData = []
         pOutData.append(self.Read_MFRC522(self.CRCResultRegL))
         pOutData.append(self.Read_MFRC522(self.CRCResultRegM))
         return pOutData
 
+    @timed("SELECT")
     def SelectTag(self, serNum):
-        backData = []
-        buf = []
-        buf.append(self.PICC_SElECTTAG)
-        buf.append(0x70)
-        buf += serNum[0:5]
-        pOut = self.CalulateCRC(buf)
-        buf += pOut
-        (status, backData, backLen) = self.ToCard(self.PCD_TRANSCEIVE, buf)
+        # Anticoll returns an empty uid if no tag answered
+        if len(serNum) < 4:
+            return 0
+        frame = self.__frame__
+        frame[0] = self.PICC_SElECTTAG
+        frame[1] = 0x70
+        frame[2:6] = serNum[0:4]
+        # The check byte is computed if only the uid was passed
+        frame[6] = serNum[4] if len(serNum) > 4 else serNum[0] ^ serNum[1] ^ serNum[2] ^ serNum[3]
+        self.auth_session = None
+        if self.auth_credentials is not None and self.auth_credentials[0] != tuple(serNum[0:4]):
+            self.auth_credentials = None
+        (status, backData, backLen) = self.ToCard(self.PCD_TRANSCEIVE, self.__with_crc__(7), timeout="request")
 
         if (status == self.MI_OK) and (backLen == 0x18):
+            self.layout = layout_for_sak(backData[0])
             return backData[0]
         else:
             return 0
 
+    @timed("AUTH")
     def Auth(self, authMode, BlockAddr, Sectorkey, serNum):
         """
         Authenticate with the tag. After a successful authentication you are
         authorized (according to the access bits) for the whole sector.
         You only need to reauthenticate when you are switching sectors.
 
+        If Crypto1 is still established for the same uid, sector, authMode and key,
+        only the MFCrypto1On bit is checked and the 3-pass authentication is skipped.
+
         Returns:
             int: The status of the authentication. Either one of .MI_OK, .MI_NOTAGERR, .MI_ERR.
+
+        Raises:
+            errors.InvalidValueException: If the key does not have 6 bytes or the block lies outside of `layout`.
         """
-        buff = []
+        uid = self.__auth_uid__(serNum)
+        if len(uid) != 4:
+            return self.MI_ERR
+        session = (tuple(uid), self.__sector__(BlockAddr), authMode, tuple(Sectorkey))
+        if self.auth_session == session:
+            if self.Read_MFRC522(self.Status2Reg) & 0x08:
+                return self.MI_OK
+            self.auth_session = None
+
+        if len(Sectorkey) != 6:
+            raise errors.InvalidValueException("A key has 6 bytes.")
+        frame = self.__frame__
 
         # First byte should be the authMode (A or B)
-        buff.append(authMode)
+        frame[0] = authMode
 
         # Second byte is the trailerBlock (usually 7)
-        buff.append(BlockAddr)
+        frame[1] = BlockAddr
 
         # Now we need to append the authKey which usually is 6 bytes of 0xFF
-        buff += Sectorkey[0:len(Sectorkey)]
+        frame[2:8] = Sectorkey[0:6]
 
-        # Next we append the first 4 bytes of the UID
-        buff += serNum[0:4]
+        # Next we append the 4 bytes of the UID
+        frame[8:12] = uid
 
         # Now we start the authentication itself
-        (status, backData, backLen) = self.ToCard(self.PCD_AUTHENT, buff)
+        (status, backData, backLen) = self.ToCard(self.PCD_AUTHENT, self.__frame_view__[0:12], timeout="auth")
 
         # Check if an error occurred
         if not(status == self.MI_OK):
             print("AUTH ERROR!!")
-        if not (self.Read_MFRC522(self.Status2Reg) & 0x08) != 0:
+        crypto1_on = (self.Read_MFRC522(self.Status2Reg) & 0x08) != 0
+        if not crypto1_on:
             print("AUTH ERROR(status2reg & 0x08) != 0")
+            # Without Crypto1 the exchange did not authenticate anything, whatever the status said
+            status = self.MI_ERR
+
+        # Remember the session for subsequent calls
+        if status == self.MI_OK and crypto1_on:
+            self.auth_session = session
+            self.auth_credentials = (session[0], authMode, session[3])
+        else:
+            # Never fall back to the key of an earlier authentication behind the back of the caller
+            self.auth_session = None
+            self.auth_credentials = None
 
         # Return the status
         return status
 
+    @staticmethod
+    def __auth_uid__(serNum):
+        # Double and triple size uids authenticate with their last 4 bytes, 5 bytes are a single size uid with its check byte
+        return list(serNum[-4:]) if len(serNum) in (7, 10) else list(serNum[0:4])
+
+    def AuthWith(self, key, BlockAddr, uid, authMode=PICC_AUTHENT1A):
+        """
+        Authenticate with either one key or a `KeyRing`. The candidates of a key ring are tried
+        in its learned order, and the key that worked is remembered in the ring. A failed attempt
+        leaves the tag in IDLE, so it is woken up and selected again before the next candidate.
+
+        Args:
+            key ([uint8] or KeyRing): The key, or the key ring to take the candidates from.
+            BlockAddr (uint8): A block of the sector to authenticate.
+            uid ([uint8]): The uid of the card/tag.
+            authMode (uint8): .PICC_AUTHENT1A (default) or .PICC_AUTHENT1B. Ignored for a key ring, which knows the key type.
+
+        Returns:
+            int: The status of the authentication. Either one of .MI_OK, .MI_NOTAGERR, .MI_ERR.
+        """
+        if not isinstance(key, KeyRing):
+            return self.Auth(authMode, BlockAddr, key, uid)
+        sector = self.__sector__(BlockAddr)
+        status = self.MI_ERR
+        for (mode, candidate) in key.candidates(uid, sector):
+            status = self.Auth(mode, BlockAddr, candidate, uid)
+            if status == self.MI_OK:
+                key.learn(uid, sector, mode, candidate)
+                return status
+            if self.Reselect(uid) != self.MI_OK:
+                break
+        return status
+
+    def Reselect(self, uid):
+        """
+        Wake up and select a known tag again, e.g. after a failed authentication. The cascade
+        levels are built from the uid, so no anticollision is needed. A tag that is READY or
+        ACTIVE ignores the wake up and falls back to IDLE, so only the next call selects it.
+
+        Args:
+            uid ([uint8]): The 4, 7 or 10 byte uid of the tag, a 4 byte uid may carry its check byte.
+
+        Returns:
+            int: .MI_OK if the tag was selected, otherwise an error code.
+        """
+        if len(uid) not in (4, 5, 7, 10):
+            return self.MI_ERR
+        (status, TagType) = self.Request(self.PICC_REQALL)
+        if status != self.MI_OK:
+            return status
+        # A single size uid may still carry its check byte
+        rest = list(uid[0:4]) if len(uid) in (4, 5) else list(uid)
+        for sel in (self.PICC_ANTICOLL, self.PICC_ANTICOLL2, self.PICC_ANTICOLL3):
+            cascade = rest[0:4] if len(rest) == 4 else [self.PICC_CT] + rest[0:3]
+            rest = rest[len(cascade) - (0 if len(rest) == 4 else 1):]
+            cascade.append(cascade[0] ^ cascade[1] ^ cascade[2] ^ cascade[3])
+            self.Write_MFRC522(self.BitFramingReg, 0x00)
+            buf = [sel, 0x70] + cascade
+            buf += self.CRC(buf)
+            (status, backData, backBits) = self.ToCard(self.PCD_TRANSCEIVE, buf, timeout="request")
+            if status != self.MI_OK or backBits != 0x18:
+                return self.MI_ERR
+            if not rest:
+                self.layout = layout_for_sak(backData[0])
+                return self.MI_OK
+        return self.MI_ERR
+
     def StopCrypto1(self):
+        self.auth_session = None
         self.ClearBitMask(self.Status2Reg, 0x08)
 
+    def __sector__(self, blockAddr):
+        """
+        Returns:
+            int: The sector of the block according to the layout of the selected tag.
+
+        Raises:
+            errors.InvalidValueException: If the tag has no such block.
+        """
+        layout = self.layout
+        if not 0 <= blockAddr < layout.blocks:
+            raise errors.InvalidValueException("Block {} is outside of the {} layout.".format(blockAddr, layout.name))
+        return layout.sector_of[blockAddr]
+
+    def __first_block__(self, blockAddr):
+        """
+        Returns:
+            int: The first block of the sector of the block, see `__sector__`.
+        """
+        return self.layout.first_blocks[self.__sector__(blockAddr)]
+
+    def __lazy_auth__(self, blockAddr):
+        """
+        Reauthenticate with the key of the last successful authentication if blockAddr lies outside of
+        the current session. A failed `Auth` forgets that key.
+        """
+        if self.auth_credentials is None:
+            return
+        if self.auth_session is not None and self.auth_session[1] == self.__sector__(blockAddr):
+            return
+        (uid, authMode, key) = self.auth_credentials
+        self.Auth(authMode, blockAddr, list(key), list(uid))
+
+    def __backoff__(self, attempts):
+        """
+        Wait before the next attempt of a failed operation, see `retry.RetryPolicy`.
+
+        Returns:
+            boolean: Whether or not another attempt is allowed.
+        """
+        if attempts >= self.retry.attempts:
+            return False
+        time.sleep(self.retry.delay(attempts))
+        return True
+
+    def __recover__(self, key, blockAddr, uid, authMode):
+        """
+        Wake up, select and authenticate the tag again after a failed exchange. Depending on
+        the failure the tag is IDLE or still ACTIVE, in which case only the second wake up works.
+        """
+        for attempt in range(0, 2):
+            if self.Reselect(uid) == self.MI_OK:
+                return self.AuthWith(key, blockAddr, uid, authMode)
+        return self.MI_ERR
+
+    def __auth_retried__(self, key, blockAddr, uid, authMode):
+        """
+        `AuthWith`, retried according to the retry policy.
+
+        Returns:
+            int: The status of the last attempt.
+        """
+        status = self.AuthWith(key, blockAddr, uid, authMode)
+        attempts = 1
+        while status != self.MI_OK and self.__backoff__(attempts):
+            attempts += 1
+            status = self.__recover__(key, blockAddr, uid, authMode)
+        self.results.append(OperationResult("auth", self.__first_block__(blockAddr), status == self.MI_OK, attempts))
+        return status
+
+    def __read_retried__(self, key, blockAddr, uid, authMode):
+        """
+        Read a block, retried according to the retry policy. Crypto1 is established for the sector already.
+        Only transient failures (timeouts, CRC and parity errors) are retried, not a tag refusing the read.
+
+        Returns:
+            memoryview: The 16 bytes of the block until the next exchange (see `ToCard`), or None.
+        """
+        self.denied = False
+        data = self.__read_block__(blockAddr)
+        attempts = 1
+        while data is None and not self.denied and self.__backoff__(attempts):
+            attempts += 1
+            if self.__recover__(key, blockAddr, uid, authMode) == self.MI_OK:
+                data = self.__read_block__(blockAddr)
+        self.results.append(OperationResult("read", blockAddr, data is not None, attempts, data is None and self.denied))
+        return data
+
+    def __write_retried__(self, key, blockAddr, writeData, uid, authMode):
+        """
+        Write a block, retried according to the retry policy, see `__read_retried__`.
+
+        Returns:
+            int: The status of the last attempt.
+        """
+        self.denied = False
+        status = self.__write_block__(blockAddr, writeData)
+        attempts = 1
+        while status != self.MI_OK and not self.denied and self.__backoff__(attempts):
+            attempts += 1
+            if self.__recover__(key, blockAddr, uid, authMode) == self.MI_OK:
+                status = self.__write_block__(blockAddr, writeData)
+        self.results.append(OperationResult("write", blockAddr, status == self.MI_OK, attempts, status != self.MI_OK and self.denied))
+        return status
+
     def Read(self, blockAddr, printData=False, prettyPrint=False):
         """
-        Read data from a block of the tag.
+        Read data from a block of the tag.
 
         Args:
             blockAddr (uint8): The address of the block to read from.
@@ -407,204 +1095,651 @@ class MFRC522:
             prettyPrint (boolean): Whether or not to print the read data using xterm256 colors. False by default. If set to True, implicitly sets printData to True.
 
         Returns:
-            [uint8]: The data read from the defined block.
+            bytes: The data read from the defined block, or None. See `results` for the number of attempts.
+        """
+        self.results = []
+        self.__lazy_auth__(blockAddr)
+        if self.auth_credentials is not None:
+            (uid, authMode, key) = self.auth_credentials
+            backData = self.__read_retried__(list(key), blockAddr, list(uid), authMode)
+        else:
+            backData = self.__read_block__(blockAddr)
+            self.results.append(OperationResult("read", blockAddr, backData is not None))
+        if backData is None:
+            return None
+        backData = bytes(backData)
+
+        if printData or prettyPrint:
+            print(self.FormatBlock(blockAddr, backData, prettyPrint))
+        return backData
+
+    def __refused__(self, status, backData, backLen):
+        """
+        Returns:
+            boolean: Whether or not the answer is a NAK for the operation itself, e.g. because the access bits deny it.
+                NAKs for a parity or CRC error (0x1, 0x5) on the side of the tag are transient, just like timeouts.
+        """
+        return status == self.MI_OK and backLen == 4 and (backData[0] & 0x0F) not in (0x0A, 0x01, 0x05)
+
+    @timed("READ")
+    def __read_block__(self, blockAddr):
+        """
+        Returns:
+            memoryview: The 16 bytes of the block until the next exchange (see `ToCard`), or None.
         """
-        recvData = []
-        recvData.append(self.PICC_READ)
-        recvData.append(blockAddr)
-        pOut = self.CalulateCRC(recvData)
-        recvData += pOut
-        (status, backData, backLen) = self.ToCard(self.PCD_TRANSCEIVE, recvData)
+        frame = self.__frame__
+        frame[0] = self.PICC_READ
+        frame[1] = blockAddr
+        (status, backData, backLen) = self.ToCard(self.PCD_TRANSCEIVE, self.__with_crc__(2), timeout="read")
 
         if not(status == self.MI_OK):
             print("Error while reading!")
 
         if len(backData) == 16:
-            if prettyPrint:
-                dataA  = "".join(" {:>02X}".format(n) for n in backData[0:6])
-                dataAB = "".join(" {:>02X}".format(n) for n in backData[6:9])
-                dataP = "".join(" {:>02X}".format(backData[9]))
-                dataB  = "".join(" {:>02X}".format(n) for n in backData[10:16])
-                print(self.__get_pretty_string__(blockAddr).format(str(blockAddr), dataA=dataA, dataAB=dataAB, dataP=dataP, dataB=dataB))
-            elif printData:
-                print("Block{:>3s} |{}".format(str(blockAddr), "".join(" {:>02X}".format(n) for n in backData)))
             return backData
+        # A NAK sends the tag back to IDLE
+        self.denied = self.__refused__(status, backData, backLen)
+        self.auth_session = None
         return None
 
+    def FormatBlock(self, blockAddr, data, pretty=False):
+        """
+        Format the content of a block as one line of hex values.
+
+        Args:
+            blockAddr (uint8): The address of the block.
+            data ([uint8]): The 16 bytes of the block.
+            pretty (boolean): Whether or not to use xterm256 colors. False by default.
+
+        Returns:
+            string: The formatted line.
+        """
+        if pretty:
+            dataA  = "".join(" {:>02X}".format(n) for n in data[0:6])
+            dataAB = "".join(" {:>02X}".format(n) for n in data[6:9])
+            dataP = "".join(" {:>02X}".format(data[9]))
+            dataB  = "".join(" {:>02X}".format(n) for n in data[10:16])
+            return self.__get_pretty_string__(blockAddr).format(str(blockAddr), dataA=dataA, dataAB=dataAB, dataP=dataP, dataB=dataB)
+        return "Block{:>3s} |{}".format(str(blockAddr), "".join(" {:>02X}".format(n) for n in data))
+
     def Write(self, blockAddr, writeData):
         """
-        Write data to a block on the tag.
+        Write data to a block on the tag.
 
         Args:
             blockAddr (uint8): The address of the block to write to.
-            writeData ([uint8]): The data to write to the defined block.
-        """
-        buff = []
-        buff.append(self.PICC_WRITE)
-        buff.append(blockAddr)
-        crc = self.CalulateCRC(buff)
-        buff += crc
-        (status, backData, backLen) = self.ToCard(self.PCD_TRANSCEIVE, buff)
+            writeData ([uint8] or bytes-like): The 16 bytes to write to the defined block.
+
+        Returns:
+            int: The status of the write. Either .MI_OK or .MI_ERR. See `results` for the number of attempts.
+        """
+        self.results = []
+        self.__lazy_auth__(blockAddr)
+        if self.auth_credentials is not None:
+            (uid, authMode, key) = self.auth_credentials
+            return self.__write_retried__(list(key), blockAddr, writeData, list(uid), authMode)
+        status = self.__write_block__(blockAddr, writeData)
+        self.results.append(OperationResult("write", blockAddr, status == self.MI_OK))
+        return status
+
+    def __invalidate_cache__(self):
+        if self.cache is None:
+            return
+        # Without a session the written tag is unknown, so nothing cached can be trusted
+        self.cache.invalidate(self.auth_session[0] if self.auth_session is not None else None)
+
+    @timed("WRITE")
+    def __write_block__(self, blockAddr, writeData):
+        self.__invalidate_cache__()
+        if len(writeData) < 16:
+            raise errors.InvalidValueException("A block has 16 bytes.")
+        frame = self.__frame__
+        frame[0] = self.PICC_WRITE
+        frame[1] = blockAddr
+        (status, backData, backLen) = self.ToCard(self.PCD_TRANSCEIVE, self.__with_crc__(2), timeout="write")
         if not(status == self.MI_OK) or not(backLen == 4) or not((backData[0] & 0x0F) == 0x0A):
+            self.denied = self.__refused__(status, backData, backLen)
             status = self.MI_ERR
+            self.auth_session = None
 
         # print(str(backLen) + " backdata &0x0F == 0x0A " + str(backData[0] & 0x0F))
         if status == self.MI_OK:
-            i = 0
-            buf = []
-            while i < 16:
-                buf.append(writeData[i])
-                i = i + 1
-            crc = self.CalulateCRC(buf)
-            buf += crc
-            (status, backData, backLen) = self.ToCard(self.PCD_TRANSCEIVE, buf)
+            frame[0:16] = writeData[0:16]
+            (status, backData, backLen) = self.ToCard(self.PCD_TRANSCEIVE, self.__with_crc__(16), timeout="write")
             if not(status == self.MI_OK) or not(backLen == 4) or not((backData[0] & 0x0F) == 0x0A):
+                self.denied = self.__refused__(status, backData, backLen)
+                status = self.MI_ERR
+                self.auth_session = None
                 print("Error while writing")
+        return status
+
+    def FormatValue(self, blockAddr, value, addr=None):
+        """
+        Format a block as value block holding `value`, so that `Increment`, `Decrement`
+        and `Restore` can be used on it.
+
+        Args:
+            blockAddr (uint8): The address of the block.
+            value (int): The signed 32 bit value.
+            addr (uint8): The address byte stored along, see `image.encode_value`. blockAddr by default.
+
+        Returns:
+            int: The status of the write. Either .MI_OK or .MI_ERR.
+        """
+        return self.Write(blockAddr, encode_value(value, blockAddr if addr is None else addr))
+
+    def ReadValue(self, blockAddr):
+        """
+        Returns:
+            int: The value of a value block, or None if it could not be read or is not a value block.
+        """
+        data = self.Read(blockAddr)
+        if data is None:
+            return None
+        value = decode_value(data)
+        return None if value is None else value[0]
+
+    def Increment(self, blockAddr, delta, transferAddr=None):
+        """
+        Add to the value of a value block on the tag, without reading or writing the block from here.
+
+        Args:
+            blockAddr (uint8): The address of the value block.
+            delta (int): The non-negative amount to add.
+            transferAddr (uint8): The block the result is stored to. blockAddr by default.
+
+        Returns:
+            int: The status of the operation. Either .MI_OK or .MI_ERR.
+        """
+        return self.__modify_value__(self.PICC_INCREMENT, blockAddr, delta, transferAddr)
+
+    def Decrement(self, blockAddr, delta, transferAddr=None):
+        """
+        Subtract from the value of a value block on the tag, see `Increment`.
+        """
+        return self.__modify_value__(self.PICC_DECREMENT, blockAddr, delta, transferAddr)
+
+    def Restore(self, blockAddr, transferAddr):
+        """
+        Copy a value block to another block of the same sector, e.g. to a backup block.
+
+        Returns:
+            int: The status of the operation. Either .MI_OK or .MI_ERR.
+        """
+        return self.__modify_value__(self.PICC_RESTORE, blockAddr, 0, transferAddr)
+
+    def Transfer(self, blockAddr):
+        """
+        Store the transfer buffer of the tag, i.e. the result of the last increment, decrement or restore, to a block.
 
-    def WriteAll(self, key, uid, value):
+        Returns:
+            int: The status of the transfer. Either .MI_OK or .MI_ERR.
+        """
+        self.__lazy_auth__(blockAddr)
+        return self.__transfer__(blockAddr)
+
+    def __modify_value__(self, command, blockAddr, delta, transferAddr):
+        if not isinstance(delta, int) or not 0 <= delta <= 0x7FFFFFFF:
+            raise errors.InvalidValueException("Invalid value to add or subtract.")
+        self.__lazy_auth__(blockAddr)
+        if self.__value_op__(command, blockAddr, delta) != self.MI_OK:
+            return self.MI_ERR
+        return self.__transfer__(blockAddr if transferAddr is None else transferAddr)
+
+    @timed("VALUE")
+    def __value_op__(self, command, blockAddr, operand):
+        """
+        Run INCREMENT, DECREMENT or RESTORE. The result goes to the transfer buffer of the tag.
+        """
+        frame = self.__frame__
+        frame[0] = command
+        frame[1] = blockAddr
+        (status, backData, backLen) = self.ToCard(self.PCD_TRANSCEIVE, self.__with_crc__(2), timeout="write")
+        if not(status == self.MI_OK) or not(backLen == 4) or not((backData[0] & 0x0F) == 0x0A):
+            self.auth_session = None
+            status = self.MI_ERR
+        else:
+            session = self.auth_session
+            struct.pack_into("<i", frame, 0, operand)
+            (status, backData, backLen) = self.ToCard(self.PCD_TRANSCEIVE, self.__with_crc__(4), timeout="value")
+            # The second phase is never acknowledged, only a NAK means failure
+            if status == self.MI_OK and backLen > 0:
+                self.auth_session = None
+                status = self.MI_ERR
+            else:
+                self.auth_session = session
+                status = self.MI_OK
+        return status
+
+    @timed("TRANSFER")
+    def __transfer__(self, blockAddr):
+        self.__invalidate_cache__()
+        frame = self.__frame__
+        frame[0] = self.PICC_TRANSFER
+        frame[1] = blockAddr
+        (status, backData, backLen) = self.ToCard(self.PCD_TRANSCEIVE, self.__with_crc__(2), timeout="write")
+        if not(status == self.MI_OK) or not(backLen == 4) or not((backData[0] & 0x0F) == 0x0A):
+            self.auth_session = None
+            return self.MI_ERR
+        return self.MI_OK
+
+    def UpdateValues(self, key, uid, deltas, authMode=PICC_AUTHENT1A):
+        """
+        Add to or subtract from several value blocks. The blocks are grouped by sector, so
+        every sector is authenticated once, and every block costs one operation and one transfer.
+
+        Args:
+            key ([uint8] or KeyRing): The key of the sector trailer blocks, or a key ring (see `AuthWith`).
+            uid ([uint8]): The uid of the card/tag.
+            deltas (dict): Block address to the amount to add, negative amounts are subtracted.
+            authMode (uint8): .PICC_AUTHENT1A (default) or .PICC_AUTHENT1B.
+
+        Returns:
+            [int]: The blocks that were updated. See `results` for what failed.
+        """
+        self.results = []
+        by_sector = {}
+        for block in sorted(deltas):
+            if not isinstance(deltas[block], int) or abs(deltas[block]) > 0x7FFFFFFF:
+                raise errors.InvalidValueException("Invalid value to add or subtract.")
+            by_sector.setdefault(self.__sector__(block), []).append(block)
+
+        updated = []
+        for sector in sorted(by_sector):
+            # Never retried, repeating an increment or decrement is not idempotent
+            status = self.AuthWith(key, by_sector[sector][0], uid, authMode)
+            self.results.append(OperationResult("auth", self.__first_block__(by_sector[sector][0]), status == self.MI_OK))
+            if status != self.MI_OK:
+                continue
+            for block in by_sector[sector]:
+                delta = deltas[block]
+                command = self.PICC_INCREMENT if delta >= 0 else self.PICC_DECREMENT
+                status = self.__value_op__(command, block, abs(delta))
+                self.results.append(OperationResult("value", block, status == self.MI_OK))
+                if status != self.MI_OK:
+                    continue
+                status = self.__transfer__(block)
+                self.results.append(OperationResult("transfer", block, status == self.MI_OK))
+                if status == self.MI_OK:
+                    updated.append(block)
+        return updated
+
+    def WriteImage(self, key, uid, image, blocks=None, current=None, incremental=True, verify=False, authMode=PICC_AUTHENT1A):
+        """
+        Bring blocks of an image onto the tag with as few writes as possible. The blocks are
+        grouped by sector, so every sector is authenticated at most once. Blocks whose content
+        on the tag already matches are skipped. What is on the tag is taken from `current` if
+        known there, otherwise the block is read first, which is still much cheaper than a write.
+
+        Args:
+            key ([uint8] or KeyRing): The key of the sector trailer blocks, or a key ring (see `AuthWith`).
+            uid ([uint8]): The 4 byte uid of the card/tag.
+            image (ClassicImage): The desired content.
+            blocks ([int]): The blocks of `image` to write. All data blocks by default. Block 0 is never written.
+            current (ClassicImage): What is known to be on the tag, e.g. from `ReadImage`. Updated with every written block.
+            incremental (boolean): Whether or not to skip unchanged blocks. If False, every block is written. True by default.
+            verify (boolean): Whether or not to read every written block back. False by default.
+            authMode (uint8): .PICC_AUTHENT1A (default) or .PICC_AUTHENT1B.
+
+        Returns:
+            [int]: The blocks that were written. See `results` for what failed.
+
+        Raises:
+            errors.VerificationException: If `verify` is set and a block reads back differently.
+        """
+        self.results = []
+        if blocks is None:
+            blocks = image.data_block_numbers()
+        blocks = sorted(block for block in set(blocks) if block != 0)
+        if incremental and current is not None:
+            blocks = [block for block in blocks if block not in current.read_blocks or current.block(block) != image.block(block)]
+
+        layout = image.layout
+        by_sector = {}
+        for block in blocks:
+            by_sector.setdefault(layout.sector_of[block], []).append(block)
+
+        written = []
+        for sector in sorted(by_sector):
+            status = self.__auth_retried__(key, layout.first_blocks[sector], uid, authMode)
+            if status != self.MI_OK:
+                continue
+
+            for block in by_sector[sector]:
+                desired = image.block(block)
+                if incremental and (current is None or block not in current.read_blocks):
+                    data = self.__read_retried__(key, block, uid, authMode)
+                    if data is not None and data == desired:
+                        continue
+
+                if self.__write_retried__(key, block, desired, uid, authMode) != self.MI_OK:
+                    continue
+                if verify:
+                    data = self.__read_block__(block)
+                    if data is None or data != desired:
+                        raise errors.VerificationException("Block {} reads back differently.".format(block))
+                written.append(block)
+
+                if current is not None:
+                    current.block(block)[:] = desired
+                    current.read_blocks.add(block)
+        return written
+
+    def WriteAll(self, key, uid, value, incremental=False, current=None, verify=False):
         """
         Writes the passed value to all data blocks. By using 0x00 as value, you
         can effectively reset the tag to its factory values in regards to the data
         blocks. Sector trailers as well as the first sector are not affected.
 
         Args:
-            key ([uint8]): Key A of the sector trailer block.
+            key ([uint8] or KeyRing): Key A of the sector trailer block, or a key ring (see `AuthWith`).
             uid ([uint8]): The 4 byte uid of the card/tag.
             value (uint8): The value to be written to all data blocks.
+            incremental (boolean): Whether or not to skip blocks that already hold the value, see `WriteImage`. False by default.
+            current (ClassicImage): What is known to be on the tag, see `WriteImage`.
+            verify (boolean): Whether or not to read every written block back, see `WriteImage`. False by default.
+
+        Returns:
+            [int]: The blocks that were written.
         """
         if not isinstance(value, int) or value > 255:
             raise errors.InvalidValueException("Invalid value to write to all data blocks.")
 
-        for i in range(0, len(self.data_blocks), 3):
-            status = self.Auth(self.PICC_AUTHENT1A, self.data_blocks[i], key, uid)
-
-            if status == self.MI_OK:
-                all_values = [value for _ in range(0, 16)]
-                self.Write(self.data_blocks[i], all_values)
-                self.Write(self.data_blocks[i + 1], all_values)
-                self.Write(self.data_blocks[i + 2], all_values)
+        image = ClassicImage(layout=self.layout)
+        content = bytes(bytearray([value])) * image.BLOCK_SIZE
+        for block in image.data_block_numbers():
+            image.block(block)[:] = content
+        return self.WriteImage(key, uid, image, current=current, incremental=incremental, verify=verify)
 
-    def WriteText(self, key, uid, text):
+    def WriteText(self, key, uid, text, incremental=False, current=None, verify=False):
         """
-        Writes a passed string in sequential order onto the tag. Starting at the first data block (meaning block #4), existing data is overwritten. Writing always happens in units of one block. If the trailing end of the passed string does not fill a block, the remaining bytes are padded with 0x00.
+        Writes a passed string in sequential order onto the tag. Starting at the first data block (meaning block #4), existing data is overwritten. Writing always happens in units of one block. If the trailing end of the passed string does not fill a block, the remaining bytes are padded with 0x00.
 
         Args:
-            key ([uint8]): Key A of the sector trailer block.
+            key ([uint8] or KeyRing): Key A of the sector trailer block, or a key ring (see `AuthWith`).
             uid ([uint8]): The 4 byte uid of the card/tag.
             text (string): The string to be written.
+            incremental (boolean): Whether or not to skip blocks that already hold their part of the text, see `WriteImage`. False by default.
+            current (ClassicImage): What is known to be on the tag, see `WriteImage`.
+            verify (boolean): Whether or not to read every written block back, see `WriteImage`. False by default.
+
+        Returns:
+            [int]: The blocks that were written.
 
         Raises:
             errors.TextTooLongException: If the text takes up more space than there are data blocks available.
         """
-        text_length = len(text)
-        if text_length > len(self.data_blocks) * 16:
-            raise errors.TextTooLongException
-
-        block_data = []
-        blocks = text_length // 16
-        remainder_block = text_length % 16
-        text = [ord(x) for x in text]
-        for i in range(0, blocks):
-            block_data.append(text[0:16])
-            del text[0:16]
-        if len(text) > 0:
-            text += [0x00 for _ in range(0, 16 - len(text))]
-            block_data.append(text)
+        image = ClassicImage(layout=self.layout)
+        blocks = image.write_text(text)
+        return self.WriteImage(key, uid, image, blocks, current=current, incremental=incremental, verify=verify)
 
-        status = None
-        for i in range(0, len(block_data)):
-            if self.data_blocks[i] % 4 == 0:
-                status = self.Auth(self.PICC_AUTHENT1A, self.data_blocks[i], key, uid)
+    def ReadImage(self, key, uid, sectors=None, authMode=PICC_AUTHENT1A, partial=False, data_only=False):
+        """
+        Read the whole tag into one buffer, laid out according to `layout`. Every sector is authenticated
+        once and its blocks are read back to back, nothing is printed. With a cache attached, recently
+        read sectors are taken from there, see `cache.ImageCache`.
 
-            if status == self.MI_OK:
-                self.Write(self.data_blocks[i], block_data[i])
+        A failed authentication or read is retried on its own according to `retry`, the read
+        resumes where it failed. Every operation is recorded in `results`.
+
+        Args:
+            key ([uint8] or KeyRing): The key of the sector trailer blocks, or a key ring (see `AuthWith`).
+            uid ([uint8]): The 4 byte uid of the card/tag.
+            sectors ([int]): The sectors to read. All sectors of `layout` by default, blocks of other sectors stay zeroed.
+            authMode (uint8): .PICC_AUTHENT1A (default) or .PICC_AUTHENT1B.
+            partial (boolean): Whether or not to skip sectors that can not be authenticated instead of raising. False by default.
+            data_only (boolean): Whether or not to skip the sector trailers, saving one read per sector. False by default.
+
+        Returns:
+            ClassicImage: The image of the tag. Only blocks in its `read_blocks` were actually read.
+
+        Raises:
+            errors.AuthenticationException: If the authentication for a sector failed and `partial` is not set.
+                The blocks read up to then are in its `image` attribute.
+        """
+        self.results = []
+        image = ClassicImage(layout=self.layout)
+        if sectors is None:
+            sectors = range(0, image.SECTORS)
+        if self.cache is not None:
+            cached = self.__cached_image__(key, uid, sectors, authMode, data_only)
+            if cached is not None:
+                return cached
+
+        for sector in sectors:
+            first = image.layout.first_blocks[sector]
+
+            # Authenticate
+            status = self.__auth_retried__(key, first, uid, authMode)
+
+            # Check if authenticated
+            if status != self.MI_OK:
+                if partial:
+                    continue
+                error = errors.AuthenticationException("Authentication of sector {} failed.".format(sector))
+                error.image = image
+                raise error
+
+            for block in image.layout.blocks_of(sector):
+                if data_only and image.layout.is_trailer(block):
+                    continue
+                data = self.__read_retried__(key, block, uid, authMode)
+                if data is not None:
+                    image.block(block)[:] = data
+                    image.read_blocks.add(block)
+        if self.cache is not None:
+            self.cache.store(tuple(self.__auth_uid__(uid)), image)
+        return image
+
+    def __cached_image__(self, key, uid, sectors, authMode, data_only=False):
+        """
+        Returns:
+            ClassicImage: The requested sectors from the cache, or None if they have to be read from the tag.
+        """
+        tag = tuple(self.__auth_uid__(uid))
+        layout = self.layout
+        blocks = [block for sector in sectors for block in layout.blocks_of(sector) if not (data_only and layout.is_trailer(block))]
+        cached = self.cache.get(tag, blocks)
+        if cached is None:
+            return None
+        block = self.cache.validate_block
+        if block is not None:
+            # One authentication and one read instead of the whole image
+            if block not in cached.read_blocks or self.AuthWith(key, block, uid, authMode) != self.MI_OK:
+                self.cache.invalidate(tag)
+                return None
+            data = self.__read_block__(block)
+            if data is None or data != cached.block(block):
+                self.cache.invalidate(tag)
+                return None
+        return cached.copy(blocks)
+
+    def FormatImage(self, image, pretty=True):
+        """
+        Format an image sector by sector, one line per block. Coloring is inspired by https://en.wikipedia.org/wiki/File:MiFare_Byte_Layout.png.
+
+        Args:
+            image (ClassicImage): The image to format, see `ReadImage`.
+            pretty (boolean): Whether or not to use xterm256 colors. Defaults to `True`.
+
+        Returns:
+            string: The formatted image. Blocks that were not read are left out.
+        """
+        lines = []
+        for sector in range(0, image.SECTORS):
+            blocks = [block for block in image.layout.blocks_of(sector) if block in image.read_blocks]
+            if not blocks:
+                continue
+            if pretty:
+                lines.append("{}{:-^58}{}".format(tcolors.YELLOW, " Sector {} ".format(sector), tcolors.ENDC))
             else:
-                print("Authentication error")
+                lines.append("{:-^58}".format(" Sector {} ".format(sector)))
+            for block in blocks:
+                lines.append(self.FormatBlock(block, image.block(block), pretty))
+        return "\n".join(lines)
 
     def PrettyDumpClassic1K(self, key, uid, pretty=True):
         """
-        Dumps all blocks to the console. Coloring is inspired by https://en.wikipedia.org/wiki/File:MiFare_Byte_Layout.png.
+        Dumps all blocks to the console. Coloring is inspired by https://en.wikipedia.org/wiki/File:MiFare_Byte_Layout.png.
 
         Args:
-            key ([uint8]): Key A of the sector trailer block.
+            key ([uint8] or KeyRing): Key A of the sector trailer block, or a key ring (see `AuthWith`).
             uid ([uint8]): The 4 byte uid of the card/tag.
             pretty (boolean): Whether or not to print to console using colors. Defaults to `True`.
         """
-        for i in range(0, 64, 4):
-            # Authenticate
-            status = self.Auth(self.PICC_AUTHENT1A, i, key, uid)
-
-            # Check if authenticated
-            if status == self.MI_OK:
-                if pretty:
-                    print("{}{:-^58}{}".format(tcolors.YELLOW, " Sector {} ".format(i // 4), tcolors.ENDC))
-                else:
-                    print("{:-^58}".format(" Sector {} ".format(i // 4)))
-
-                self.Read(i, prettyPrint=pretty)
-                self.Read(i + 1, prettyPrint=pretty)
-                self.Read(i + 2, prettyPrint=pretty)
-                self.Read(i + 3, prettyPrint=pretty)
-            else:
-                print("Authentication error")
-                raise errors.AuthenticationException
+        print(self.FormatImage(self.ReadImage(key, uid, partial=True), pretty))
+        for result in self.results:
+            if not result.ok and result.operation == "auth":
+                print("Sector {} could not be authenticated".format(self.__sector__(result.block)))
 
     def DumpClassic1K(self, key, uid):
         """
-        Dumps all blocks to the console.
+        Dumps all blocks to the console.
 
         Args:
-            key ([uint8]): Key A of the sector trailer block.
+            key ([uint8] or KeyRing): Key A of the sector trailer block, or a key ring (see `AuthWith`).
             uid ([uint8]): The 4 byte uid of the card/tag.
         """
         self.PrettyDumpClassic1K(key, uid, pretty=False)
 
     def DumpClassic1K_Data(self, key, uid):
         """
-        Dumps only DATA blocks. The first sector as well as all sector trailer blocks are ommitted.
+        Dumps only DATA blocks. The first sector as well as all sector trailer blocks are ommitted.
 
         Args:
-            key ([uint8]): Key A of the sector trailer block.
+            key ([uint8] or KeyRing): Key A of the sector trailer block, or a key ring (see `AuthWith`).
             uid ([uint8]): The 4 byte uid of the card/tag.
 
         Returns:
-            [[uint8]]: The complete data dump. The first index describes the data block in order, the second the byte of that block.
-        """
-        data = []
-        for i in range(4, 64, 4):
-            # Authenticate
-            status = self.Auth(self.PICC_AUTHENT1A, i, key, uid)
+            [bytes]: The complete data dump. The index describes the data block in order, the bytes are its content.
 
-            # Check if authenticated
-            if status == self.MI_OK:
-                data.append(self.Read(i))
-                data.append(self.Read(i + 1))
-                data.append(self.Read(i + 2))
-            else:
-                print("Authentication error")
-                raise errors.AuthenticationException
-        return data
+        Raises:
+            errors.AuthenticationException: If a sector could not be authenticated, even after retrying (see `ReadImage`).
+        """
+        image = self.ReadImage(key, uid, sectors=range(1, self.layout.sectors), data_only=True)
+        return [bytes(block) for block in image.data_blocks()]
 
     def DumpClassic1K_Text(self, key, uid, print_text=True):
         """
-        Dumps only DATA blocks. The data in each block is interpreted as string according to pythons ```chr(value)```.
+        Dumps only DATA blocks. The data in each block is interpreted as string according to pythons ```chr(value)```.
 
         Args:
-            key ([uint8]): Key A of the sector trailer block.
+            key ([uint8] or KeyRing): Key A of the sector trailer block, or a key ring (see `AuthWith`).
             uid ([uint8]): The 4 byte uid of the card/tag.
 
         Returns:
             string: All the data on the tag interpreted as a single string.
+
+        Raises:
+            errors.AuthenticationException: If a sector could not be authenticated, even after retrying (see `ReadImage`).
+        """
+        image = self.ReadImage(key, uid, sectors=range(1, self.layout.sectors), data_only=True)
+        if print_text:
+            for block in image.data_blocks():
+                print("".join(chr(byte) if byte >= 32 else "." for byte in block))
+        return image.text()
+
+    def Poll(self):
+        """
+        Check once whether a tag is in the field. Uses WUPA, so halted tags are found as well.
+        A tag that is READY or ACTIVE from an earlier poll silently falls back to IDLE on the
+        wake up and only answers the next one, which is why `cards()` debounces departures.
+
+        The tag is resolved through all cascade levels (see `SelectCascade`) and left selected,
+        so 7 and 10 byte uids are reported in full and `layout` matches the tag.
+
+        Returns:
+            bytes: The complete uid of the tag, or None if there is none.
         """
-        data = self.DumpClassic1K_Data(key, uid)
-        text = ""
-        for block in data:
-            b_print = ""
-            for byte in block:
-                if print_text:
-                    b_print += chr(byte) if byte >= 32 else "."
-                text += chr(byte)
-            if print_text:
-                print(b_print)
-
-        return text
+        (status, TagType) = self.Request(self.PICC_REQALL)
+        if status != self.MI_OK:
+            return None
+        (status, uid, sak) = self.SelectCascade()
+        if status != self.MI_OK:
+            return None
+        return uid
+
+    def cards(self, min_interval=0.01, max_interval=0.5, present_interval=0.05, backoff=2.0, debounce=2, stop=None):
+        """
+        Poll for tags and yield an event whenever one arrives or departs. While the field is
+        empty, the interval between polls grows from `min_interval` by the factor `backoff` up to
+        `max_interval`. While a tag is present it is checked every `present_interval` seconds.
+        Together these bound the CPU and SPI duty cycle of an idle reader.
+
+        An arrived tag is left selected, so it can be authenticated right away:
+        ```
+        for (event, uid) in MIFAREReader.cards():
+            if event == MIFAREReader.CARD_ARRIVED:
+                MIFAREReader.Auth(MIFAREReader.PICC_AUTHENT1A, 4, key, uid)
+        ```
+
+        Args:
+            min_interval (float): The shortest time in seconds between two polls of an empty field. 0.01 by default.
+            max_interval (float): The longest time in seconds between two polls of an empty field. 0.5 by default.
+            present_interval (float): The time in seconds between two polls while a tag is present. 0.05 by default.
+            backoff (float): The factor the interval grows by with every empty poll. 2.0 by default.
+            debounce (int): The number of consecutive missed polls after which a tag counts as departed. 2 by default.
+            stop (callable): Called before every poll, the stream ends once it returns True. Runs forever by default.
+
+        Yields:
+            (string, [uint8]): The event (.CARD_ARRIVED or .CARD_DEPARTED) and the uid of the tag.
+        """
+        presence = CardPresence(min_interval, max_interval, present_interval, backoff, debounce)
+        while stop is None or not stop():
+            for event in presence.update(self.Poll()):
+                yield event
+            time.sleep(presence.interval)
+
+
+class CardPresence:
+    """
+    The debounce and back-off state behind `MFRC522.cards()`. Feed it the result of every
+    poll, it returns the resulting events and tells how long to wait before the next poll.
+
+    Args:
+        See `MFRC522.cards()`.
+    """
+
+    def __init__(self, min_interval=0.01, max_interval=0.5, present_interval=0.05, backoff=2.0, debounce=2):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.present_interval = present_interval
+        self.backoff = backoff
+        self.debounce = debounce
+
+        self.current = None
+        self.misses = 0
+        self.interval = min_interval
+        self.__empty_interval__ = min_interval
+
+    def update(self, uid):
+        """
+        Args:
+            uid ([uint8]): The result of `MFRC522.Poll()`.
+
+        Returns:
+            [(string, [uint8])]: The events caused by this poll, in order.
+        """
+        events = []
+        if uid is not None:
+            self.misses = 0
+            if self.current is not None and uid != self.current:
+                events.append((MFRC522.CARD_DEPARTED, self.current))
+                self.current = None
+            if self.current is None:
+                self.current = uid
+                events.append((MFRC522.CARD_ARRIVED, uid))
+        elif self.current is not None:
+            self.misses += 1
+            if self.misses >= self.debounce:
+                events.append((MFRC522.CARD_DEPARTED, self.current))
+                self.current = None
+                self.misses = 0
+                self.__empty_interval__ = self.min_interval
+
+        if self.current is not None:
+            self.interval = self.present_interval
+        else:
+            self.interval = self.__empty_interval__
+            self.__empty_interval__ = min(self.__empty_interval__ * self.backoff, self.max_interval)
+        return events
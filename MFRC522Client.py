@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+Talks to a running `MFRC522Daemon`, e.g. from shell scripts:
+
+    python3 MFRC522Client.py poll
+    python3 MFRC522Client.py read --sector 1 --sector 2
+    python3 MFRC522Client.py write --block 4 48656C6C6F000000000000000000000000
+    python3 MFRC522Client.py events
+
+Results are printed as JSON. The exit status is 0 on success, 1 if there was no tag and
+2 if the daemon reported an error.
+"""
+
+import argparse
+import json
+import socket
+import sys
+
+import errors
+
+# Defined here rather than in MFRC522Daemon, importing the daemon would pull in the whole driver
+DEFAULT_SOCKET = "/tmp/mfrc522.sock"
+
+
+class MFRC522Client:
+    """
+    Connection to a `MFRC522Daemon`. Requests are answered in order, one at a time.
+
+    Args:
+        path (string): The path of the socket of the daemon.
+        timeout (float): Seconds to wait for an answer. 10 by default.
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET, timeout=10.0):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(timeout)
+        self.socket.connect(path)
+        self.file = self.socket.makefile("rwb")
+        self.__next_id__ = 0
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+    def __receive__(self):
+        line = self.file.readline()
+        if not line:
+            raise IOError("Connection closed by the daemon")
+        return json.loads(line.decode("utf-8"))
+
+    def request(self, op, **params):
+        """
+        Args:
+            op (string): The operation, see `MFRC522Daemon`.
+            **params: Its parameters.
+
+        Returns:
+            object: The result of the operation.
+
+        Raises:
+            errors.DaemonException: If the daemon reported an error.
+        """
+        self.__next_id__ += 1
+        params["op"] = op
+        params["id"] = self.__next_id__
+        self.file.write((json.dumps(params) + "\n").encode("utf-8"))
+        self.file.flush()
+        response = self.__receive__()
+        if not response["ok"]:
+            raise errors.DaemonException("{}: {}".format(response["error"], response["message"]))
+        return response["result"]
+
+    def events(self):
+        """
+        Subscribe to card events. The connection can not be used for anything else afterwards.
+
+        Yields:
+            (string, string): The event and the uid as hex string.
+        """
+        self.request("subscribe")
+        self.socket.settimeout(None)
+        while True:
+            event = self.__receive__()
+            yield (event["event"], event["uid"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Talk to a running MFRC522Daemon.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="The path of the socket, " + DEFAULT_SOCKET + " by default.")
+    parser.add_argument("--key", help="The key as 12 hex digits, FFFFFFFFFFFF by default.")
+    parser.add_argument("--uid", help="The uid of the tag as hex digits, the one in the field by default.")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+    commands.add_parser("poll", help="Look for a tag and print its uid.")
+    commands.add_parser("current", help="Print the uid of the tag the daemon last saw.")
+    read = commands.add_parser("read", help="Read sectors, all by default.")
+    read.add_argument("--sector", type=int, action="append", dest="sectors", help="A sector to read, can be repeated.")
+    commands.add_parser("dump", help="Read the whole tag.")
+    write = commands.add_parser("write", help="Write a block.")
+    write.add_argument("--block", type=int, required=True, help="The block to write.")
+    write.add_argument("--verify", action="store_true", help="Read the block back.")
+    write.add_argument("data", help="The 16 bytes as 32 hex digits.")
+    commands.add_parser("stats", help="Print the metrics of the reader.")
+    commands.add_parser("events", help="Print card events as they happen.")
+    args = parser.parse_args(argv)
+
+    params = {}
+    if args.key is not None:
+        params["key"] = args.key
+    if args.uid is not None:
+        params["uid"] = args.uid
+    client = MFRC522Client(args.socket)
+    try:
+        if args.command == "events":
+            for (event, uid) in client.events():
+                print(json.dumps({"event": event, "uid": uid}))
+                sys.stdout.flush()
+            return 0
+        if args.command == "read":
+            params["sectors"] = args.sectors
+            result = client.request("read", **params)
+        elif args.command == "dump":
+            result = client.request("read", **params)
+        elif args.command == "write":
+            params["blocks"] = {str(args.block): args.data}
+            params["verify"] = args.verify
+            result = client.request("write", **params)
+        else:
+            result = client.request(args.command, **params)
+    except errors.DaemonException as e:
+        print(e, file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        client.close()
+    print(json.dumps(result))
+    return 0 if result is not None else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
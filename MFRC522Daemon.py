@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+Keeps a reader initialized and serves it over a Unix socket, so short lived scripts
+do not pay for opening SPI, resetting and initializing the chip on every run:
+
+    python3 MFRC522Daemon.py --socket /tmp/mfrc522.sock
+    python3 MFRC522Client.py read --sector 1
+
+The protocol is JSON lines. Every request is one object with an "op" and an optional
+"id" that is echoed in the response:
+
+    {"id": 1, "op": "read", "key": "FFFFFFFFFFFF", "sectors": [1]}
+    {"id": 1, "ok": true, "result": {"blocks": {"4": "00...", ...}}}
+    {"id": 2, "ok": false, "error": "AuthenticationException", "message": "Authentication failed."}
+
+Operations:
+    poll: {} -> the uid of the tag in the field, or null.
+    current: {} -> the uid according to the background polls, or null.
+    read: {key, uid, sectors} -> {"blocks": {block: data}} of the tag, or null if it is not in the field.
+    write: {key, uid, blocks: {block: data}, verify} -> the blocks written, or null.
+    stats: {} -> the metrics of the reader.
+    subscribe: {} -> {"subscribed": true}, then one {"event": ..., "uid": ...} line per arrival or departure.
+
+Keys, uids and block data are hex strings, "key" is 6 bytes of 0xFF and "uid" the tag
+in the field if omitted.
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+
+import errors
+import MFRC522
+from image import ClassicImage
+from layout import CLASSIC_4K
+from metrics import Metrics
+from MFRC522Client import DEFAULT_SOCKET
+from MFRC522Worker import MFRC522Worker
+
+DEFAULT_KEY = "FFFFFFFFFFFF"
+
+
+def __to_hex__(data):
+    return None if data is None else bytes(bytearray(data)).hex().upper()
+
+
+def __from_hex__(text):
+    return None if text is None else list(bytearray.fromhex(text))
+
+
+class MFRC522Daemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    The server behind the socket. Every connection is handled on a thread of its own, the
+    reader itself is owned by an `MFRC522Worker`, which serializes the operations of all
+    connections and polls for tags in between.
+
+    Args:
+        path (string): The path of the socket. A stale socket left behind by a crashed daemon is replaced.
+        worker (MFRC522Worker): The worker owning the reader.
+        mode (int): The permissions of the socket. 0o660 by default.
+
+    Raises:
+        errors.DaemonException: If another daemon is serving on `path` already.
+    """
+    daemon_threads = True
+
+    def __init__(self, path, worker, mode=0o660):
+        if os.path.exists(path):
+            if self.__answers__(path):
+                raise errors.DaemonException("Another daemon is serving on {}".format(path))
+            os.unlink(path)
+        self.worker = worker
+        self.path = path
+        self.__closed__ = threading.Event()
+        # The socket gets its permissions at bind time, there is no window in which others may connect
+        umask = os.umask(0o777 & ~mode)
+        try:
+            socketserver.UnixStreamServer.__init__(self, path, MFRC522Handler)
+        finally:
+            os.umask(umask)
+
+    @staticmethod
+    def __answers__(path):
+        """
+        Returns:
+            boolean: Whether or not something accepts connections on the socket.
+        """
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+            return True
+        except (IOError, OSError):
+            return False
+        finally:
+            probe.close()
+
+    def server_close(self):
+        self.__closed__.set()
+        socketserver.UnixStreamServer.server_close(self)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    @property
+    def closed(self):
+        return self.__closed__.is_set()
+
+    def execute(self, request):
+        """
+        Run one request.
+
+        Args:
+            request (dict): The decoded request line.
+
+        Returns:
+            object: The JSON serializable result.
+
+        Raises:
+            ValueError: If the operation is unknown or a parameter is malformed.
+        """
+        op = request.get("op")
+        worker = self.worker
+        key = __from_hex__(request.get("key", DEFAULT_KEY))
+        uid = __from_hex__(request.get("uid"))
+        if op == "poll":
+            return __to_hex__(worker.poll().result())
+        if op == "current":
+            return __to_hex__(worker.current)
+        if op == "read":
+            image = worker.read_image(key, uid, request.get("sectors")).result()
+            if image is None:
+                return None
+            return {"blocks": dict((str(block), __to_hex__(image.block(block))) for block in sorted(image.read_blocks))}
+        if op == "write":
+            # The 4K layout covers the blocks of every smaller tag, the sectors of the first 128 blocks agree
+            image = ClassicImage(layout=CLASSIC_4K)
+            blocks = []
+            for (block, data) in request.get("blocks", {}).items():
+                data = __from_hex__(data)
+                if len(data) != image.BLOCK_SIZE:
+                    raise ValueError("Block {} needs {} bytes".format(block, image.BLOCK_SIZE))
+                image.block(int(block))[:] = bytearray(data)
+                blocks.append(int(block))
+            return worker.write_image(key, image, uid, blocks, verify=request.get("verify", False)).result()
+        if op == "stats":
+            metrics = worker.reader.metrics
+            return metrics.snapshot() if metrics is not None else None
+        raise ValueError("Unknown operation {}".format(op))
+
+
+class MFRC522Handler(socketserver.StreamRequestHandler):
+    """One client connection, see `MFRC522Daemon`."""
+
+    def send(self, message):
+        self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line.decode("utf-8"))
+            except ValueError as e:
+                self.send({"ok": False, "error": "ValueError", "message": str(e)})
+                continue
+            if request.get("op") == "subscribe":
+                self.send({"id": request.get("id"), "ok": True, "result": {"subscribed": True}})
+                self.stream()
+                return
+            try:
+                response = {"id": request.get("id"), "ok": True, "result": self.server.execute(request)}
+            except Exception as e:
+                response = {"id": request.get("id"), "ok": False, "error": e.__class__.__name__, "message": str(e)}
+            self.send(response)
+
+    def stream(self):
+        """
+        Send card events until the client or the server goes away. Events are queued by the
+        worker thread and written by this one, so a slow client never holds up the reader.
+        """
+        events = queue.Queue()
+
+        def callback(event, uid):
+            events.put({"event": event, "uid": __to_hex__(uid)})
+        self.server.worker.subscribe(callback)
+        try:
+            while not self.server.closed:
+                try:
+                    self.send(events.get(timeout=1.0))
+                except queue.Empty:
+                    continue
+        except (IOError, OSError):
+            pass
+        finally:
+            self.server.worker.unsubscribe(callback)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve an MFRC522 reader over a Unix socket.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="The path of the socket, " + DEFAULT_SOCKET + " by default.")
+    parser.add_argument("--mode", type=lambda mode: int(mode, 8), default=0o660, help="The permissions of the socket, 660 by default.")
+    parser.add_argument("--dev", default="/dev/spidev0.0", help="The SPI socket of the reader.")
+    parser.add_argument("--spd", type=int, help="The SPI clock in Hz, the calibrated one by default.")
+    parser.add_argument("--irq", action="store_true", help="Wait for tags on the IRQ pin.")
+    parser.add_argument("--simulate", action="store_true", help="Serve a simulated reader with one tag, see simulator.py.")
+    args = parser.parse_args(argv)
+
+    if args.simulate:
+        from simulator import SimulatedTransport, VirtualClassic1K
+        reader = MFRC522.MFRC522(transport=SimulatedTransport([VirtualClassic1K()]), use_irq=args.irq, metrics=Metrics())
+    else:
+        reader = MFRC522.MFRC522(dev=args.dev, spd=args.spd, use_irq=args.irq, metrics=Metrics())
+    worker = MFRC522Worker(reader, polling=True)
+    try:
+        server = MFRC522Daemon(args.socket, worker, args.mode)
+    except errors.DaemonException as e:
+        print(e, file=sys.stderr)
+        worker.close()
+        return 1
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        worker.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import time
+from MFRC522 import MFRC522, CardPresence
+
+
+class MFRC522Pool:
+    """
+    Drives several MFRC522 readers from one process and polls them for tags.
+
+    Readers are added with their own socket, reset pin and (optionally) GPIO chip select,
+    e.g. two antennas on the hardware chip selects of SPI0 and two more on SPI1, told apart
+    by GPIO chip selects:
+    ```
+    pool = MFRC522Pool()
+    pool.add("lane1", dev="/dev/spidev0.0", reset_pin=22)
+    pool.add("lane2", dev="/dev/spidev0.1", reset_pin=29)
+    pool.add("lane3", dev="/dev/spidev1.0", reset_pin=31, cs_pin=16)
+    pool.add("lane4", dev="/dev/spidev1.0", reset_pin=33, cs_pin=15, priority=2)
+    for (name, event, uid) in pool.events():
+        ...
+    ```
+
+    Every reader keeps its own debounce and back-off state (see `MFRC522.cards()`) and is
+    polled once it is due. If several readers are due at the same time, `schedule` decides
+    the order: `SCHEDULE_ROUND_ROBIN` takes turns, `SCHEDULE_PRIORITY` prefers readers with
+    a higher priority.
+
+    Args:
+        schedule (string): Either .SCHEDULE_ROUND_ROBIN (default) or .SCHEDULE_PRIORITY.
+        **presence: Polling parameters for every reader, see `MFRC522.cards()`.
+    """
+    SCHEDULE_ROUND_ROBIN = "round-robin"
+    SCHEDULE_PRIORITY = "priority"
+
+    def __init__(self, schedule=SCHEDULE_ROUND_ROBIN, **presence):
+        if schedule not in (self.SCHEDULE_ROUND_ROBIN, self.SCHEDULE_PRIORITY):
+            raise ValueError("Unknown schedule {}".format(schedule))
+        self.schedule = schedule
+        self.presence = presence
+        self.readers = {}
+        self.__order__ = []
+        self.__turn__ = 0
+
+    def add(self, name, reader=None, priority=0, **kwargs):
+        """
+        Add a reader to the pool.
+
+        Args:
+            name (string): The name the reader is reported by.
+            reader (MFRC522): The reader. If omitted, one is created from `kwargs` (dev, reset_pin, cs_pin, transport, ...).
+            priority (int): Higher priorities are polled first by the priority schedule. 0 by default.
+
+        Returns:
+            MFRC522: The added reader.
+        """
+        if name in self.readers:
+            raise ValueError("Reader {} already exists".format(name))
+        if reader is None:
+            reader = MFRC522(**kwargs)
+        self.readers[name] = {
+            "reader": reader,
+            "priority": priority,
+            "presence": CardPresence(**self.presence),
+            "due": 0.0,
+            "polls": 0,
+            "arrivals": 0,
+            "departures": 0,
+            "busy": 0.0,
+            "since": time.monotonic(),
+        }
+        self.__order__.append(name)
+        return reader
+
+    def remove(self, name):
+        """Remove a reader from the pool and release its pins."""
+        entry = self.readers.pop(name)
+        self.__order__.remove(name)
+        entry["reader"].Close()
+
+    def reader(self, name):
+        return self.readers[name]["reader"]
+
+    def __next_due__(self, now):
+        due = []
+        count = len(self.__order__)
+        for i in range(0, count):
+            name = self.__order__[(self.__turn__ + i) % count]
+            if self.readers[name]["due"] <= now:
+                due.append(name)
+        if not due:
+            return None
+        if self.schedule == self.SCHEDULE_PRIORITY:
+            # sorted() is stable, so readers of equal priority still take turns
+            due = sorted(due, key=lambda name: -self.readers[name]["priority"])
+        name = due[0]
+        self.__turn__ = (self.__order__.index(name) + 1) % count
+        return name
+
+    def poll(self):
+        """
+        Poll the next due reader, if any.
+
+        Returns:
+            [(string, string, [uint8])]: The resulting (name, event, uid) tuples.
+        """
+        now = time.monotonic()
+        name = self.__next_due__(now)
+        if name is None:
+            return []
+        entry = self.readers[name]
+        uid = entry["reader"].Poll()
+        end = time.monotonic()
+
+        events = entry["presence"].update(uid)
+        entry["polls"] += 1
+        entry["busy"] += end - now
+        entry["due"] = end + entry["presence"].interval
+        result = []
+        for (event, event_uid) in events:
+            if event == MFRC522.CARD_ARRIVED:
+                entry["arrivals"] += 1
+            else:
+                entry["departures"] += 1
+            result.append((name, event, event_uid))
+        return result
+
+    def events(self, stop=None):
+        """
+        Poll all readers and yield events as they happen.
+
+        Args:
+            stop (callable): Called before every poll, the stream ends once it returns True. Runs forever by default.
+
+        Yields:
+            (string, string, [uint8]): The name of the reader, the event (see `MFRC522.cards()`) and the uid.
+        """
+        while self.readers and (stop is None or not stop()):
+            for event in self.poll():
+                yield event
+            wait = min(entry["due"] for entry in self.readers.values()) - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Per reader name the number of polls, arrivals and departures, the time spent on the bus
+                and the resulting polls per second since the reader was added.
+        """
+        now = time.monotonic()
+        result = {}
+        for name in self.__order__:
+            entry = self.readers[name]
+            elapsed = now - entry["since"]
+            result[name] = {
+                "polls": entry["polls"],
+                "arrivals": entry["arrivals"],
+                "departures": entry["departures"],
+                "busy": entry["busy"],
+                "polls_per_second": entry["polls"] / elapsed if elapsed > 0 else 0.0,
+            }
+        return result
+
+    def close(self):
+        """Release the pins of all readers."""
+        for name in list(self.__order__):
+            self.remove(name)
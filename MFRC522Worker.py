@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from MFRC522 import MFRC522, CardPresence
+
+
+class MFRC522Worker:
+    """
+    Shares one reader between threads. A single worker thread owns the reader, every other
+    thread hands it operations through a priority queue and gets a
+    `concurrent.futures.Future` back:
+    ```
+    worker = MFRC522Worker(polling=True)
+    worker.subscribe(lambda event, uid: print(event, uid))
+    image = worker.read_sector(key, 1).result()
+    worker.write_image(key, image).result()
+    ```
+
+    Lower numbers are served first: writes (.PRIORITY_HIGH) go before reads
+    (.PRIORITY_NORMAL), which go before polls (.PRIORITY_POLL). Operations with the same
+    priority are served in the order they were submitted. Submitting an operation while an
+    equal one is still pending (e.g. the same sector of the same tag twice) does not queue it
+    again, both callers get the same future.
+
+    With `polling` set, the worker polls for tags whenever the queue is empty, see
+    `MFRC522.cards()`, and reports arrivals and departures to the subscribers. Background polls
+    are never queued, so any submitted operation runs as soon as the exchange with the tag
+    in progress is done.
+
+    Args:
+        reader (MFRC522): The reader to own. If omitted, one is created on the worker thread from `kwargs`.
+        polling (boolean): Whether or not to poll for tags while idle. False by default.
+        presence (dict): Polling parameters, see `MFRC522.cards()`.
+        **kwargs: Passed on to `MFRC522` if no reader is given.
+    """
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_POLL = 2
+
+    CARD_ARRIVED = MFRC522.CARD_ARRIVED
+    CARD_DEPARTED = MFRC522.CARD_DEPARTED
+
+    def __init__(self, reader=None, polling=False, presence=None, **kwargs):
+        self.polling = polling
+        self.presence = CardPresence(**(presence or {}))
+        self.reader = reader
+        self.__condition__ = threading.Condition()
+        # (priority, sequence, operation), operations may be queued again with a higher priority
+        self.__queue__ = []
+        self.__sequence__ = itertools.count()
+        # Pending operations by their coalescing key
+        self.__pending__ = {}
+        self.__subscribers__ = []
+        self.__stopped__ = False
+        self.__due__ = 0.0
+        started = Future()
+        self.__thread__ = threading.Thread(target=self.__run__, args=(started, kwargs))
+        self.__thread__.daemon = True
+        self.__thread__.start()
+        # Raises if the reader could not be created
+        started.result()
+
+    @property
+    def current(self):
+        """
+        Returns:
+            [uint8]: The uid of the tag in the field according to the background polls, or None.
+        """
+        return self.presence.current
+
+    def subscribe(self, callback):
+        """
+        Call `callback(event, uid)` on the worker thread whenever a background poll notices
+        that a tag arrived or departed. Callbacks should return quickly, the reader waits for them.
+        """
+        with self.__condition__:
+            self.__subscribers__.append(callback)
+
+    def unsubscribe(self, callback):
+        with self.__condition__:
+            self.__subscribers__.remove(callback)
+
+    def submit(self, function, *args, priority=PRIORITY_NORMAL, coalesce=None, **kwargs):
+        """
+        Queue a call, e.g. `submit(worker.reader.Read, 8)`.
+
+        Args:
+            function (callable): Called with `args` and `kwargs` on the worker thread.
+            priority (int): Lower priorities are served first. .PRIORITY_NORMAL by default.
+            coalesce (hashable): Calls with the same coalescing key are considered equal: while one
+                is pending, submitting another returns the pending future (moved up to `priority` if
+                that is higher). Never coalesced by default. Named so that it never takes the `key`
+                argument of a driver call.
+
+        Returns:
+            concurrent.futures.Future: The result of the call.
+        """
+        with self.__condition__:
+            if self.__stopped__:
+                raise RuntimeError("Worker is closed")
+            operation = self.__pending__.get(coalesce) if coalesce is not None else None
+            if operation is None:
+                operation = {"function": function, "args": args, "kwargs": kwargs, "coalesce": coalesce,
+                             "priority": priority, "future": Future(), "taken": False}
+                if coalesce is not None:
+                    self.__pending__[coalesce] = operation
+            elif priority < operation["priority"]:
+                # The entry with the old priority is skipped once the operation was taken
+                operation["priority"] = priority
+            else:
+                return operation["future"]
+            heapq.heappush(self.__queue__, (priority, next(self.__sequence__), operation))
+            self.__condition__.notify()
+            return operation["future"]
+
+    def close(self):
+        """Stop the worker thread. Pending operations are cancelled."""
+        with self.__condition__:
+            self.__stopped__ = True
+            self.__condition__.notify()
+        self.__thread__.join()
+
+    def __take__(self):
+        """
+        Returns:
+            dict: The next pending operation, or None.
+        """
+        while self.__queue__:
+            (priority, sequence, operation) = heapq.heappop(self.__queue__)
+            if operation["taken"]:
+                continue
+            operation["taken"] = True
+            if operation["coalesce"] is not None:
+                del self.__pending__[operation["coalesce"]]
+            return operation
+        return None
+
+    def __run__(self, started, kwargs):
+        try:
+            if self.reader is None:
+                self.reader = MFRC522(**kwargs)
+        except Exception as e:
+            started.set_exception(e)
+            return
+        started.set_result(None)
+        while True:
+            with self.__condition__:
+                operation = self.__take__()
+                while operation is None and not self.__stopped__:
+                    wait = self.__due__ - time.monotonic() if self.polling else None
+                    if wait is not None and wait <= 0:
+                        break
+                    self.__condition__.wait(wait)
+                    operation = self.__take__()
+                if self.__stopped__:
+                    break
+                subscribers = list(self.__subscribers__)
+            if operation is None:
+                self.__poll__(subscribers)
+            elif operation["future"].set_running_or_notify_cancel():
+                try:
+                    operation["future"].set_result(operation["function"](*operation["args"], **operation["kwargs"]))
+                except BaseException as e:
+                    operation["future"].set_exception(e)
+        with self.__condition__:
+            if operation is not None:
+                operation["future"].cancel()
+            while self.__queue__:
+                operation = self.__take__()
+                if operation is not None:
+                    operation["future"].cancel()
+
+    def __poll__(self, subscribers=None):
+        """
+        Poll once, update `presence` and report the events, for background and manual polls alike.
+
+        Returns:
+            [uint8]: The result of `MFRC522.Poll()`.
+        """
+        if subscribers is None:
+            with self.__condition__:
+                subscribers = list(self.__subscribers__)
+        result = self.reader.Poll()
+        events = self.presence.update(result)
+        self.__due__ = time.monotonic() + self.presence.interval
+        for (event, uid) in events:
+            for callback in subscribers:
+                try:
+                    callback(event, uid)
+                except Exception:
+                    # A broken subscriber must not take card access down for everyone else
+                    traceback.print_exc()
+        return result
+
+    def __on_tag__(self, uid, function):
+        """
+        Select a tag, whatever state earlier operations left it in, and call `function(uid)`.
+        A tag that is READY or ACTIVE only falls back to IDLE on the first wake up, so it is
+        tried twice. The tag is halted afterwards, halted tags answer the next background
+        poll right away instead of missing it.
+
+        Args:
+            uid ([uint8]): The uid of the tag, or None for the one in the field.
+
+        Returns:
+            object: The result of `function`, or None if there is no tag or no tag with that uid.
+        """
+        uid = uid if uid is not None else self.presence.current
+        if uid is None:
+            return None
+        for attempt in range(0, 2):
+            if self.reader.Reselect(uid) == self.reader.MI_OK:
+                try:
+                    return function(uid)
+                finally:
+                    self.reader.Halt()
+        return None
+
+    @staticmethod
+    def __hashable__(value):
+        if value is None or isinstance(value, (int, str)):
+            return value
+        if isinstance(value, (list, tuple, bytes, bytearray, memoryview, range)):
+            return tuple(value)
+        # Key rings and the like are only equal to themselves
+        return id(value)
+
+    def call(self, function, *args, **kwargs):
+        """Queue a call with .PRIORITY_NORMAL, see `submit`."""
+        return self.submit(function, *args, **kwargs)
+
+    def poll(self):
+        """
+        Poll once, like the background polls do: `current` is updated and subscribers are told about arrivals and departures.
+
+        Returns:
+            concurrent.futures.Future: The result of `MFRC522.Poll()`.
+        """
+        return self.submit(self.__poll__, priority=self.PRIORITY_POLL, coalesce=("poll",))
+
+    def read_image(self, key, uid=None, sectors=None, authMode=MFRC522.PICC_AUTHENT1A):
+        """
+        Select the tag and read it, see `MFRC522.ReadImage`.
+
+        Args:
+            uid ([uint8]): The uid of the tag. The one in the field by default, see `current`.
+
+        Returns:
+            concurrent.futures.Future: The ClassicImage, or None if the tag is not in the field.
+        """
+        def operation(selected):
+            return self.reader.ReadImage(key, selected, sectors, authMode)
+        coalesce = ("read_image", self.__hashable__(key), self.__hashable__(uid), self.__hashable__(sectors), authMode)
+        return self.submit(self.__on_tag__, uid, operation, coalesce=coalesce)
+
+    def read_sector(self, key, sector, uid=None, authMode=MFRC522.PICC_AUTHENT1A):
+        """
+        Read a single sector, see `read_image`.
+        """
+        return self.read_image(key, uid, [sector], authMode)
+
+    def write_image(self, key, image, uid=None, blocks=None, incremental=True, verify=False, authMode=MFRC522.PICC_AUTHENT1A):
+        """
+        Select the tag and write to it with .PRIORITY_HIGH, see `MFRC522.WriteImage`. Writes are never coalesced.
+
+        Args:
+            uid ([uint8]): The uid of the tag. The one in the field by default, see `current`.
+
+        Returns:
+            concurrent.futures.Future: The blocks written, or None if the tag is not in the field.
+        """
+        def operation(selected):
+            return self.reader.WriteImage(key, selected, image, blocks, None, incremental, verify, authMode)
+        return self.submit(self.__on_tag__, uid, operation, priority=self.PRIORITY_HIGH)
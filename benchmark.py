@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+Benchmarks the driver against the simulated reader and tag, see `simulator.py`.
+
+Every operation is run a number of times, recording the wall time and the SPI
+transactions per operation. Results can be written to JSON and compared with an
+earlier run, failing if an operation got more expensive than the budget allows:
+
+    python3 benchmark.py --output before.json
+    python3 benchmark.py --baseline before.json --max-transactions-increase 0 --max-time-increase 0.25
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import MFRC522
+from simulator import SimulatedTransport, VirtualClassic1K
+
+KEY = [0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF]
+UID = [0x01, 0x02, 0x03, 0x04]
+
+
+def setup(use_irq=False, select=True):
+    """
+    Returns:
+        (MFRC522, SimulatedTransport, [uint8]): A reader with a tag in the field, selected unless `select` is False.
+    """
+    bus = SimulatedTransport([VirtualClassic1K(uid=UID)])
+    reader = MFRC522.MFRC522(transport=bus, use_irq=use_irq)
+    uid = None
+    if select:
+        (status, TagType) = reader.Request(reader.PICC_REQIDL)
+        (status, uid) = reader.Anticoll()
+        reader.SelectTag(uid)
+    return (reader, bus, uid)
+
+
+def bench_select(use_irq):
+    (reader, bus, uid) = setup(use_irq, select=False)
+
+    def op():
+        bus.cards[0].reset()
+        reader.Request(reader.PICC_REQIDL)
+        (status, uid) = reader.Anticoll()
+        reader.SelectTag(uid)
+    return (bus, op)
+
+
+def bench_auth(use_irq):
+    (reader, bus, uid) = setup(use_irq)
+
+    def op():
+        # Dropping Crypto1 forces the full 3-pass authentication every time
+        reader.StopCrypto1()
+        reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    return (bus, op)
+
+
+def bench_read(use_irq):
+    (reader, bus, uid) = setup(use_irq)
+    reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    return (bus, lambda: reader.Read(4))
+
+
+def bench_write(use_irq):
+    (reader, bus, uid) = setup(use_irq)
+    reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    data = list(range(0, 16))
+    return (bus, lambda: reader.Write(4, data))
+
+
+def bench_write_text(length):
+    def bench(use_irq):
+        (reader, bus, uid) = setup(use_irq)
+        text = ("Lorem ipsum dolor sit amet " * 30)[0:length]
+        return (bus, lambda: reader.WriteText(KEY, uid, text))
+    return bench
+
+
+def bench_write_all(use_irq):
+    (reader, bus, uid) = setup(use_irq)
+    return (bus, lambda: reader.WriteAll(KEY, uid, 0x00))
+
+
+def bench_dump_data(use_irq):
+    (reader, bus, uid) = setup(use_irq)
+    return (bus, lambda: reader.DumpClassic1K_Data(KEY, uid))
+
+
+def bench_inventory(use_irq):
+    bus = SimulatedTransport([VirtualClassic1K(uid=UID), VirtualClassic1K(uid=[0x04, 0x11, 0x22, 0x33, 0x44, 0x55, 0x66]),
+                              VirtualClassic1K(uid=[0x01, 0x02, 0x03, 0x05])])
+    reader = MFRC522.MFRC522(transport=bus, use_irq=use_irq)
+    return (bus, lambda: reader.Inventory())
+
+
+BENCHMARKS = [
+    ("select", bench_select, 500),
+    ("auth", bench_auth, 500),
+    ("read", bench_read, 500),
+    ("write", bench_write, 500),
+    ("write_text_16", bench_write_text(16), 200),
+    ("write_text_128", bench_write_text(128), 100),
+    ("write_text_720", bench_write_text(720), 20),
+    ("write_all", bench_write_all, 20),
+    ("dump_data", bench_dump_data, 20),
+    ("inventory", bench_inventory, 20),
+]
+
+
+def run(names=None, scale=1.0, use_irq=False):
+    """
+    Run the benchmarks.
+
+    Args:
+        names ([string]): The benchmarks to run. All by default.
+        scale (float): Factor applied to the number of iterations of every benchmark. 1.0 by default.
+        use_irq (boolean): Whether or not to run the driver in IRQ mode. False by default.
+
+    Returns:
+        dict: Per benchmark the iterations, operations per second, seconds and SPI transactions per operation.
+    """
+    results = {}
+    for (name, bench, iterations) in BENCHMARKS:
+        if names and name not in names:
+            continue
+        iterations = max(1, int(iterations * scale))
+        (bus, op) = bench(use_irq)
+        # Warm up once so that lazy setup does not count
+        op()
+        bus.reset_counters()
+        started = time.perf_counter()
+        for _ in range(0, iterations):
+            op()
+        elapsed = time.perf_counter() - started
+        stats = bus.bus_stats()
+        results[name] = {
+            "iterations": iterations,
+            "ops_per_second": iterations / elapsed if elapsed > 0 else float("inf"),
+            "seconds_per_op": elapsed / iterations,
+            "transactions_per_op": stats["transactions"] / float(iterations),
+            "register_accesses_per_op": (stats["register_reads"] + stats["register_writes"]) / float(iterations),
+        }
+    return results
+
+
+def compare(results, baseline, max_transactions_increase=0.0, max_time_increase=0.25):
+    """
+    Compare results with an earlier run.
+
+    Args:
+        results (dict): The current results, see `run`.
+        baseline (dict): The earlier results.
+        max_transactions_increase (float): The allowed relative increase of SPI transactions per operation. 0 by default.
+        max_time_increase (float): The allowed relative increase of the time per operation. 0.25 by default.
+
+    Returns:
+        [string]: A description of every violation of the budget.
+    """
+    violations = []
+    for (name, result) in sorted(results.items()):
+        if name not in baseline:
+            continue
+        before = baseline[name]
+        if result["transactions_per_op"] > before["transactions_per_op"] * (1 + max_transactions_increase):
+            violations.append("{}: {:.1f} SPI transactions per op, was {:.1f}".format(name, result["transactions_per_op"], before["transactions_per_op"]))
+        if result["seconds_per_op"] > before["seconds_per_op"] * (1 + max_time_increase):
+            violations.append("{}: {:.1f} us per op, was {:.1f}".format(name, result["seconds_per_op"] * 1e6, before["seconds_per_op"] * 1e6))
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the MFRC522 driver against the simulated reader.")
+    parser.add_argument("names", nargs="*", help="Benchmarks to run, all by default: " + ", ".join(name for (name, _, _) in BENCHMARKS))
+    parser.add_argument("--scale", type=float, default=1.0, help="Factor for the number of iterations.")
+    parser.add_argument("--irq", action="store_true", help="Run the driver in IRQ mode.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare with the results in this JSON file.")
+    parser.add_argument("--max-transactions-increase", type=float, default=0.0, help="Allowed relative increase of SPI transactions per op.")
+    parser.add_argument("--max-time-increase", type=float, default=0.25, help="Allowed relative increase of time per op.")
+    args = parser.parse_args(argv)
+
+    results = run(args.names, args.scale, args.irq)
+    print("{:<16} {:>12} {:>12} {:>14}".format("benchmark", "ops/s", "us/op", "transactions"))
+    for (name, result) in results.items():
+        print("{:<16} {:>12.1f} {:>12.1f} {:>14.1f}".format(name, result["ops_per_second"], result["seconds_per_op"] * 1e6, result["transactions_per_op"]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        violations = compare(results, baseline, args.max_transactions_increase, args.max_time_increase)
+        for violation in violations:
+            print("BUDGET EXCEEDED " + violation)
+        if violations:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ImageCache:
+    """
+    Remembers what was read from tags, so that `MFRC522.ReadImage` and the `Dump*` helpers
+    can answer a tag that was seen moments ago without touching the RF link. Attach it with
+    `MFRC522(cache=ImageCache())`, one cache can be shared by several readers.
+
+    Entries are keyed by the uid, expire after `ttl` seconds, and the least recently used
+    ones are dropped beyond `max_entries`. Every write through the driver invalidates the
+    entry of the tag. Tags can still be changed by other readers though: with `validate_block`
+    set, every hit reads that one block (e.g. a checksum or sequence number that changes with
+    every update of the tag) and only counts if it still matches.
+
+    Args:
+        ttl (float): Seconds an entry stays valid. 30 by default.
+        max_entries (int): How many tags to remember. 128 by default.
+        validate_block (int): The block to compare with the tag on every hit. No validation by default.
+    """
+
+    def __init__(self, ttl=30.0, max_entries=128, validate_block=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.validate_block = validate_block
+        self.entries = OrderedDict()
+        self.__lock__ = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, uid, blocks):
+        """
+        Args:
+            uid (tuple): The uid of the tag.
+            blocks ([int]): The blocks that are needed.
+
+        Returns:
+            ClassicImage: A copy of the cached image if it holds all of `blocks` and has not expired, otherwise None.
+        """
+        with self.__lock__:
+            entry = self.entries.get(uid)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self.entries[uid]
+                entry = None
+            if entry is None or not entry[1].read_blocks.issuperset(blocks):
+                self.misses += 1
+                return None
+            self.entries.move_to_end(uid)
+            self.hits += 1
+            return entry[1].copy()
+
+    def store(self, uid, image):
+        """
+        Remember the blocks read into `image`, in addition to what is known about the tag already.
+        """
+        with self.__lock__:
+            entry = self.entries.pop(uid, None)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl and entry[1].layout is image.layout:
+                cached = entry[1]
+                for block in image.read_blocks:
+                    cached.block(block)[:] = image.block(block)
+                cached.read_blocks.update(image.read_blocks)
+            else:
+                cached = image.copy()
+            self.entries[uid] = (time.monotonic(), cached)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, uid=None):
+        """
+        Forget a tag, or every tag if `uid` is None.
+        """
+        with self.__lock__:
+            if uid is None:
+                self.entries.clear()
+            elif self.entries.pop(uid, None) is None:
+                return
+            self.invalidations += 1
+
+    def stats(self):
+        """
+        Returns:
+            dict: The number of entries, hits, misses and invalidations.
+        """
+        with self.__lock__:
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
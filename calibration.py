@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import json
+import os
+
+import errors
+
+# SPI clocks tried by `calibrate`, slowest first. The MFRC522 is specified up to 10 MHz
+SPEEDS = (1000000, 2000000, 4000000, 5000000, 8000000, 10000000)
+# Where calibrated speeds are kept, per socket
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".mfrc522.json")
+
+# Written and read back on ModWidthReg, which only shapes the modulation while transmitting
+PATTERNS = (0x00, 0xFF, 0x55, 0xAA) + tuple(1 << bit for bit in range(0, 8))
+
+
+def __write__(reader, addr, val):
+    reader.transport.transfer(bytearray([(addr << 1) & 0x7E, val]))
+
+
+def __read__(reader, addr, count=1):
+    frame = bytearray([((addr << 1) & 0x7E) | 0x80] * count + [0])
+    return bytearray(reader.transport.transfer(frame))[1:count + 1]
+
+
+def verify_link(reader, rounds=3, version=None):
+    """
+    Check that the SPI link to the chip works at the current clock. Talks to the transport
+    directly, bypassing the register shadow of the driver, so every access goes over the bus:
+
+    - VersionReg reads `version`.
+    - Patterns written to ModWidthReg read back the same. The original value is restored.
+    - 64 bytes burst into the FIFO come back out in order, and FIFOLevelReg counts them.
+
+    Args:
+        reader (MFRC522): The driver, only its transport and register addresses are used.
+        rounds (int): How many times to repeat the checks. 3 by default.
+        version (uint8): The expected content of VersionReg. Read first if omitted.
+
+    Returns:
+        boolean: Whether or not every check passed.
+    """
+    if version is None:
+        version = __read__(reader, reader.VersionReg)[0]
+    mod_width = __read__(reader, reader.ModWidthReg)[0]
+    try:
+        for n in range(0, rounds):
+            if __read__(reader, reader.VersionReg)[0] != version:
+                return False
+            for pattern in PATTERNS:
+                __write__(reader, reader.ModWidthReg, pattern)
+                if __read__(reader, reader.ModWidthReg)[0] != pattern:
+                    return False
+            # A different payload every round, so a stuck FIFO is noticed
+            payload = bytearray((i * 37 + n * 11) & 0xFF for i in range(0, reader.FIFO_SIZE))
+            __write__(reader, reader.CommandReg, reader.PCD_IDLE)
+            __write__(reader, reader.FIFOLevelReg, 0x80)
+            reader.transport.transfer(bytearray([(reader.FIFODataReg << 1) & 0x7E]) + payload)
+            if __read__(reader, reader.FIFOLevelReg)[0] != reader.FIFO_SIZE:
+                return False
+            if __read__(reader, reader.FIFODataReg, reader.FIFO_SIZE) != payload:
+                return False
+        return True
+    finally:
+        __write__(reader, reader.FIFOLevelReg, 0x80)
+        __write__(reader, reader.ModWidthReg, mod_width)
+
+
+def __key__(dev, cs_pin=None):
+    return dev if cs_pin is None else "{}#{}".format(dev, cs_pin)
+
+
+def load_speed(dev, cs_pin=None, path=DEFAULT_PATH):
+    """
+    Returns:
+        int: The speed calibrated for the socket (and chip select pin), or None if it was never calibrated.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f).get(__key__(dev, cs_pin))
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def save_speed(dev, spd, cs_pin=None, path=DEFAULT_PATH):
+    """
+    Remember the speed of a socket (and chip select pin), keeping those of others.
+    """
+    try:
+        with open(path) as f:
+            speeds = json.load(f)
+    except (IOError, OSError, ValueError):
+        speeds = {}
+    speeds[__key__(dev, cs_pin)] = spd
+    # Written aside and renamed, so readers never see a half written file
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(speeds, f, indent=2, sort_keys=True)
+    os.rename(tmp, path)
+
+
+def calibrate(reader, speeds=SPEEDS, rounds=3, margin=1):
+    """
+    Step the SPI clock up through `speeds`, running `verify_link` at every step, until a
+    speed fails. Marginal links tend to fail intermittently, so the result stays `margin`
+    steps below the fastest speed that passed, the one right before the first failing speed.
+    If none fails, the margin is kept below the fastest speed all the same: passing a few
+    rounds at the edge of what the wiring handles proves as little there as anywhere else.
+
+    The transport is left at the chosen speed.
+
+    Args:
+        reader (MFRC522): The driver whose transport to calibrate. Its transport needs `set_speed`.
+        speeds ([int]): The clocks to try in Hz, slowest first. .SPEEDS by default.
+        rounds (int): The number of `verify_link` rounds per speed. 3 by default.
+        margin (int): How many steps to stay below the fastest speed that passed. 0 takes that speed itself. 1 by default.
+
+    Returns:
+        int: The chosen speed in Hz.
+
+    Raises:
+        errors.LinkException: If the link does not even work at the slowest speed.
+    """
+    transport = reader.transport
+    if not hasattr(transport, "set_speed"):
+        raise errors.LinkException("Transport cannot change the SPI clock.")
+    speeds = sorted(speeds)
+    transport.set_speed(speeds[0])
+    version = __read__(reader, reader.VersionReg)[0]
+    if version in (0x00, 0xFF) or not verify_link(reader, rounds, version):
+        raise errors.LinkException("SPI link check failed at {} Hz.".format(speeds[0]))
+    # Index of the fastest speed that passed
+    passed = len(speeds) - 1
+    for (i, spd) in enumerate(speeds[1:], 1):
+        transport.set_speed(spd)
+        if not verify_link(reader, rounds, version):
+            passed = i - 1
+            break
+    chosen = max(0, passed - margin)
+    transport.set_speed(speeds[chosen])
+    return speeds[chosen]
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+Host side ISO/IEC 14443-3 type A CRC (CRC_A), as otherwise calculated by the CalcCRC command of the MFRC522.
+"""
+
+CRC_A_INIT = 0x6363
+
+
+def __make_table__():
+    table = []
+    for byte in range(0, 256):
+        crc = byte
+        for _ in range(0, 8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0x8408
+            else:
+                crc >>= 1
+        table.append(crc)
+    return table
+
+
+CRC_A_TABLE = __make_table__()
+
+
+def crc_a_update(data, crc=CRC_A_INIT):
+    """
+    Feeds the passed bytes into a running CRC_A register.
+
+    Args:
+        data ([uint8]): The bytes to feed.
+        crc (uint16): The register value to start from. `CRC_A_INIT` by default.
+
+    Returns:
+        uint16: The new register value.
+    """
+    table = CRC_A_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def crc_a(data, crc=CRC_A_INIT):
+    """
+    Computes the CRC_A over the passed bytes.
+
+    Returns:
+        [uint8]: The two CRC bytes, least significant byte first, ready to be appended to the frame.
+    """
+    crc = crc_a_update(data, crc)
+    return [crc & 0xFF, crc >> 8]
+
+
+def __make_command_table__(commands):
+    table = {}
+    for command in commands:
+        for block in range(0, 256):
+            table[(command << 8) | block] = tuple(crc_a((command, block)))
+    return table
+
+
+# Two byte frames (command, block) are fully determined by their content, so their CRC is looked up.
+# READ, WRITE, DECREMENT, INCREMENT, RESTORE, TRANSFER and HALT
+__command_crc__ = __make_command_table__((0x30, 0xA0, 0xC0, 0xC1, 0xC2, 0xB0, 0x50))
+
+
+def crc_a_command(command, block):
+    """
+    Returns the CRC_A of a two byte (command, block) frame such as READ, WRITE or HALT from a precomputed table.
+
+    Returns:
+        [uint8]: The two CRC bytes, least significant byte first.
+    """
+    result = __command_crc__.get((command << 8) | block)
+    if result is None:
+        return crc_a((command, block))
+    return list(result)
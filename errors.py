@@ -17,6 +17,41 @@ class AuthenticationException(Exception):
         super(AuthenticationException, self).__init__(message)
 
 
+class CRCMismatchException(Exception):
+    """Exception for when the CRC calculated on the host differs from the one of the chip."""
+
+    def __init__(self, message="CRC mismatch between host and chip."):
+        super(CRCMismatchException, self).__init__(message)
+
+
+class VerificationException(Exception):
+    """Exception for when a written block reads back differently."""
+
+    def __init__(self, message="Verification failed."):
+        super(VerificationException, self).__init__(message)
+
+
+class LinkException(Exception):
+    """Exception for when the SPI link to the MFRC522 does not work reliably."""
+
+    def __init__(self, message="SPI link check failed."):
+        super(LinkException, self).__init__(message)
+
+
+class DaemonException(Exception):
+    """Exception for when the daemon could not carry out a request."""
+
+    def __init__(self, message="Daemon request failed."):
+        super(DaemonException, self).__init__(message)
+
+
+class TraceException(Exception):
+    """Exception for when a SPI trace can not be read or replayed."""
+
+    def __init__(self, message="Invalid trace."):
+        super(TraceException, self).__init__(message)
+
+
 class InvalidValueException(Exception):
     """Exception for when the passed value is invalid"""
     pass
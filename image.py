@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import struct
+import errors
+from layout import BLOCK_SIZE, CLASSIC_1K
+
+
+def encode_value(value, addr):
+    """
+    Lay out a MIFARE value block: the value, its inverse and the value again, followed by
+    the address byte, its inverse, the address and its inverse.
+
+    Args:
+        value (int): The signed 32 bit value.
+        addr (uint8): The address byte, usually the number of the block (used by backup schemes).
+
+    Returns:
+        bytes: The 16 bytes of the value block.
+
+    Raises:
+        errors.InvalidValueException: If the value does not fit into 32 bits or the address into 8.
+    """
+    if not -0x80000000 <= value <= 0x7FFFFFFF or not 0 <= addr <= 0xFF:
+        raise errors.InvalidValueException("Invalid value block content.")
+    raw = struct.pack("<i", value)
+    inverse = bytes(0xFF - byte for byte in bytearray(raw))
+    return raw + inverse + raw + bytes(bytearray([addr, 0xFF - addr, addr, 0xFF - addr]))
+
+
+def decode_value(data):
+    """
+    Args:
+        data ([uint8]): The 16 bytes of a block.
+
+    Returns:
+        (int, uint8): The value and address byte of the value block, or None if the block is not formatted as one.
+    """
+    data = bytes(bytearray(data))
+    if len(data) != 16:
+        return None
+    raw = data[0:4]
+    if data[8:12] != raw or data[4:8] != bytes(0xFF - byte for byte in bytearray(raw)):
+        return None
+    addr = bytearray(data[12:16])
+    if addr[0] != addr[2] or addr[1] != addr[3] or addr[0] != 0xFF - addr[1]:
+        return None
+    return (struct.unpack("<i", raw)[0], addr[0])
+
+
+class ClassicImage:
+    """
+    The memory of a MIFARE Classic tag as one contiguous buffer, as returned by `MFRC522.ReadImage`.
+
+    Blocks, sectors and trailers are handed out as `memoryview` slices of `buffer`, so
+    looking at parts of the image never copies data. Where the sectors and trailers lie is
+    taken from the layout of the tag, see `layout.Layout`.
+
+    Args:
+        buffer (bytearray): The image to wrap, `layout.size` bytes. A zeroed one by default.
+        layout (Layout): The geometry of the tag. layout.CLASSIC_1K by default.
+    """
+    BLOCK_SIZE = BLOCK_SIZE
+
+    def __init__(self, buffer=None, layout=CLASSIC_1K):
+        self.layout = layout
+        self.SECTORS = layout.sectors
+        self.BLOCKS = layout.blocks
+        self.SIZE = layout.size
+        if buffer is None:
+            buffer = bytearray(self.SIZE)
+        if len(buffer) != self.SIZE:
+            raise ValueError("Image must be {} bytes".format(self.SIZE))
+        self.buffer = buffer
+        self.view = memoryview(self.buffer)
+        # Blocks that were actually read from the tag
+        self.read_blocks = set()
+
+    def copy(self, blocks=None):
+        """
+        Args:
+            blocks ([int]): The blocks to take over. All blocks that were read by default.
+
+        Returns:
+            ClassicImage: An independent copy, holding only `blocks`.
+        """
+        if blocks is None:
+            image = self.__class__(bytearray(self.buffer), self.layout)
+            image.read_blocks = set(self.read_blocks)
+            return image
+        image = self.__class__(layout=self.layout)
+        for block in blocks:
+            if block in self.read_blocks:
+                image.block(block)[:] = self.block(block)
+                image.read_blocks.add(block)
+        return image
+
+    def block(self, block):
+        """
+        Returns:
+            memoryview: The 16 bytes of the block.
+        """
+        offset = self.layout.offsets[block]
+        return self.view[offset:offset + self.BLOCK_SIZE]
+
+    def sector(self, sector):
+        """
+        Returns:
+            memoryview: The 64 (or 256) bytes of the sector, including its trailer.
+        """
+        offset = self.layout.first_blocks[sector] * self.BLOCK_SIZE
+        return self.view[offset:offset + self.layout.sector_sizes[sector] * self.BLOCK_SIZE]
+
+    def trailer_block(self, sector):
+        return self.layout.trailers[sector]
+
+    def trailer(self, sector):
+        """
+        Returns:
+            memoryview: The 16 bytes of the sector trailer.
+        """
+        return self.block(self.layout.trailers[sector])
+
+    def is_trailer(self, block):
+        return self.layout.is_trailer(block)
+
+    def data_block_numbers(self):
+        """
+        Returns:
+            [int]: All data blocks in order. The first sector and the sector trailers are not included.
+        """
+        return list(self.layout.data_blocks)
+
+    def data_blocks(self):
+        """
+        Returns:
+            [memoryview]: The slices of all data blocks in order, see `data_block_numbers`.
+        """
+        return [self.block(block) for block in self.data_block_numbers()]
+
+    def text_offset(self, block):
+        """
+        Returns:
+            int: Where the content of the data block starts in `text`, or None for the first sector and the sector trailers.
+        """
+        index = self.layout.data_index[block]
+        return None if index is None else index * self.BLOCK_SIZE
+
+    def text(self):
+        """
+        Returns:
+            string: The data blocks interpreted as one string, each byte according to pythons ```chr(value)```.
+        """
+        return "".join(bytes(block).decode("latin-1") for block in self.data_blocks())
+
+    def write_text(self, text):
+        """
+        Lay a string out over the data blocks like `MFRC522.WriteText` does. The last block is padded with 0x00.
+
+        Args:
+            text (string): The string to store.
+
+        Returns:
+            [int]: The data blocks the text occupies.
+
+        Raises:
+            errors.TextTooLongException: If the text takes up more space than there are data blocks available.
+        """
+        blocks = self.data_block_numbers()
+        if len(text) > len(blocks) * self.BLOCK_SIZE:
+            raise errors.TextTooLongException
+        data = bytes(bytearray(ord(x) for x in text))
+        used = blocks[0:(len(data) + self.BLOCK_SIZE - 1) // self.BLOCK_SIZE]
+        for block in used:
+            offset = self.text_offset(block)
+            chunk = data[offset:offset + self.BLOCK_SIZE]
+            self.block(block)[:] = chunk + bytes(self.BLOCK_SIZE - len(chunk))
+        return used
+
+    def value(self, block):
+        """
+        Returns:
+            (int, uint8): The value and address byte if the block is a value block, see `decode_value`. Otherwise None.
+        """
+        return decode_value(self.block(block))
+
+    def set_value(self, block, value, addr=None):
+        """
+        Format a block as value block, see `encode_value`. The address byte is the block number by default.
+        """
+        self.block(block)[:] = encode_value(value, block if addr is None else addr)
+
+    def diff(self, other, blocks=None):
+        """
+        Args:
+            other (ClassicImage): The image to compare with.
+            blocks ([int]): The blocks to compare. All blocks by default.
+
+        Returns:
+            [int]: The blocks whose content differs.
+        """
+        if blocks is None:
+            blocks = range(0, self.BLOCKS)
+        return [block for block in blocks if self.block(block) != other.block(block)]
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import atexit
+import json
+import os
+import time
+import weakref
+from collections import Counter, OrderedDict
+
+# The rings with a file, flushed when the interpreter exits. Weak, so they do not outlive their users
+__rings__ = weakref.WeakSet()
+
+
+@atexit.register
+def __flush_rings__():
+    for ring in list(__rings__):
+        ring.flush()
+
+
+class KeyRing:
+    """
+    The keys of a fleet of MIFARE Classic tags, accepted by the bulk operations of `MFRC522`
+    (`ReadImage`, `WriteImage`, `WriteText`, `DumpClassic1K_Data`, ...) instead of a single key.
+
+    Keys can be valid for every tag or only for some sectors or one uid, as Key A or Key B,
+    or be derived from the uid and sector by a diversification function. For every tag and
+    sector the key that worked is remembered in a bounded LRU cache, and every key keeps a
+    hit count per sector, so the first candidate tried is usually the right one:
+    ```
+    ring = KeyRing(path="/var/lib/rfid/keys.json")
+    ring.add([0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF])
+    ring.add([0xA0, 0xA1, 0xA2, 0xA3, 0xA4, 0xA5], sectors=[1, 2], key_types=[KeyRing.KEY_B])
+    ring.add_diversified(lambda uid, sector: derive(master, uid, sector), sectors=range(3, 16))
+    image = MIFAREReader.ReadImage(ring, uid)
+    ring.close()
+    ```
+
+    Learning a key only marks the ring as changed, authenticating never waits for the file.
+    It is written by `flush()`, at most every `flush_interval` seconds while keys are learned,
+    and by `close()` or at the end of a `with` block. Rings still alive when the interpreter
+    exits are flushed as well, a ring that is garbage collected before is not.
+
+    Args:
+        keys ([[uint8]]): Keys valid for every tag and sector, tried as Key A. None by default.
+        path (string): JSON file the learned keys are persisted to and loaded from. Nothing is persisted by default.
+        capacity (int): How many (uid, sector) pairs to remember. 1024 by default.
+        flush_interval (float): The least seconds between two writes of the file while keys are learned. 60 by default.
+    """
+    KEY_A = 0x60
+    KEY_B = 0x61
+
+    def __init__(self, keys=None, path=None, capacity=1024, flush_interval=60.0):
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        # Whether or not the learned keys changed since they were last written
+        self.dirty = False
+        self.__flushed__ = time.monotonic()
+        self.entries = []
+        # (uid, sector) -> (key type, key), least recently used first
+        self.learned = OrderedDict()
+        # (sector, key type, key) -> successful authentications
+        self.hits = Counter()
+        for key in keys or []:
+            self.add(key)
+        if path is not None and os.path.exists(path):
+            self.load()
+        if path is not None:
+            __rings__.add(self)
+
+    @staticmethod
+    def __uid__(uid):
+        # A 4 byte uid may still carry its check byte, see `MFRC522.Anticoll`
+        return tuple(uid[0:4]) if len(uid) in (4, 5) else tuple(uid)
+
+    def add(self, key, sectors=None, uid=None, key_types=(KEY_A,)):
+        """
+        Add a candidate key.
+
+        Args:
+            key ([uint8]): The 6 byte key.
+            sectors ([int]): The sectors the key is valid for. All by default.
+            uid ([uint8]): The only tag the key is valid for. Every tag by default.
+            key_types ([uint8]): Try the key as .KEY_A and/or .KEY_B, in this order. Key A by default.
+        """
+        if len(key) != 6:
+            raise ValueError("A key has 6 bytes")
+        self.entries.append({
+            "key": tuple(key),
+            "function": None,
+            "sectors": None if sectors is None else frozenset(sectors),
+            "uid": None if uid is None else self.__uid__(uid),
+            "key_types": tuple(key_types),
+        })
+
+    def add_diversified(self, function, sectors=None, key_types=(KEY_A,)):
+        """
+        Add keys that are derived from the uid of the tag.
+
+        Args:
+            function (callable): Called with the uid ([uint8], without check byte) and the sector, returns the 6 byte key.
+            sectors ([int]): The sectors the function applies to. All by default.
+            key_types ([uint8]): Try the key as .KEY_A and/or .KEY_B, in this order. Key A by default.
+        """
+        self.entries.append({
+            "key": None,
+            "function": function,
+            "sectors": None if sectors is None else frozenset(sectors),
+            "uid": None,
+            "key_types": tuple(key_types),
+        })
+
+    def candidates(self, uid, sector):
+        """
+        Args:
+            uid ([uint8]): The uid of the tag.
+            sector (int): The sector to authenticate.
+
+        Returns:
+            [(uint8, [uint8])]: The (key type, key) pairs to try in order: the one that worked last time,
+                then the keys for this uid, then all others by how often they worked for the sector.
+        """
+        uid = self.__uid__(uid)
+        specific = []
+        general = []
+        for entry in self.entries:
+            if entry["sectors"] is not None and sector not in entry["sectors"]:
+                continue
+            if entry["uid"] is not None and entry["uid"] != uid:
+                continue
+            if entry["function"] is not None:
+                key = tuple(entry["function"](list(uid), sector))
+            else:
+                key = entry["key"]
+            for key_type in entry["key_types"]:
+                (specific if entry["uid"] is not None else general).append((key_type, key))
+        # sorted() is stable, keys that never worked keep the order they were added in
+        general = sorted(general, key=lambda candidate: -self.hits[(sector, ) + candidate])
+
+        result = []
+        learned = self.learned.get((uid, sector))
+        for candidate in ([learned] if learned is not None else []) + specific + general:
+            if candidate not in result:
+                result.append(candidate)
+        return [(key_type, list(key)) for (key_type, key) in result]
+
+    def learn(self, uid, sector, key_type, key):
+        """
+        Remember that a key worked. Called by `MFRC522` after every successful authentication with the ring.
+        """
+        entry = (self.__uid__(uid), sector)
+        value = (key_type, tuple(key))
+        changed = self.learned.get(entry) != value
+        self.learned[entry] = value
+        self.learned.move_to_end(entry)
+        while len(self.learned) > self.capacity:
+            self.learned.popitem(last=False)
+        self.hits[(sector, key_type, tuple(key))] += 1
+        # The hit counts alone are not worth a write of the file
+        if changed:
+            self.dirty = True
+            if self.path is not None and time.monotonic() - self.__flushed__ >= self.flush_interval:
+                self.flush()
+
+    def forget(self, uid, sector):
+        """Drop the remembered key of a sector, e.g. after the keys of the tag were changed."""
+        if self.learned.pop((self.__uid__(uid), sector), None) is not None:
+            self.dirty = True
+
+    def flush(self):
+        """
+        Write the learned keys to `path` if they changed since the last write.
+        """
+        if self.dirty and self.path is not None:
+            self.save()
+
+    def close(self):
+        """Write pending changes, see `flush`. The ring can still be used afterwards."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def save(self, path=None):
+        """
+        Persist the learned keys and hit counts. The file is replaced atomically and only readable by its owner.
+
+        Args:
+            path (string): The file to write. `path` of the ring by default.
+        """
+        path = path or self.path
+        data = {
+            "learned": [[list(uid), sector, key_type, list(key)] for ((uid, sector), (key_type, key)) in self.learned.items()],
+            "hits": [[sector, key_type, list(key), n] for ((sector, key_type, key), n) in self.hits.items()],
+        }
+        temp = path + ".tmp"
+        # The file holds raw keys, only the owner may read it
+        fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        # A temp file left over from an earlier run keeps its mode on O_CREAT
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(temp, path)
+        if path == self.path:
+            self.dirty = False
+            self.__flushed__ = time.monotonic()
+
+    def load(self, path=None):
+        """
+        Load learned keys and hit counts written by `save`, replacing the current ones.
+
+        Args:
+            path (string): The file to read. `path` of the ring by default.
+        """
+        with open(path or self.path) as f:
+            data = json.load(f)
+        self.learned = OrderedDict()
+        for (uid, sector, key_type, key) in data.get("learned", [])[-self.capacity:]:
+            self.learned[(tuple(uid), sector)] = (key_type, tuple(key))
+        self.hits = Counter()
+        for (sector, key_type, key, n) in data.get("hits", []):
+            self.hits[(sector, key_type, tuple(key))] = n
+        self.dirty = False
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+BLOCK_SIZE = 16
+
+
+class Layout:
+    """
+    The memory geometry of a MIFARE Classic tag. The 1K (and Mini) tags are made of sectors
+    of 4 blocks, the 2K and 4K tags continue with 16 block sectors from block 128 on. The
+    last block of every sector is its trailer.
+
+    Everything the driver looks up per block (its sector, the first block and trailer of that
+    sector, its position among the data blocks, its offset in an image) is computed once
+    here, so the lookups are plain tuple indexing.
+
+    Args:
+        name (string): The name of the tag type, e.g. "1K".
+        sector_sizes ([int]): The number of blocks of every sector, in order.
+    """
+
+    def __init__(self, name, sector_sizes):
+        self.name = name
+        self.sector_sizes = tuple(sector_sizes)
+        self.sectors = len(self.sector_sizes)
+        self.blocks = sum(self.sector_sizes)
+        self.size = self.blocks * BLOCK_SIZE
+
+        first_blocks = []
+        sector_of = []
+        for (sector, count) in enumerate(self.sector_sizes):
+            first_blocks.append(len(sector_of))
+            sector_of += [sector] * count
+        # Block -> sector, sector -> first block and sector -> trailer
+        self.sector_of = tuple(sector_of)
+        self.first_blocks = tuple(first_blocks)
+        self.trailers = tuple(first + count - 1 for (first, count) in zip(first_blocks, self.sector_sizes))
+        self.trailer_flags = tuple(block == self.trailers[sector_of[block]] for block in range(0, self.blocks))
+        # The manufacturer block and the trailers hold no user data
+        self.data_blocks = tuple(block for block in range(self.sector_sizes[0], self.blocks) if not self.trailer_flags[block])
+        # Block -> position in .data_blocks, None for the other blocks
+        data_index = [None] * self.blocks
+        for (index, block) in enumerate(self.data_blocks):
+            data_index[block] = index
+        self.data_index = tuple(data_index)
+        self.offsets = tuple(block * BLOCK_SIZE for block in range(0, self.blocks))
+
+    def __repr__(self):
+        return "Layout({!r})".format(self.name)
+
+    def is_trailer(self, block):
+        return self.trailer_flags[block]
+
+    def blocks_of(self, sector):
+        """
+        Returns:
+            range: The blocks of the sector, including its trailer.
+        """
+        first = self.first_blocks[sector]
+        return range(first, first + self.sector_sizes[sector])
+
+
+MINI = Layout("Mini", [4] * 5)
+CLASSIC_1K = Layout("1K", [4] * 16)
+CLASSIC_2K = Layout("2K", [4] * 32)
+CLASSIC_4K = Layout("4K", [4] * 32 + [16] * 8)
+
+# The SAK of the tag types, see NXP AN10833 "MIFARE type identification procedure"
+__by_sak__ = {
+    0x09: MINI,
+    0x08: CLASSIC_1K,
+    0x88: CLASSIC_1K,
+    0x28: CLASSIC_1K,
+    0x19: CLASSIC_2K,
+    0x10: CLASSIC_2K,
+    0x18: CLASSIC_4K,
+    0x38: CLASSIC_4K,
+    0x11: CLASSIC_4K,
+}
+
+
+def layout_for_sak(sak):
+    """
+    Args:
+        sak (uint8): The SAK the tag answered the selection with.
+
+    Returns:
+        Layout: The layout of the tag type. CLASSIC_1K for unknown types.
+    """
+    return __by_sak__.get(sak, CLASSIC_1K)
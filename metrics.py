@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import functools
+import threading
+import time
+from collections import Counter
+
+
+def timed(command):
+    """
+    Decorator for driver methods that records their latency under `command` in the
+    `Metrics` attached to the driver. Without metrics attached it only costs one call.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            metrics = self.metrics
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                metrics.observe(command, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+class Histogram:
+    """
+    Cumulative latency histogram in the Prometheus sense.
+
+    Args:
+        buckets ([float]): The upper bounds of the buckets in seconds.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = list(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for (i, bound) in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def snapshot(self):
+        cumulative = []
+        total = 0
+        for (bound, count) in zip(self.buckets, self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return {"buckets": cumulative, "count": self.count, "sum": self.sum}
+
+
+class Metrics:
+    """
+    Opt-in instrumentation of an `MFRC522` driver. Attach it with `MFRC522(metrics=Metrics())`.
+
+    Records register accesses and SPI transactions, the latency of every PICC command
+    (REQA, ANTICOLL, SELECT, AUTH, READ, WRITE, ...), the iterations spent in the polling
+    loops of `ToCard` and `CalulateCRC`, and errors and timeouts. Read it with `snapshot()`,
+    or expose it to Prometheus with `prometheus()`/`serve()`.
+
+    Args:
+        buckets ([float]): The latency histogram bounds in seconds.
+    """
+    BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, float("inf"))
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        # Address to name, filled in by the driver the metrics get attached to
+        self.register_names = {}
+        self.__lock__ = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Sets all metrics back to zero."""
+        with self.__lock__:
+            self.transactions = 0
+            self.register_reads = Counter()
+            self.register_writes = Counter()
+            self.poll_iterations = Counter()
+            self.errors = Counter()
+            self.histograms = {}
+
+    def register_read(self, addr, count=1):
+        with self.__lock__:
+            self.transactions += 1
+            self.register_reads[addr] += count
+
+    def register_write(self, addr, count=1):
+        with self.__lock__:
+            self.transactions += 1
+            self.register_writes[addr] += count
+
+    def poll(self, loop, iterations):
+        with self.__lock__:
+            self.poll_iterations[loop] += iterations
+
+    def error(self, kind):
+        with self.__lock__:
+            self.errors[kind] += 1
+
+    def observe(self, command, seconds):
+        with self.__lock__:
+            histogram = self.histograms.get(command)
+            if histogram is None:
+                histogram = self.histograms[command] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def __register_name__(self, addr):
+        return self.register_names.get(addr, "0x{:02X}".format(addr))
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: A copy of all metrics, registers by name.
+        """
+        with self.__lock__:
+            return {
+                "transactions": self.transactions,
+                "register_reads": dict((self.__register_name__(addr), n) for (addr, n) in self.register_reads.items()),
+                "register_writes": dict((self.__register_name__(addr), n) for (addr, n) in self.register_writes.items()),
+                "poll_iterations": dict(self.poll_iterations),
+                "errors": dict(self.errors),
+                "commands": dict((command, histogram.snapshot()) for (command, histogram) in self.histograms.items()),
+            }
+
+    def prometheus(self):
+        """
+        Returns:
+            string: All metrics in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            "# TYPE mfrc522_spi_transactions_total counter",
+            "mfrc522_spi_transactions_total {}".format(snapshot["transactions"]),
+            "# TYPE mfrc522_register_accesses_total counter",
+        ]
+        for (access, key) in (("read", "register_reads"), ("write", "register_writes")):
+            for (register, n) in sorted(snapshot[key].items()):
+                lines.append('mfrc522_register_accesses_total{{register="{}",access="{}"}} {}'.format(register, access, n))
+        lines.append("# TYPE mfrc522_poll_iterations_total counter")
+        for (loop, n) in sorted(snapshot["poll_iterations"].items()):
+            lines.append('mfrc522_poll_iterations_total{{loop="{}"}} {}'.format(loop, n))
+        lines.append("# TYPE mfrc522_errors_total counter")
+        for (kind, n) in sorted(snapshot["errors"].items()):
+            lines.append('mfrc522_errors_total{{kind="{}"}} {}'.format(kind, n))
+        lines.append("# TYPE mfrc522_command_duration_seconds histogram")
+        for (command, histogram) in sorted(snapshot["commands"].items()):
+            for (bound, n) in histogram["buckets"]:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append('mfrc522_command_duration_seconds_bucket{{command="{}",le="{}"}} {}'.format(command, le, n))
+            lines.append('mfrc522_command_duration_seconds_sum{{command="{}"}} {}'.format(command, histogram["sum"]))
+            lines.append('mfrc522_command_duration_seconds_count{{command="{}"}} {}'.format(command, histogram["count"]))
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=9522, host="127.0.0.1"):
+        """
+        Serve `prometheus()` over HTTP from a background thread.
+
+        Args:
+            port (int): The port to listen on. 9522 by default.
+            host (string): The address to bind to. Only localhost by default.
+
+        Returns:
+            http.server.HTTPServer: The running server, call `shutdown()` to stop it.
+        """
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = HTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return server
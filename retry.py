@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+
+class RetryPolicy:
+    """
+    How the bulk helpers of `MFRC522` (`ReadImage`, `WriteImage` and the dumps) as well as
+    `Read` and `Write` deal with a failed exchange, e.g. at the edge of the antenna range.
+    Only the failed authentication, read or write is repeated: the tag is woken up and
+    selected again, its sector authenticated again and the operation resumed where it
+    failed. A read or write the tag refused, e.g. because the access bits deny it, fails
+    the same way every time and is not repeated. Before every new attempt the reader waits, starting with `backoff` seconds and
+    growing by `factor` up to `max_backoff`.
+
+    Increment, decrement and restore are never retried, repeating them is not idempotent.
+
+    Args:
+        attempts (int): The attempts per operation, including the first one. 1 disables retries. 3 by default.
+        backoff (float): The seconds to wait before the second attempt. 0.005 by default.
+        factor (float): The growth of the wait with every further attempt. 2.0 by default.
+        max_backoff (float): The longest wait in seconds. 0.05 by default.
+    """
+
+    def __init__(self, attempts=3, backoff=0.005, factor=2.0, max_backoff=0.05):
+        if attempts < 1:
+            raise ValueError("At least one attempt is needed")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.factor = factor
+        self.max_backoff = max_backoff
+
+    def delay(self, attempts):
+        """
+        Args:
+            attempts (int): The attempts made so far.
+
+        Returns:
+            float: The seconds to wait before the next attempt.
+        """
+        return min(self.backoff * self.factor ** (attempts - 1), self.max_backoff)
+
+
+class OperationResult:
+    """
+    The outcome of one operation on a tag, see `MFRC522.results`.
+
+    Args:
+        operation (string): "auth", "read", "write", "value" (increment or decrement) or "transfer".
+        block (int): The block operated on. For "auth" the first block of the sector.
+        ok (boolean): Whether or not the operation succeeded in the end.
+        attempts (int): The attempts it took, see `RetryPolicy`.
+        denied (boolean): Whether or not the tag refused a read or write, which is never retried.
+    """
+    __slots__ = ("operation", "block", "ok", "attempts", "denied")
+
+    def __init__(self, operation, block, ok, attempts=1, denied=False):
+        self.operation = operation
+        self.block = block
+        self.ok = ok
+        self.attempts = attempts
+        self.denied = denied
+
+    def __repr__(self):
+        return "OperationResult({!r}, {}, {}, {}, {})".format(self.operation, self.block, self.ok, self.attempts, self.denied)
@@ -0,0 +1,599 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import random
+import struct
+from collections import Counter
+from crc import crc_a
+from image import decode_value, encode_value
+from layout import CLASSIC_1K, CLASSIC_4K, MINI
+
+
+class VirtualClassic1K:
+    """
+    A MIFARE Classic 1K tag living in the field of a `SimulatedTransport`. The memory is laid
+    out according to .LAYOUT, see `VirtualClassicMini` and `VirtualClassic4K`.
+
+    The tag follows the ISO 14443A state machine (IDLE, READY, ACTIVE, HALT), checks
+    keys and the access bits of each sector trailer, and answers the frames sent by
+    the reader. Crypto1 itself is not modelled, an authenticated sector is simply
+    remembered until the tag is deselected or the reader drops MFCrypto1On.
+
+    Single (4 byte), double (7 byte) and triple (10 byte) size uids are supported, and
+    several tags in one field answer the bit oriented anticollision just like real ones.
+
+    Args:
+        uid ([uint8]): The 4, 7 or 10 byte uid of the tag.
+        key_a ([uint8]): Key A of every sector trailer. 6 bytes of 0xFF by default.
+        key_b ([uint8]): Key B of every sector trailer. 6 bytes of 0xFF by default.
+        access ([uint8]): Access bytes 6 to 9 of every sector trailer. Transport configuration by default.
+    """
+    LAYOUT = CLASSIC_1K
+
+    ATQA = [0x04, 0x00]
+    SAK = 0x08
+
+    ACK = 0x0A
+    NAK = 0x04
+
+    STATE_IDLE   = "IDLE"
+    STATE_READY  = "READY"
+    STATE_ACTIVE = "ACTIVE"
+    STATE_HALT   = "HALT"
+
+    # Access conditions of data blocks, indexed by (C1, C2, C3):
+    # (read, write, increment, decrement/transfer/restore) key types
+    __data_access__ = {
+        (0, 0, 0): ("AB", "AB", "AB", "AB"),
+        (0, 1, 0): ("AB", "", "", ""),
+        (1, 0, 0): ("AB", "B", "", ""),
+        (1, 1, 0): ("AB", "B", "B", "AB"),
+        (0, 0, 1): ("AB", "", "", "AB"),
+        (0, 1, 1): ("B", "B", "", ""),
+        (1, 0, 1): ("B", "", "", ""),
+        (1, 1, 1): ("", "", "", ""),
+    }
+    # Access conditions of sector trailers, indexed by (C1, C2, C3): (key B readable, trailer writable) key types
+    __trailer_access__ = {
+        (0, 0, 0): ("A", "A"),
+        (0, 1, 0): ("A", ""),
+        (1, 0, 0): ("", "B"),
+        (1, 1, 0): ("", ""),
+        (0, 0, 1): ("A", "A"),
+        (0, 1, 1): ("", "B"),
+        (1, 0, 1): ("", ""),
+        (1, 1, 1): ("", ""),
+    }
+
+    def __init__(self, uid=(0xDE, 0xAD, 0xBE, 0xEF), key_a=None, key_b=None, access=None):
+        self.uid = list(uid)
+        if len(self.uid) not in (4, 7, 10):
+            raise ValueError("uid must be 4, 7 or 10 bytes")
+        key_a = list(key_a) if key_a is not None else [0xFF] * 6
+        key_b = list(key_b) if key_b is not None else [0xFF] * 6
+        access = list(access) if access is not None else [0xFF, 0x07, 0x80, 0x69]
+
+        # The uid split up into the cascade levels, each with its cascade tag (0x88) and check byte
+        self.cascade = []
+        rest = list(self.uid)
+        while rest:
+            part = rest[0:4] if len(rest) == 4 else [0x88] + rest[0:3]
+            rest = rest[len(part) - (0 if len(rest) == 4 else 1):]
+            bcc = 0
+            for byte in part:
+                bcc ^= byte
+            self.cascade.append(part + [bcc])
+        # The uid size lives in the upper two bits of the ATQA
+        self.atqa = [self.ATQA[0] | {4: 0x00, 7: 0x40, 10: 0x80}[len(self.uid)], self.ATQA[1]]
+
+        self.blocks = [[0x00] * 16 for _ in range(self.LAYOUT.blocks)]
+        if len(self.uid) == 4:
+            self.blocks[0] = (self.cascade[0] + [self.SAK] + self.atqa[::-1] + [0x00] * 16)[0:16]
+        else:
+            self.blocks[0] = (self.uid + [self.SAK] + self.atqa[::-1] + [0x00] * 16)[0:16]
+        for sector in range(0, self.LAYOUT.sectors):
+            self.blocks[self.trailer_of(sector)] = key_a + access + key_b
+
+        self.state = self.STATE_IDLE
+        self.level = 0
+        self.auth_sector = None
+        self.auth_key_type = None
+        self.pending = None
+        self.transfer_buffer = None
+
+    def auth_uid(self):
+        """
+        Returns:
+            [uint8]: The 4 uid bytes used for authentication, the last 4 bytes of longer uids.
+        """
+        return self.uid[-4:]
+
+    def sector_of(self, block):
+        return self.LAYOUT.sector_of[block]
+
+    def trailer_of(self, sector):
+        return self.LAYOUT.trailers[sector]
+
+    def access_bits(self, block):
+        """
+        Returns:
+            (int, int, int): The access condition bits (C1, C2, C3) of the block.
+        """
+        sector = self.sector_of(block)
+        trailer = self.blocks[self.trailer_of(sector)]
+        # 16 block sectors share the access bits of a data block between groups of 5 blocks
+        index = block - self.LAYOUT.first_blocks[sector]
+        if self.LAYOUT.sector_sizes[sector] > 4:
+            index = 3 if self.is_trailer(block) else index // 5
+        c1 = (trailer[7] >> (4 + index)) & 0x01
+        c2 = (trailer[8] >> index) & 0x01
+        c3 = (trailer[8] >> (4 + index)) & 0x01
+        return (c1, c2, c3)
+
+    def is_trailer(self, block):
+        return self.LAYOUT.trailer_flags[block]
+
+    def can_read(self, block):
+        if self.auth_sector != self.sector_of(block):
+            return False
+        if self.is_trailer(block):
+            return True
+        return self.auth_key_type in self.__data_access__[self.access_bits(block)][0]
+
+    def can_write(self, block):
+        if self.auth_sector != self.sector_of(block) or block == 0:
+            return False
+        if self.is_trailer(block):
+            return self.auth_key_type in self.__trailer_access__[self.access_bits(block)][1]
+        return self.auth_key_type in self.__data_access__[self.access_bits(block)][1]
+
+    def can_modify(self, block, command):
+        """
+        Returns:
+            boolean: Whether the value operation (0xC0 DECREMENT, 0xC1 INCREMENT, 0xC2 RESTORE, 0xB0 TRANSFER) is allowed on the block.
+        """
+        if self.auth_sector != self.sector_of(block) or block == 0 or self.is_trailer(block):
+            return False
+        return self.auth_key_type in self.__data_access__[self.access_bits(block)][2 if command == 0xC1 else 3]
+
+    def read_block(self, block):
+        data = list(self.blocks[block])
+        if self.is_trailer(block):
+            # Key A is never readable, key B only if the access bits allow it
+            data[0:6] = [0x00] * 6
+            if self.auth_key_type not in self.__trailer_access__[self.access_bits(block)][0]:
+                data[10:16] = [0x00] * 6
+        return data
+
+    def deauthenticate(self):
+        self.auth_sector = None
+        self.auth_key_type = None
+        self.pending = None
+        self.transfer_buffer = None
+
+    def reset(self):
+        self.state = self.STATE_IDLE
+        self.level = 0
+        self.deauthenticate()
+
+    def authenticate(self, auth_mode, block, key, uid):
+        """
+        Handles the MFAuthent command of the reader.
+
+        Returns:
+            boolean: Whether or not the authentication succeeded.
+        """
+        if self.state != self.STATE_ACTIVE or list(uid[0:4]) != self.auth_uid() or block >= len(self.blocks):
+            return False
+        trailer = self.blocks[self.trailer_of(self.sector_of(block))]
+        key_type = "A" if auth_mode == 0x60 else "B"
+        expected = trailer[0:6] if key_type == "A" else trailer[10:16]
+        if list(key) != expected:
+            # A failed authentication leaves the tag waiting for a new REQA
+            self.reset()
+            return False
+        self.auth_sector = self.sector_of(block)
+        self.auth_key_type = key_type
+        return True
+
+    def frame(self, data, bits):
+        """
+        Handles a frame sent by the reader.
+
+        Args:
+            data ([uint8]): The bytes of the frame.
+            bits (int): The number of valid bits in the last byte, 0 meaning all 8.
+
+        Returns:
+            ([uint8], int): The response and the number of valid bits in its last byte, or None if the tag stays silent.
+        """
+        if bits == 7 and len(data) == 1:
+            if data[0] == 0x26 and self.state == self.STATE_IDLE or \
+                    data[0] == 0x52 and self.state in (self.STATE_IDLE, self.STATE_HALT):
+                self.state = self.STATE_READY
+                self.level = 0
+                self.deauthenticate()
+                return (list(self.atqa), 0)
+            if self.state in (self.STATE_READY, self.STATE_ACTIVE):
+                # Unexpected in these states, the tag silently falls back to IDLE
+                self.reset()
+            return None
+
+        if self.state == self.STATE_READY:
+            return self.__anticollision__(data, bits)
+
+        if self.state != self.STATE_ACTIVE or not self.__crc_ok__(data):
+            return None
+
+        if self.pending is not None:
+            command, block = self.pending
+            self.pending = None
+            if command == 0xA0 and len(data) == 18:
+                self.blocks[block] = list(data[0:16])
+                return ([self.ACK], 4)
+            if command in (0xC0, 0xC1, 0xC2) and len(data) == 6:
+                # The second phase of a value operation is never acknowledged
+                (value, addr) = decode_value(self.blocks[block])
+                operand = struct.unpack("<i", bytes(bytearray(data[0:4])))[0]
+                if command == 0xC1:
+                    value += operand
+                elif command == 0xC0:
+                    value -= operand
+                self.transfer_buffer = ((value + 0x80000000) % 0x100000000 - 0x80000000, addr)
+                return None
+            return self.__nak__()
+
+        command = data[0]
+        if command == 0x50 and len(data) == 4:
+            self.state = self.STATE_HALT
+            self.deauthenticate()
+            return None
+        if command == 0x30 and len(data) == 4:
+            block = data[1]
+            if block >= len(self.blocks) or not self.can_read(block):
+                return self.__nak__()
+            return self.__with_crc__(self.read_block(block))
+        if command == 0xA0 and len(data) == 4:
+            block = data[1]
+            if block >= len(self.blocks) or not self.can_write(block):
+                return self.__nak__()
+            self.pending = (command, block)
+            return ([self.ACK], 4)
+        if command in (0xC0, 0xC1, 0xC2) and len(data) == 4:
+            block = data[1]
+            if block >= len(self.blocks) or not self.can_modify(block, command) or decode_value(self.blocks[block]) is None:
+                return self.__nak__()
+            self.pending = (command, block)
+            return ([self.ACK], 4)
+        if command == 0xB0 and len(data) == 4:
+            block = data[1]
+            if block >= len(self.blocks) or not self.can_modify(block, command) or self.transfer_buffer is None:
+                return self.__nak__()
+            self.blocks[block] = list(bytearray(encode_value(*self.transfer_buffer)))
+            return ([self.ACK], 4)
+        return self.__nak__()
+
+    def __anticollision__(self, data, bits):
+        # Only the SEL code of the current cascade level is answered, everything else is ignored
+        if len(data) < 2 or data[0] != 0x93 + 2 * self.level:
+            return None
+        part = self.cascade[self.level]
+
+        if data[1] == 0x70:
+            if len(data) == 9 and self.__crc_ok__(data) and data[2:7] == part:
+                if self.level + 1 < len(self.cascade):
+                    # uid not complete, the reader has to continue with the next cascade level
+                    self.level += 1
+                    return self.__with_crc__([0x04])
+                self.state = self.STATE_ACTIVE
+                return self.__with_crc__([self.SAK])
+            return None
+
+        # Number of valid bits: whole bytes in the upper nibble (including SEL and NVB), bits in the lower
+        known = ((data[1] >> 4) - 2) * 8 + (data[1] & 0x0F)
+        if known < 0 or known >= 40 or len(data) != 2 + (known + 7) // 8:
+            return None
+        for i in range(0, known):
+            if (data[2 + i // 8] >> (i % 8)) & 0x01 != (part[i // 8] >> (i % 8)) & 0x01:
+                return None
+        # Answer with the remaining bits, the first byte aligned to the position of the first unknown bit
+        response = list(part[known // 8:])
+        response[0] &= (0xFF << (known % 8)) & 0xFF
+        return (response, 0)
+
+    def __nak__(self):
+        self.reset()
+        return ([self.NAK], 4)
+
+    def __crc_ok__(self, data):
+        return len(data) > 2 and crc_a(data[:-2]) == list(data[-2:])
+
+    def __with_crc__(self, data):
+        return (data + crc_a(data), 0)
+
+
+class VirtualClassicMini(VirtualClassic1K):
+    """
+    A MIFARE Classic Mini tag: 5 sectors of 4 blocks, see `VirtualClassic1K`.
+    """
+    LAYOUT = MINI
+    SAK = 0x09
+
+
+class VirtualClassic4K(VirtualClassic1K):
+    """
+    A MIFARE Classic 4K tag: 32 sectors of 4 blocks followed by 8 sectors of 16 blocks, see `VirtualClassic1K`.
+    """
+    LAYOUT = CLASSIC_4K
+    ATQA = [0x02, 0x00]
+    SAK = 0x18
+
+
+class SimulatedTransport:
+    """
+    Software stand-in for the SPI bus and the MFRC522 behind it.
+
+    The register file of the reader is modelled as far as the driver relies on it:
+    the command register with Idle, CalcCRC, Transceive, MFAuthent and SoftReset,
+    the 64 byte FIFO, the interrupt request registers, the CRC result, the error
+    and control registers and the MFCrypto1On bit of Status2Reg. Frames are
+    exchanged with the `VirtualClassic1K` tags in `cards`, everything happens
+    instantly.
+
+    Every SPI transaction and every register access is counted, see `bus_stats()`.
+
+    The IRQ line is derived from the interrupt request and enable registers like on
+    the chip. `wait_for_irq` returns its state right away unless an `irq_source` is
+    injected, which is then called as `irq_source(asserted, timeout)` and decides
+    whether the driver sees an edge, e.g. to simulate lost or late interrupts.
+
+    Example:
+    ```
+    card = VirtualClassic1K(uid=[0x01, 0x02, 0x03, 0x04])
+    MIFAREReader = MFRC522(transport=SimulatedTransport([card]))
+    ```
+
+    Clocked faster than `max_speed`, the link gets unreliable like a long cable would:
+    every seventh transaction returns a byte with a flipped bit. With `dropout` set, the RF
+    field fails now and then like at the edge of the antenna range: the frame goes
+    unanswered and every tag loses power, falling back to IDLE without Crypto1.
+
+    Args:
+        cards ([VirtualClassic1K]): The tags in the field of the antenna. Can be changed later on.
+        irq_source (callable): Decides what `wait_for_irq` returns. None by default.
+        spd (int): The SPI clock in Hz, see `set_speed`. 1000000 by default.
+        max_speed (int): The fastest clock the link is reliable at. 10000000 by default.
+        dropout (float): The probability of a field dropout per exchange with the tags. 0 by default.
+        seed (int): Seed for the dropouts, to make them reproducible. None by default.
+    """
+    CommandReg   = 0x01
+    CommIEnReg   = 0x02
+    DivlEnReg    = 0x03
+    CommIrqReg   = 0x04
+    DivIrqReg    = 0x05
+    ErrorReg     = 0x06
+    Status2Reg   = 0x08
+    FIFODataReg  = 0x09
+    FIFOLevelReg = 0x0A
+    ControlReg   = 0x0C
+    BitFramingReg = 0x0D
+    CollReg      = 0x0E
+    CRCResultRegM = 0x21
+    CRCResultRegL = 0x22
+    VersionReg   = 0x37
+
+    PCD_IDLE       = 0x00
+    PCD_CALCCRC    = 0x03
+    PCD_TRANSCEIVE = 0x0C
+    PCD_AUTHENT    = 0x0E
+    PCD_RESETPHASE = 0x0F
+
+    FIFO_SIZE = 64
+    VERSION = 0x92
+
+    def __init__(self, cards=None, irq_source=None, spd=1000000, max_speed=10000000, dropout=0.0, seed=None):
+        self.cards = list(cards) if cards is not None else []
+        self.irq_source = irq_source
+        self.spd = spd
+        self.max_speed = max_speed
+        self.dropout = dropout
+        self.random = random.Random(seed)
+        self.dropouts = 0
+        self.reset_level = 0
+        self.registers = [0x00] * 0x40
+        self.fifo = []
+        self.reset_counters()
+        self.soft_reset()
+
+    def reset_counters(self):
+        """Sets all bus counters back to zero."""
+        self.transactions = 0
+        self.irq_waits = 0
+        self.register_reads = Counter()
+        self.register_writes = Counter()
+
+    def bus_stats(self):
+        """
+        Returns:
+            dict: The number of SPI transactions and register reads/writes since the last `reset_counters()`.
+        """
+        return {
+            "transactions": self.transactions,
+            "irq_waits": self.irq_waits,
+            "register_reads": sum(self.register_reads.values()),
+            "register_writes": sum(self.register_writes.values()),
+        }
+
+    def soft_reset(self):
+        self.registers = [0x00] * 0x40
+        self.registers[self.VersionReg] = self.VERSION
+        self.fifo = []
+
+    # Transport interface
+
+    def transfer(self, data):
+        data = list(data)
+        self.transactions += 1
+        if len(data) == 0:
+            return ()
+        if data[0] & 0x80:
+            response = [0x00]
+            for byte in data[0:-1]:
+                response.append(self.read_register((byte >> 1) & 0x3F))
+            if self.spd > self.max_speed and self.transactions % 7 == 0:
+                response[-1] ^= 0x01
+            return tuple(response)
+        addr = (data[0] >> 1) & 0x3F
+        for val in data[1:]:
+            self.write_register(addr, val)
+        return tuple([0x00] * len(data))
+
+    def set_speed(self, spd):
+        self.spd = spd
+
+    def set_reset(self, level):
+        if level and not self.reset_level:
+            self.soft_reset()
+        self.reset_level = level
+
+    def irq_asserted(self):
+        """
+        Returns:
+            boolean: Whether or not an enabled interrupt request is pending, i.e. the IRQ pin is active.
+        """
+        comm = self.registers[self.CommIrqReg] & self.registers[self.CommIEnReg] & 0x7F
+        div = self.registers[self.DivIrqReg] & self.registers[self.DivlEnReg] & 0x14
+        return bool(comm or div)
+
+    def wait_for_irq(self, timeout):
+        self.irq_waits += 1
+        if self.irq_source is not None:
+            return self.irq_source(self.irq_asserted(), timeout)
+        return self.irq_asserted()
+
+    def close(self):
+        pass
+
+    # Register file
+
+    def read_register(self, addr):
+        self.register_reads[addr] += 1
+        if addr == self.FIFODataReg:
+            return self.fifo.pop(0) if self.fifo else 0x00
+        if addr == self.FIFOLevelReg:
+            return len(self.fifo)
+        return self.registers[addr]
+
+    def write_register(self, addr, val):
+        self.register_writes[addr] += 1
+        val &= 0xFF
+        if addr == self.FIFODataReg:
+            if len(self.fifo) < self.FIFO_SIZE:
+                self.fifo.append(val)
+        elif addr == self.FIFOLevelReg:
+            if val & 0x80:
+                self.fifo = []
+        elif addr in (self.CommIrqReg, self.DivIrqReg):
+            # Bit 7 decides whether the marked bits get set or cleared
+            if val & 0x80:
+                self.registers[addr] |= val & 0x7F
+            else:
+                self.registers[addr] &= ~val & 0x7F
+        elif addr == self.CommandReg:
+            self.registers[addr] = val & 0x3F
+            self.__command__(val & 0x0F)
+        elif addr == self.BitFramingReg:
+            self.registers[addr] = val
+            if val & 0x80 and self.registers[self.CommandReg] & 0x0F == self.PCD_TRANSCEIVE:
+                self.__transceive__()
+        elif addr == self.Status2Reg:
+            self.registers[addr] = val & 0x08
+            if not val & 0x08:
+                for card in self.cards:
+                    card.deauthenticate()
+        elif addr != self.VersionReg:
+            self.registers[addr] = val
+
+    def __command__(self, command):
+        if command == self.PCD_RESETPHASE:
+            self.soft_reset()
+        elif command == self.PCD_CALCCRC:
+            crc = crc_a(self.fifo)
+            self.fifo = []
+            self.registers[self.CRCResultRegL] = crc[0]
+            self.registers[self.CRCResultRegM] = crc[1]
+            self.registers[self.DivIrqReg] |= 0x04
+            self.registers[self.CommandReg] = self.PCD_IDLE
+        elif command == self.PCD_AUTHENT:
+            data = self.fifo
+            self.fifo = []
+            self.registers[self.CommandReg] = self.PCD_IDLE
+            success = not self.__dropout__() and len(data) == 12 and any(card.authenticate(data[0], data[1], data[2:8], data[8:12]) for card in self.cards)
+            if success:
+                self.registers[self.Status2Reg] |= 0x08
+                self.registers[self.CommIrqReg] |= 0x10
+            else:
+                # The tag never answers, so the reader runs into its timer
+                self.registers[self.Status2Reg] &= ~0x08
+                self.registers[self.CommIrqReg] |= 0x01
+
+    def __transceive__(self):
+        data = self.fifo
+        self.fifo = []
+        bits = self.registers[self.BitFramingReg] & 0x07
+        self.registers[self.ErrorReg] = 0x00
+        self.registers[self.CommIrqReg] |= 0x40
+
+        responses = []
+        if self.__dropout__():
+            self.registers[self.CommIrqReg] |= 0x01
+            return
+        for card in self.cards:
+            response = card.frame(list(data), bits)
+            if response is not None:
+                responses.append(response)
+
+        if len(responses) == 0:
+            self.registers[self.CommIrqReg] |= 0x01
+            return
+        (response, last_bits) = responses[0]
+        response = list(response)
+        self.registers[self.CollReg] = (self.registers[self.CollReg] & 0x80) | 0x20
+        collision = self.__collision__([r[0] for r in responses]) if len(responses) > 1 else None
+        if collision is not None:
+            # The first colliding bit and everything after it reads as 0
+            self.registers[self.ErrorReg] |= 0x08
+            if collision < 32:
+                self.registers[self.CollReg] = (self.registers[self.CollReg] & 0x80) | ((collision + 1) & 0x1F)
+            for bit in range(collision, len(response) * 8):
+                response[bit // 8] &= ~(1 << (bit % 8)) & 0xFF
+        self.fifo = response[0:self.FIFO_SIZE]
+        self.registers[self.ControlReg] = (self.registers[self.ControlReg] & ~0x07) | last_bits
+        self.registers[self.CommIrqReg] |= 0x20
+
+    def __dropout__(self):
+        """
+        Returns:
+            boolean: Whether or not the field fails for the current exchange, in which case every tag was reset.
+        """
+        if not self.dropout or self.random.random() >= self.dropout:
+            return False
+        self.dropouts += 1
+        for card in self.cards:
+            card.reset()
+        return True
+
+    def __collision__(self, responses):
+        """
+        Returns:
+            int: The index of the first bit (counted from bit 0 of the first byte) the responses differ in, or None.
+        """
+        length = max(len(response) for response in responses)
+        for bit in range(0, length * 8):
+            values = set()
+            for response in responses:
+                byte = response[bit // 8] if bit // 8 < len(response) else 0
+                values.add((byte >> (bit % 8)) & 0x01)
+            if len(values) > 1:
+                return bit
+        return None
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+Records every SPI transaction of a reader to a file, replays recordings and attributes
+the time spent to the phases of `MFRC522.ToCard`:
+
+    reader = MFRC522.MFRC522(trace="/tmp/reader.trace")
+    ...
+    python3 spitrace.py analyze /tmp/reader.trace
+    python3 spitrace.py dump /tmp/reader.trace
+
+The file is a fixed size ring buffer that is memory-mapped, so recording costs no system
+call per transaction and a long running reader keeps its most recent history. It starts
+with a header, followed by records of a timestamp and duration (monotonic nanoseconds),
+the kind of record and the bytes sent and received.
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+import time
+from collections import namedtuple, OrderedDict
+
+import errors
+
+MAGIC = b"MFRCTRC1"
+VERSION = 1
+# Magic, version, capacity, head, tail, records in the buffer, records written in total, wall clock start
+HEADER = struct.Struct("<8sHxxIIIIQd")
+HEADER_SIZE = 64
+# Nanoseconds since the start, duration in nanoseconds, kind, bytes sent, bytes received
+RECORD = struct.Struct("<QIBHH")
+
+KIND_TRANSFER = 0
+KIND_IRQ = 1
+KIND_RESET = 2
+# Marks the unused end of the buffer, the next record starts at the beginning
+KIND_WRAP = 0xFF
+
+TraceRecord = namedtuple("TraceRecord", ["timestamp", "duration", "kind", "tx", "rx"])
+
+
+class TraceRecorder:
+    """
+    Transport that passes everything on to another transport and records it, see the module
+    documentation. Created by `MFRC522(trace=path)`, or wrap any transport by hand.
+
+    Args:
+        transport (object): The transport to record.
+        path (string): The trace file. Overwritten if it exists.
+        capacity (int): The size of the ring buffer in bytes. 4 MiB by default, about 150000 register accesses.
+    """
+
+    def __init__(self, transport, path, capacity=4 * 1024 * 1024):
+        self.transport = transport
+        self.path = path
+        self.capacity = capacity
+        self.head = 0
+        self.tail = 0
+        self.records = 0
+        self.total = 0
+        self.__file__ = open(path, "w+b")
+        self.__file__.truncate(HEADER_SIZE + capacity)
+        self.__map__ = mmap.mmap(self.__file__.fileno(), HEADER_SIZE + capacity)
+        self.__started__ = time.monotonic_ns()
+        self.__wall__ = time.time()
+        self.__header__()
+
+    def __getattr__(self, name):
+        # Anything not recorded, e.g. set_speed or the counters of a simulated transport
+        return getattr(self.transport, name)
+
+    def __header__(self):
+        HEADER.pack_into(self.__map__, 0, MAGIC, VERSION, self.capacity, self.head, self.tail, self.records, self.total, self.__wall__)
+
+    def __evict__(self, start, end):
+        """
+        Drop the oldest records until none of them lies within [start, end) of the buffer.
+        """
+        while self.records > 0:
+            if self.tail + RECORD.size > self.capacity or self.__map__[HEADER_SIZE + self.tail + 12] == KIND_WRAP:
+                self.tail = 0
+            if not start <= self.tail < end:
+                break
+            (timestamp, duration, kind, tx, rx) = RECORD.unpack_from(self.__map__, HEADER_SIZE + self.tail)
+            self.tail += RECORD.size + tx + rx
+            self.records -= 1
+        if self.records == 0:
+            self.tail = start
+
+    def record(self, started, kind, tx, rx):
+        """
+        Append a record, overwriting the oldest ones if the buffer is full.
+        """
+        size = RECORD.size + len(tx) + len(rx)
+        if size > self.capacity:
+            return
+        if self.head + size > self.capacity:
+            self.__evict__(self.head, self.capacity)
+            if self.head + RECORD.size <= self.capacity:
+                self.__map__[HEADER_SIZE + self.head + 12] = KIND_WRAP
+            if self.records == 0:
+                self.tail = 0
+            self.head = 0
+        self.__evict__(self.head, self.head + size)
+        offset = HEADER_SIZE + self.head
+        RECORD.pack_into(self.__map__, offset, started - self.__started__, min(time.monotonic_ns() - started, 0xFFFFFFFF), kind, len(tx), len(rx))
+        offset += RECORD.size
+        self.__map__[offset:offset + len(tx)] = tx
+        self.__map__[offset + len(tx):offset + size - RECORD.size] = rx
+        self.head += size
+        self.records += 1
+        self.total += 1
+        self.__header__()
+
+    def transfer(self, data):
+        started = time.monotonic_ns()
+        result = self.transport.transfer(data)
+        self.record(started, KIND_TRANSFER, bytes(bytearray(data)), bytes(bytearray(result)))
+        return result
+
+    def wait_for_irq(self, timeout):
+        started = time.monotonic_ns()
+        result = self.transport.wait_for_irq(timeout)
+        self.record(started, KIND_IRQ, b"", b"\x01" if result else b"\x00")
+        return result
+
+    def set_reset(self, level):
+        started = time.monotonic_ns()
+        self.transport.set_reset(level)
+        self.record(started, KIND_RESET, b"\x01" if level else b"\x00", b"")
+
+    def close(self):
+        if self.__map__ is not None:
+            self.__map__.flush()
+            self.__map__.close()
+            self.__file__.close()
+            self.__map__ = None
+        self.transport.close()
+
+
+def read_trace(path):
+    """
+    Args:
+        path (string): The trace file.
+
+    Returns:
+        (dict, [TraceRecord]): The header (capacity, records, total, started) and the records in the buffer, oldest first.
+
+    Raises:
+        errors.TraceException: If the file is not a trace.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER_SIZE:
+        raise errors.TraceException("{} is not a trace".format(path))
+    (magic, version, capacity, head, tail, count, total, started) = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or len(data) < HEADER_SIZE + capacity:
+        raise errors.TraceException("{} is not a trace".format(path))
+    records = []
+    position = tail
+    for _ in range(0, count):
+        if position + RECORD.size > capacity or data[HEADER_SIZE + position + 12] == KIND_WRAP:
+            position = 0
+        (timestamp, duration, kind, tx, rx) = RECORD.unpack_from(data, HEADER_SIZE + position)
+        offset = HEADER_SIZE + position + RECORD.size
+        records.append(TraceRecord(timestamp, duration, kind, data[offset:offset + tx], data[offset + tx:offset + tx + rx]))
+        position += RECORD.size + tx + rx
+    return ({"capacity": capacity, "records": count, "total": total, "started": started}, records)
+
+
+class ReplayTransport:
+    """
+    Transport that answers with a recording, so a driver can be run through the exact
+    sequence of a trace on a desktop: `MFRC522(transport=ReplayTransport(path))`, followed by
+    the same calls as when it was recorded. Every transaction has to match the recorded one.
+
+    The recording has to start with the creation of the driver and must not have wrapped.
+    Decisions taken on the wall clock (the deadline of `ToCard`) are not reproduced.
+
+    Args:
+        trace (string or [TraceRecord]): The trace file, or records read from it.
+
+    Raises:
+        errors.TraceException: If the trace wrapped.
+    """
+
+    def __init__(self, trace):
+        if isinstance(trace, str):
+            (info, records) = read_trace(trace)
+            if info["total"] != info["records"]:
+                raise errors.TraceException("Trace wrapped, the first {} records are gone".format(info["total"] - info["records"]))
+            trace = records
+        self.records = trace
+        self.position = 0
+
+    def __expect__(self, kind, tx):
+        if self.position >= len(self.records):
+            raise errors.TraceException("Replay went beyond the end of the trace")
+        record = self.records[self.position]
+        if record.kind != kind or record.tx != tx:
+            raise errors.TraceException("Replay diverged from the trace at record {}".format(self.position))
+        self.position += 1
+        return record
+
+    def transfer(self, data):
+        return tuple(bytearray(self.__expect__(KIND_TRANSFER, bytes(bytearray(data))).rx))
+
+    def wait_for_irq(self, timeout):
+        return self.__expect__(KIND_IRQ, b"").rx == b"\x01"
+
+    def set_reset(self, level):
+        self.__expect__(KIND_RESET, b"\x01" if level else b"\x00")
+
+    def set_speed(self, spd):
+        pass
+
+    def close(self):
+        pass
+
+
+PHASES = ("fill", "wait", "drain", "crc", "other")
+
+
+def analyze(records):
+    """
+    Attribute the time of a trace to the phases of the exchanges with the chip: filling the
+    FIFO (including the setup of the command), waiting for the tag, draining the answer,
+    calculating CRCs on the chip, and everything else. A record is charged its own duration
+    and the time since the record before, i.e. the work of the host that led up to it.
+
+    Args:
+        records ([TraceRecord]): The records, see `read_trace`.
+
+    Returns:
+        dict: Per phase the transactions and seconds, the number of exchanges per command and totals.
+    """
+    from MFRC522 import MFRC522
+    reader = MFRC522
+    setup = (reader.CommIEnReg, reader.CommIrqReg, reader.DivIrqReg, reader.DivlEnReg, reader.FIFOLevelReg,
+             reader.FIFODataReg, reader.TReloadRegH)
+    commands = {reader.PCD_TRANSCEIVE: "TRANSCEIVE", reader.PCD_AUTHENT: "AUTHENT", reader.PCD_CALCCRC: "CALCCRC"}
+    phases = OrderedDict((phase, {"transactions": 0, "seconds": 0.0}) for phase in PHASES)
+    exchanges = dict((name, 0) for name in commands.values())
+    # Setup of an exchange is only known to be one once its command is started
+    pending = []
+    state = "other"
+
+    def charge(phase, cost):
+        phases[phase]["transactions"] += 1
+        phases[phase]["seconds"] += cost / 1e9
+
+    previous = None
+    for record in records:
+        cost = record.duration + (record.timestamp - previous if previous is not None else 0)
+        previous = record.timestamp + record.duration
+        if record.kind == KIND_IRQ:
+            charge(state if state in ("wait", "crc") else "other", cost)
+            continue
+        if record.kind != KIND_TRANSFER or not record.tx:
+            charge("other", cost)
+            continue
+        write = not record.tx[0] & 0x80
+        addr = (record.tx[0] >> 1) & 0x3F
+        if write and addr == reader.CommandReg and record.tx[1] in commands:
+            phase = "crc" if record.tx[1] == reader.PCD_CALCCRC else "fill"
+            for pending_cost in pending:
+                charge(phase, pending_cost)
+            pending = []
+            charge(phase, cost)
+            exchanges[commands[record.tx[1]]] += 1
+            state = "crc" if phase == "crc" else "wait"
+            continue
+        if state == "wait" and (not write and addr == reader.CommIrqReg or write and addr == reader.BitFramingReg):
+            charge("wait", cost)
+            continue
+        if state == "wait" and not write and addr == reader.ErrorReg:
+            state = "drain"
+        if state == "drain" and not write and addr in (reader.ErrorReg, reader.FIFOLevelReg, reader.ControlReg, reader.FIFODataReg):
+            charge("drain", cost)
+            continue
+        if state == "crc" and (not write and addr in (reader.DivIrqReg, reader.CRCResultRegL, reader.CRCResultRegM) or
+                               write and addr == reader.DivlEnReg):
+            charge("crc", cost)
+            continue
+        state = "other"
+        if write and (addr in setup or addr == reader.CommandReg and record.tx[1] == reader.PCD_IDLE):
+            pending.append(cost)
+        else:
+            for pending_cost in pending:
+                charge("other", pending_cost)
+            pending = []
+            charge("other", cost)
+    for pending_cost in pending:
+        charge("other", pending_cost)
+
+    seconds = sum(phase["seconds"] for phase in phases.values())
+    return {
+        "phases": phases,
+        "exchanges": exchanges,
+        "transactions": sum(1 for record in records if record.kind == KIND_TRANSFER),
+        "seconds": seconds,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Look into SPI traces recorded with MFRC522(trace=path).")
+    parser.add_argument("command", choices=("analyze", "dump"), help="Attribute the time to phases, or print every record.")
+    parser.add_argument("path", help="The trace file.")
+    args = parser.parse_args(argv)
+
+    (info, records) = read_trace(args.path)
+    if args.command == "dump":
+        kinds = {KIND_TRANSFER: "SPI", KIND_IRQ: "IRQ", KIND_RESET: "RST"}
+        for record in records:
+            print("{:>14.6f} {:>9.1f}us {} {} -> {}".format(record.timestamp / 1e9, record.duration / 1e3, kinds.get(record.kind, "?"),
+                                                          record.tx.hex().upper(), record.rx.hex().upper()))
+        return 0
+    result = analyze(records)
+    print("{} records in the buffer, {} recorded in total".format(info["records"], info["total"]))
+    print("{:<8} {:>14} {:>12} {:>8}".format("phase", "transactions", "ms", "share"))
+    for (phase, stats) in result["phases"].items():
+        share = stats["seconds"] / result["seconds"] if result["seconds"] > 0 else 0.0
+        print("{:<8} {:>14} {:>12.3f} {:>7.1f}%".format(phase, stats["transactions"], stats["seconds"] * 1e3, share * 100))
+    print("exchanges: " + ", ".join("{} {}".format(name, n) for (name, n) in sorted(result["exchanges"].items())))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import os
+import sys
+
+# The modules live flat in the root of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+Shared by the tests: a simulated reader with tags in its field.
+"""
+
+from MFRC522 import MFRC522
+from simulator import SimulatedTransport, VirtualClassic1K
+
+KEY = [0xFF] * 6
+UID = [0x01, 0x02, 0x03, 0x04]
+# Access bytes of a trailer: blocks 0 to 2 read only (C1 C2 C3 = 0 1 0), transport configuration for the trailer
+READ_ONLY = [0x8F, 0x07, 0x87, 0x69]
+
+
+def select(reader):
+    """
+    Returns:
+        ([uint8], uint8): The uid and SAK of the tag in the field.
+    """
+    (status, TagType) = reader.Request(reader.PICC_REQIDL)
+    assert status == reader.MI_OK
+    (status, uid, sak) = reader.SelectCascade()
+    assert status == reader.MI_OK
+    return (list(uid), sak)
+
+
+def simulated(cards=None, **kwargs):
+    """
+    Args:
+        cards ([VirtualClassic1K]): The tags in the field. A 1K tag with uid UID by default.
+        **kwargs: Passed on to `MFRC522`.
+
+    Returns:
+        (MFRC522, SimulatedTransport): The reader and its bus.
+    """
+    bus = SimulatedTransport(cards if cards is not None else [VirtualClassic1K(uid=UID)])
+    return (MFRC522(transport=bus, **kwargs), bus)
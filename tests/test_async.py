@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import asyncio
+import threading
+
+from AsyncMFRC522 import AsyncMFRC522
+
+from helpers import KEY, UID, simulated
+
+
+def test_async_reads_on_one_thread():
+    (reader, bus) = simulated()
+    for block in (4, 5, 6):
+        bus.cards[0].blocks[block] = [block] * 16
+    threads = set()
+    front = AsyncMFRC522(reader)
+
+    async def session():
+        threads.add(await front.run(threading.get_ident))
+        (status, TagType) = await front.request()
+        (status, uid, sak) = await front.select_cascade()
+        assert await front.auth(reader.PICC_AUTHENT1A, 4, KEY, list(uid)) == reader.MI_OK
+        # Concurrent calls are serialized
+        blocks = await asyncio.gather(*[front.read(block) for block in (4, 5, 6)])
+        threads.add(await front.run(threading.get_ident))
+        return (list(uid), [bytes(block) for block in blocks])
+
+    try:
+        (uid, blocks) = asyncio.run(session())
+    finally:
+        front.close()
+    assert uid == UID
+    assert blocks == [bytes([block] * 16) for block in (4, 5, 6)]
+    assert len(threads) == 1 and threading.get_ident() not in threads
+
+
+def test_async_cards():
+    (reader, bus) = simulated()
+    front = AsyncMFRC522(reader)
+
+    async def first_event():
+        async for event in front.cards(min_interval=0, present_interval=0):
+            return event
+
+    try:
+        assert asyncio.run(first_event()) == (AsyncMFRC522.CARD_ARRIVED, bytes(UID))
+    finally:
+        front.close()
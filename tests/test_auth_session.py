@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+from helpers import KEY, select, simulated
+
+
+def test_repeated_auth_is_skipped():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid) == reader.MI_OK
+    bus.reset_counters()
+    # Same sector, key and mode: only the MFCrypto1On bit is checked
+    assert reader.Auth(reader.PICC_AUTHENT1A, 6, KEY, uid) == reader.MI_OK
+    assert bus.bus_stats()["transactions"] == 1
+    assert bus.register_writes[reader.CommandReg] == 0
+
+
+def test_other_key_authenticates_again():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    bus.reset_counters()
+    assert reader.Auth(reader.PICC_AUTHENT1B, 4, KEY, uid) == reader.MI_OK
+    assert bus.register_writes[reader.CommandReg] > 0
+
+
+def test_lazy_reauth_on_sector_change():
+    (reader, bus) = simulated()
+    bus.cards[0].blocks[8] = [0x08] * 16
+    (uid, sak) = select(reader)
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid) == reader.MI_OK
+    assert bytes(reader.Read(8)) == bytes([0x08] * 16)
+    assert reader.auth_session[1] == 2
+
+
+def test_failed_auth_forgets_credentials():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid) == reader.MI_OK
+    # The first wake up only sends the ACTIVE tag back to IDLE
+    reader.Reselect(uid)
+    assert reader.Reselect(uid) == reader.MI_OK
+    assert reader.Auth(reader.PICC_AUTHENT1A, 16, [0x00] * 6, uid) != reader.MI_OK
+    assert reader.auth_session is None
+    assert reader.auth_credentials is None
+    select(reader)
+    assert reader.Read(17) is None
+
+
+def test_stop_crypto1_ends_session():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    reader.StopCrypto1()
+    assert reader.auth_session is None
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import json
+
+import benchmark
+
+# The SPI transactions of the operations, any increase is a regression
+TRANSACTIONS = {
+    "select": 41,
+    "auth": 12,
+    "read": 13,
+    "write": 26,
+    "write_text_16": 27,
+    "dump_data": 735,
+}
+
+
+def test_transaction_budget():
+    results = benchmark.run(list(TRANSACTIONS), scale=0.01)
+    assert dict((name, result["transactions_per_op"]) for (name, result) in results.items()) == TRANSACTIONS
+
+
+def test_irq_mode_runs():
+    results = benchmark.run(["read"], scale=0.01, use_irq=True)
+    assert results["read"]["transactions_per_op"] > 0
+
+
+def test_compare_reports_regressions():
+    before = {"read": {"transactions_per_op": 10.0, "seconds_per_op": 0.001}}
+    after = {"read": {"transactions_per_op": 11.0, "seconds_per_op": 0.001}, "new": {"transactions_per_op": 1.0, "seconds_per_op": 1.0}}
+    assert len(benchmark.compare(after, before)) == 1
+    assert benchmark.compare(after, before, max_transactions_increase=0.1) == []
+    slower = {"read": {"transactions_per_op": 10.0, "seconds_per_op": 0.002}}
+    assert len(benchmark.compare(slower, before)) == 1
+
+
+def test_main_fails_over_budget(tmp_path, capsys):
+    path = str(tmp_path / "baseline.json")
+    assert benchmark.main(["read", "--scale", "0.01", "--output", path]) == 0
+    with open(path) as f:
+        baseline = json.load(f)
+    baseline["read"]["transactions_per_op"] -= 1
+    baseline["read"]["seconds_per_op"] = 1.0
+    with open(path, "w") as f:
+        json.dump(baseline, f)
+    assert benchmark.main(["read", "--scale", "0.01", "--baseline", path]) == 1
+    assert "BUDGET EXCEEDED read" in capsys.readouterr().out
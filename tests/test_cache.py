@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import cache
+from cache import ImageCache
+from image import ClassicImage
+from layout import CLASSIC_4K
+
+from helpers import KEY, select, simulated
+
+
+def test_hit_skips_the_tag():
+    (reader, bus) = simulated(cache=ImageCache())
+    (uid, sak) = select(reader)
+    first = reader.ReadImage(KEY, uid, sectors=[1])
+    bus.reset_counters()
+    second = reader.ReadImage(KEY, uid, sectors=[1])
+    assert bus.bus_stats()["transactions"] == 0
+    assert bytes(second.buffer) == bytes(first.buffer)
+    assert reader.cache.stats()["hits"] == 1
+    # More sectors than cached go to the tag
+    reader.ReadImage(KEY, uid, sectors=[1, 2])
+    assert bus.bus_stats()["transactions"] > 0
+
+
+def test_write_invalidates():
+    (reader, bus) = simulated(cache=ImageCache())
+    (uid, sak) = select(reader)
+    reader.ReadImage(KEY, uid, sectors=[1])
+    reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    assert reader.Write(4, [0x44] * 16) == reader.MI_OK
+    assert reader.cache.stats() == {"entries": 0, "hits": 0, "misses": 1, "invalidations": 1}
+    assert bytes(reader.ReadImage(KEY, uid, sectors=[1]).block(4)) == bytes([0x44] * 16)
+
+
+def test_validate_block_catches_other_writers():
+    (reader, bus) = simulated(cache=ImageCache(validate_block=4))
+    (uid, sak) = select(reader)
+    reader.ReadImage(KEY, uid, sectors=[1])
+    assert reader.ReadImage(KEY, uid, sectors=[1]) is not None
+    assert reader.cache.stats()["hits"] == 1
+    bus.cards[0].blocks[4] = [0x01] * 16
+    assert bytes(reader.ReadImage(KEY, uid, sectors=[1]).block(4)) == bytes([0x01] * 16)
+    assert reader.cache.stats()["invalidations"] == 1
+
+
+def test_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    images = ImageCache(ttl=10)
+    image = ClassicImage()
+    image.read_blocks.add(4)
+    images.store((1, 2, 3, 4), image)
+    now[0] += 5
+    assert images.get((1, 2, 3, 4), [4]) is not None
+    now[0] += 6
+    assert images.get((1, 2, 3, 4), [4]) is None
+
+
+def test_least_recently_used_are_dropped():
+    images = ImageCache(max_entries=2)
+    for uid in [(1,), (2,), (3,)]:
+        images.store(uid, ClassicImage())
+    assert list(images.entries) == [(2,), (3,)]
+
+
+def test_other_layout_replaces_entry():
+    images = ImageCache()
+    small = ClassicImage()
+    small.read_blocks.add(4)
+    images.store((1,), small)
+    large = ClassicImage(layout=CLASSIC_4K)
+    large.read_blocks.add(200)
+    images.store((1,), large)
+    assert images.get((1,), [4]) is None
+    assert images.get((1,), [200]).layout is CLASSIC_4K
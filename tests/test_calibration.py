@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import pytest
+
+import calibration
+import errors
+from MFRC522 import MFRC522
+from simulator import SimulatedTransport
+
+from helpers import KEY, select, simulated
+
+
+@pytest.mark.parametrize("max_speed, margin, expected", [
+    (8000000, 1, 5000000),
+    (8000000, 0, 8000000),
+    (10000000, 1, 8000000),
+    (10000000, 0, 10000000),
+    (1000000, 1, 1000000),
+])
+def test_calibrate(max_speed, margin, expected):
+    bus = SimulatedTransport(max_speed=max_speed)
+    reader = MFRC522(transport=bus)
+    assert calibration.calibrate(reader, margin=margin) == expected
+    assert bus.spd == expected
+
+
+def test_verify_link():
+    bus = SimulatedTransport(max_speed=4000000)
+    reader = MFRC522(transport=bus)
+    assert calibration.verify_link(reader)
+    bus.set_speed(8000000)
+    assert not calibration.verify_link(reader)
+
+
+def test_broken_link_raises():
+    bus = SimulatedTransport(spd=1000000, max_speed=500000)
+    reader = MFRC522(transport=bus)
+    with pytest.raises(errors.LinkException):
+        calibration.calibrate(reader)
+
+
+def test_driver_keeps_working_after_calibration():
+    (reader, bus) = simulated()
+    bus.max_speed = 5000000
+    assert reader.Calibrate(persist=False) == 4000000
+    (uid, sak) = select(reader)
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid) == reader.MI_OK
+    assert reader.Read(4) is not None
+
+
+def test_speeds_are_kept_per_socket(tmp_path):
+    path = str(tmp_path / "speeds.json")
+    assert calibration.load_speed("/dev/spidev0.0", path=path) is None
+    calibration.save_speed("/dev/spidev0.0", 8000000, path=path)
+    calibration.save_speed("/dev/spidev1.0", 4000000, cs_pin=16, path=path)
+    assert calibration.load_speed("/dev/spidev0.0", path=path) == 8000000
+    assert calibration.load_speed("/dev/spidev1.0", cs_pin=16, path=path) == 4000000
+    assert calibration.load_speed("/dev/spidev1.0", path=path) is None
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import pytest
+
+from crc import crc_a, crc_a_command
+
+from helpers import KEY, select, simulated
+
+
+@pytest.mark.parametrize("data, expected", [
+    ([0x00, 0x00], [0xA0, 0x1E]),
+    ([0x12, 0x34], [0x26, 0xCF]),
+    ([0x50, 0x00], [0x57, 0xCD]),
+    ([0x30, 0x00], [0x02, 0xA8]),
+])
+def test_crc_a(data, expected):
+    assert crc_a(data) == expected
+    assert crc_a_command(data[0], data[1]) == expected
+
+
+@pytest.mark.parametrize("data", [[0x30, 4], list(range(0, 16)), [0xA0, 63] + [0xFF] * 16])
+def test_host_crc_matches_chip(data):
+    (reader, bus) = simulated(crc_check=True)
+    assert reader.CRC(data) == reader.CalulateCRC(data)
+
+
+def test_exchanges_skip_calc_crc():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    bus.reset_counters()
+    assert reader.Read(4) is not None
+    assert reader.Write(5, [0x11] * 16) == reader.MI_OK
+    assert bus.register_reads[reader.CRCResultRegL] == 0
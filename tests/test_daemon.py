@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import errors
+from MFRC522Client import MFRC522Client
+from MFRC522Daemon import MFRC522Daemon
+from MFRC522Worker import MFRC522Worker
+from metrics import Metrics
+from simulator import VirtualClassic1K
+
+from helpers import UID, simulated
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRESENCE = dict(min_interval=0.001, max_interval=0.01, present_interval=0.001)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    card = VirtualClassic1K(uid=UID)
+    card.blocks[4] = [0x04] * 16
+    (reader, bus) = simulated([card], metrics=Metrics())
+    worker = MFRC522Worker(reader, polling=True, presence=PRESENCE)
+    server = MFRC522Daemon(str(tmp_path / "mfrc522.sock"), worker, mode=0o600)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+    worker.close()
+
+
+def test_requests(daemon):
+    client = MFRC522Client(daemon.path)
+    try:
+        # The tag left selected by a background poll only answers the second wake up, see `MFRC522.Poll`
+        uid = client.request("poll") or client.request("poll")
+        assert uid.upper() == bytes(UID).hex().upper()
+        assert client.request("current").upper() == uid.upper()
+        blocks = client.request("read", sectors=[1])["blocks"]
+        assert sorted(blocks) == ["4", "5", "6", "7"]
+        assert blocks["4"].upper() == "04" * 16
+        assert client.request("write", blocks={"5": "55" * 16}, verify=True) == [5]
+        assert client.request("read", sectors=[1])["blocks"]["5"].upper() == "55" * 16
+        assert client.request("stats")["transactions"] > 0
+        with pytest.raises(errors.DaemonException):
+            client.request("format")
+        with pytest.raises(errors.DaemonException):
+            client.request("write", blocks={"5": "55"})
+    finally:
+        client.close()
+
+
+def test_events(daemon):
+    client = MFRC522Client(daemon.path)
+    # The tag leaves the field once the subscription surely is in place
+    leave = threading.Timer(0.2, lambda: setattr(daemon.worker.reader.transport, "cards", []))
+    leave.start()
+    try:
+        events = client.events()
+        (event, uid) = next(events)
+        # The tag might have arrived before the subscription
+        if event == MFRC522Worker.CARD_ARRIVED:
+            (event, uid) = next(events)
+        assert event == MFRC522Worker.CARD_DEPARTED
+        assert uid.upper() == bytes(UID).hex().upper()
+    finally:
+        leave.join()
+        client.close()
+
+
+def test_socket_is_private(daemon):
+    assert os.stat(daemon.path).st_mode & 0o777 == 0o600
+
+
+def test_live_socket_is_not_taken_over(daemon):
+    with pytest.raises(errors.DaemonException):
+        MFRC522Daemon(daemon.path, daemon.worker)
+    client = MFRC522Client(daemon.path)
+    client.close()
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    path = str(tmp_path / "stale.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    (reader, bus) = simulated()
+    worker = MFRC522Worker(reader)
+    try:
+        server = MFRC522Daemon(path, worker)
+        server.server_close()
+        assert not os.path.exists(path)
+    finally:
+        worker.close()
+
+
+def test_client_script(daemon, capsys):
+    import MFRC522Client
+    assert MFRC522Client.main(["--socket", daemon.path, "read", "--sector", "1"]) == 0
+    assert '"4"' in capsys.readouterr().out
+    assert MFRC522Client.main(["--socket", daemon.path, "--uid", "0A0B0C0D", "read", "--sector", "1"]) == 1
+    assert MFRC522Client.main(["--socket", daemon.path, "write", "--block", "5", "00"]) == 2
+
+
+def test_client_does_not_load_the_driver():
+    code = "import sys, MFRC522Client; sys.exit('MFRC522' in sys.modules)"
+    assert subprocess.call([sys.executable, "-c", code], cwd=ROOT) == 0
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+from helpers import KEY, select, simulated
+
+
+def test_fifo_burst_is_one_transaction():
+    (reader, bus) = simulated()
+    reader.Write_MFRC522(reader.FIFOLevelReg, 0x80)
+    data = bytes(range(0, 48))
+    bus.reset_counters()
+    reader.Write_MFRC522_Burst(reader.FIFODataReg, data)
+    assert bus.bus_stats()["transactions"] == 1
+    assert reader.Read_MFRC522(reader.FIFOLevelReg) == len(data)
+    bus.reset_counters()
+    assert bytes(reader.Read_MFRC522_Burst(reader.FIFODataReg, len(data))) == data
+    assert bus.bus_stats()["transactions"] == 1
+
+
+def test_read_block_drains_fifo_in_one_burst():
+    (reader, bus) = simulated()
+    bus.cards[0].blocks[4] = list(range(0, 16))
+    (uid, sak) = select(reader)
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid) == reader.MI_OK
+    bus.reset_counters()
+    assert bytes(reader.Read(4)) == bytes(range(0, 16))
+    assert bus.register_reads[reader.FIFODataReg] == 16
+    assert bus.bus_stats()["transactions"] < 20
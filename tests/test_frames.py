@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+from helpers import KEY, select, simulated
+
+
+def setup():
+    (reader, bus) = simulated()
+    for block in (4, 5):
+        bus.cards[0].blocks[block] = [block] * 16
+    (uid, sak) = select(reader)
+    reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    return reader
+
+
+def exchange(reader, block):
+    frame = [reader.PICC_READ, block]
+    return reader.ToCard(reader.PCD_TRANSCEIVE, frame + reader.CRC(frame))
+
+
+def test_exchanges_reuse_the_receive_buffer():
+    reader = setup()
+    (status, first, bits) = exchange(reader, 4)
+    assert isinstance(first, memoryview)
+    assert bytes(first) == bytes([4] * 16)
+    (status, second, bits) = exchange(reader, 5)
+    assert second.obj is first.obj
+    # The first answer is overwritten by the next exchange
+    assert bytes(first) == bytes([5] * 16)
+
+
+def test_read_returns_a_copy():
+    reader = setup()
+    data = reader.Read(4)
+    assert isinstance(data, bytes)
+    reader.Read(5)
+    assert data == bytes([4] * 16)
+
+
+def test_write_accepts_any_bytes_like():
+    reader = setup()
+    for data in ([1] * 16, bytes([2] * 16), bytearray([3] * 16), memoryview(bytes([4] * 16))):
+        assert reader.Write(5, data) == reader.MI_OK
+        assert reader.Read(5) == bytes(data)
+
+
+
+def test_burst_reads_into_a_buffer():
+    (reader, bus) = simulated()
+    reader.Write_MFRC522(reader.FIFOLevelReg, 0x80)
+    reader.Write_MFRC522_Burst(reader.FIFODataReg, bytes(range(0, 8)))
+    into = bytearray(16)
+    assert reader.Read_MFRC522_Burst(reader.FIFODataReg, 8, into) is into
+    assert bytes(into) == bytes(range(0, 8)) + bytes(8)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import pytest
+
+from MFRC522 import MFRC522
+from simulator import SimulatedTransport, VirtualClassic1K
+
+from helpers import KEY, select, simulated
+
+UIDS = [[1, 2, 3, 4], [1, 2, 3, 5], [0x81, 2, 3, 4, 5, 6, 7], list(range(1, 11))]
+
+
+@pytest.mark.parametrize("uid", [
+    [0x01, 0x02, 0x03, 0x04],
+    [0x81, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07],
+    list(range(1, 11)),
+])
+def test_cascade_select(uid):
+    reader = MFRC522(transport=SimulatedTransport([VirtualClassic1K(uid=uid)]))
+    (selected, sak) = select(reader)
+    assert selected == uid
+    assert sak == VirtualClassic1K.SAK
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, selected) == reader.MI_OK
+    assert reader.Read(4) is not None
+
+
+def test_inventory_resolves_mixed_uid_sizes():
+    bus = SimulatedTransport([VirtualClassic1K(uid=uid) for uid in UIDS])
+    tags = MFRC522(transport=bus).Inventory()
+    assert sorted(list(uid) for (uid, sak) in tags) == sorted(UIDS)
+    assert all(card.state == VirtualClassic1K.STATE_HALT for card in bus.cards)
+
+
+def test_inventory_skips_halted_tags():
+    (reader, bus) = simulated([VirtualClassic1K(uid=uid) for uid in UIDS])
+    assert len(reader.Inventory(maxTags=2)) == 2
+    assert len(reader.Inventory(reqMode=reader.PICC_REQIDL)) == 2
+    assert len(reader.Inventory()) == 4
+
+
+@pytest.mark.parametrize("uid", UIDS[2:])
+def test_reselect_long_uid(uid):
+    (reader, bus) = simulated([VirtualClassic1K(uid=uid)])
+    select(reader)
+    reader.Halt()
+    assert reader.Reselect(uid) == reader.MI_OK
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid) == reader.MI_OK
+
+
+def test_single_size_helpers_refuse_other_uids():
+    (reader, bus) = simulated()
+    assert reader.SelectTag([]) == 0
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, [1, 2, 3]) == reader.MI_ERR
+    assert reader.Reselect([1, 2, 3, 4, 5, 6]) == reader.MI_ERR
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+from MFRC522 import MFRC522
+from simulator import SimulatedTransport, VirtualClassic1K
+
+from helpers import KEY, UID, select, simulated
+
+
+def test_irq_mode_reads_and_writes():
+    (reader, bus) = simulated(use_irq=True)
+    (uid, sak) = select(reader)
+    assert uid == UID
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid) == reader.MI_OK
+    assert reader.Write(4, [0x5A] * 16) == reader.MI_OK
+    assert bytes(reader.Read(4)) == bytes([0x5A] * 16)
+    assert bus.irq_waits > 0
+
+
+def test_irq_mode_reads_interrupt_register_once_per_exchange():
+    (reader, bus) = simulated(use_irq=True)
+    select(reader)
+    bus.reset_counters()
+    reader.Request(reader.PICC_REQIDL)
+    assert bus.irq_waits == 1
+    assert bus.register_reads[reader.CommIrqReg] == 1
+
+
+def test_lost_interrupt_times_out():
+    waits = []
+
+    def lost(asserted, timeout):
+        waits.append(timeout)
+        return False
+
+    bus = SimulatedTransport([VirtualClassic1K(uid=UID)], irq_source=lost)
+    reader = MFRC522(transport=bus, use_irq=True, irq_timeout=25)
+    (status, TagType) = reader.Request(reader.PICC_REQIDL)
+    assert status != reader.MI_OK
+    assert waits == [25]
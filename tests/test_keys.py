@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import gc
+import weakref
+
+import pytest
+
+import keys
+from keys import KeyRing
+from simulator import VirtualClassic1K
+
+from helpers import KEY, select, simulated
+
+WRONG = [0xA0, 0xA1, 0xA2, 0xA3, 0xA4, 0xA5]
+
+
+def test_key_ring_learns_order():
+    ring = KeyRing([WRONG, KEY])
+    uid = [1, 2, 3, 4]
+    assert [key for (key_type, key) in ring.candidates(uid, 1)] == [WRONG, KEY]
+
+    (reader, bus) = simulated([VirtualClassic1K(uid=uid)])
+    select(reader)
+    image = reader.ReadImage(ring, uid, sectors=[1, 2])
+    assert len(image.read_blocks) == 8
+    # The key that worked comes first, for this tag and for the sectors of other tags
+    assert ring.candidates(uid, 1)[0] == (KeyRing.KEY_A, KEY)
+    assert ring.candidates([5, 6, 7, 8], 2)[0] == (KeyRing.KEY_A, KEY)
+    assert ring.dirty
+
+
+def test_key_ring_scopes():
+    ring = KeyRing()
+    ring.add(KEY)
+    ring.add(WRONG, sectors=[3], key_types=[KeyRing.KEY_B])
+    ring.add([0x11] * 6, uid=[1, 2, 3, 4, 0x04])
+    ring.add_diversified(lambda uid, sector: [uid[0], sector, 0, 0, 0, 0], sectors=[5])
+    assert ring.candidates([1, 2, 3, 4], 3) == [(KeyRing.KEY_A, [0x11] * 6), (KeyRing.KEY_A, KEY), (KeyRing.KEY_B, WRONG)]
+    assert ring.candidates([9, 9, 9, 9], 5) == [(KeyRing.KEY_A, KEY), (KeyRing.KEY_A, [9, 5, 0, 0, 0, 0])]
+    with pytest.raises(ValueError):
+        ring.add([0x00] * 5)
+
+
+def test_key_ring_key_b():
+    card = VirtualClassic1K(uid=[1, 2, 3, 4], key_a=WRONG)
+    (reader, bus) = simulated([card])
+    (uid, sak) = select(reader)
+    ring = KeyRing()
+    ring.add(KEY, key_types=[KeyRing.KEY_A, KeyRing.KEY_B])
+    assert reader.AuthWith(ring, 4, uid) == reader.MI_OK
+    assert ring.candidates(uid, 1)[0] == (KeyRing.KEY_B, KEY)
+
+
+def test_key_ring_capacity():
+    ring = KeyRing(capacity=2)
+    for sector in range(0, 3):
+        ring.learn([1, 2, 3, 4], sector, KeyRing.KEY_A, KEY)
+    assert list(ring.learned) == [((1, 2, 3, 4), 1), ((1, 2, 3, 4), 2)]
+    ring.forget([1, 2, 3, 4], 2)
+    assert list(ring.learned) == [((1, 2, 3, 4), 1)]
+
+
+def test_key_ring_file(tmp_path):
+    path = str(tmp_path / "keys.json")
+    ring = KeyRing(path=path)
+    ring.learn([1, 2, 3, 4], 1, KeyRing.KEY_B, KEY)
+    assert not (tmp_path / "keys.json").exists()
+    ring.close()
+    assert (tmp_path / "keys.json").stat().st_mode & 0o777 == 0o600
+    assert KeyRing(path=path).candidates([1, 2, 3, 4], 1)[0] == (KeyRing.KEY_B, KEY)
+
+
+def test_key_ring_flushes_after_interval(tmp_path):
+    path = str(tmp_path / "keys.json")
+    with KeyRing(path=path, flush_interval=0) as ring:
+        ring.learn([1, 2, 3, 4], 1, KeyRing.KEY_A, KEY)
+        assert not ring.dirty
+        assert (tmp_path / "keys.json").exists()
+
+
+def test_key_ring_is_not_kept_alive(tmp_path):
+    ring = KeyRing(path=str(tmp_path / "keys.json"))
+    assert ring in keys.__rings__
+    ref = weakref.ref(ring)
+    del ring
+    gc.collect()
+    assert ref() is None
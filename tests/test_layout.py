@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import pytest
+
+import errors
+from image import ClassicImage
+from layout import CLASSIC_1K, CLASSIC_2K, CLASSIC_4K, MINI, layout_for_sak
+from MFRC522 import MFRC522
+from simulator import SimulatedTransport, VirtualClassic1K, VirtualClassic4K, VirtualClassicMini
+
+from helpers import KEY, select
+
+
+@pytest.mark.parametrize("layout, sectors, blocks, data_blocks", [
+    (MINI, 5, 20, 12),
+    (CLASSIC_1K, 16, 64, 45),
+    (CLASSIC_2K, 32, 128, 93),
+    (CLASSIC_4K, 40, 256, 213),
+])
+def test_layout_maps(layout, sectors, blocks, data_blocks):
+    assert (layout.sectors, layout.blocks, len(layout.data_blocks)) == (sectors, blocks, data_blocks)
+    for block in range(0, layout.blocks):
+        sector = layout.sector_of[block]
+        assert block in layout.blocks_of(sector)
+        assert layout.is_trailer(block) == (block == layout.trailers[sector])
+        assert layout.offsets[block] == block * 16
+    assert all(layout.first_blocks[sector] + layout.sector_sizes[sector] - 1 == layout.trailers[sector] for sector in range(0, sectors))
+    assert layout.data_blocks[0] == 4
+
+
+def test_layout_4k_sectors():
+    assert CLASSIC_4K.sector_of[127] == 31
+    assert CLASSIC_4K.sector_of[128] == 32
+    assert CLASSIC_4K.trailers[32] == 143
+    assert CLASSIC_4K.first_blocks[39] == 240
+    assert CLASSIC_4K.trailers[39] == 255
+
+
+@pytest.mark.parametrize("sak, layout", [(0x09, MINI), (0x08, CLASSIC_1K), (0x19, CLASSIC_2K), (0x18, CLASSIC_4K), (0x20, CLASSIC_1K)])
+def test_layout_for_sak(sak, layout):
+    assert layout_for_sak(sak) is layout
+
+
+@pytest.mark.parametrize("card, layout", [(VirtualClassicMini(), MINI), (VirtualClassic1K(), CLASSIC_1K), (VirtualClassic4K(), CLASSIC_4K)])
+def test_text_fills_every_data_block(card, layout):
+    reader = MFRC522(transport=SimulatedTransport([card]))
+    (uid, sak) = select(reader)
+    assert reader.layout is layout
+    text = "x" * (len(layout.data_blocks) * 16)
+    assert reader.WriteText(KEY, uid, text) == list(layout.data_blocks)
+    with pytest.raises(errors.TextTooLongException):
+        reader.WriteText(KEY, uid, text + "y")
+    assert reader.DumpClassic1K_Text(KEY, uid, print_text=False) == text
+
+
+def test_data_dump_skips_trailers():
+    bus = SimulatedTransport([VirtualClassic1K()])
+    reader = MFRC522(transport=bus)
+    (uid, sak) = select(reader)
+    reader.DumpClassic1K_Data(KEY, uid)
+    reads = [result.block for result in reader.results if result.operation == "read"]
+    assert reads == list(CLASSIC_1K.data_blocks)
+
+
+def test_text_skips_trailers():
+    image = ClassicImage(layout=CLASSIC_4K)
+    assert image.text_offset(3) is None
+    assert image.text_offset(4) == 0
+    assert image.text_offset(8) == 3 * 16
+    assert image.text_offset(128) == CLASSIC_4K.data_index[128] * 16
+
+
+def test_4k_sector_of_16_blocks():
+    card = VirtualClassic4K()
+    card.blocks[250] = [0x25] * 16
+    reader = MFRC522(transport=SimulatedTransport([card]))
+    (uid, sak) = select(reader)
+    image = reader.ReadImage(KEY, uid, sectors=[39])
+    assert image.read_blocks == set(range(240, 256))
+    assert bytes(image.block(250)) == bytes([0x25] * 16)
+
+
+def test_blocks_outside_of_the_layout_raise():
+    reader = MFRC522(transport=SimulatedTransport([VirtualClassic1K()]))
+    (uid, sak) = select(reader)
+    with pytest.raises(errors.InvalidValueException):
+        reader.Auth(reader.PICC_AUTHENT1A, 64, KEY, uid)
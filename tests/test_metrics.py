@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+from urllib.request import urlopen
+
+from metrics import Histogram, Metrics
+
+from helpers import KEY, select, simulated
+
+
+def session(metrics):
+    (reader, bus) = simulated(metrics=metrics)
+    (uid, sak) = select(reader)
+    reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    reader.Read(4)
+    reader.Auth(reader.PICC_AUTHENT1A, 4, [0x00] * 6, uid)
+    return bus
+
+
+def test_metrics_count_like_the_bus():
+    metrics = Metrics()
+    bus = session(metrics)
+    snapshot = metrics.snapshot()
+    assert snapshot["transactions"] == bus.bus_stats()["transactions"]
+    assert snapshot["register_reads"]["CommIrqReg"] == bus.register_reads[0x04]
+    assert snapshot["poll_iterations"]["ToCard"] > 0
+    for command in ("REQA", "AUTH", "READ"):
+        assert snapshot["commands"][command]["count"] >= 1
+    assert snapshot["commands"]["AUTH"]["count"] == 2
+
+
+def test_histogram_is_cumulative():
+    histogram = Histogram([0.001, 0.01, float("inf")])
+    for value in (0.0005, 0.005, 0.005, 1.0):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == [(0.001, 1), (0.01, 3), (float("inf"), 4)]
+    assert snapshot["count"] == 4
+
+
+def test_prometheus_exposition():
+    metrics = Metrics()
+    session(metrics)
+    text = metrics.prometheus()
+    assert 'mfrc522_register_accesses_total{register="FIFODataReg",access="read"}' in text
+    assert 'mfrc522_command_duration_seconds_count{command="READ"} 1' in text
+    server = metrics.serve(port=0)
+    try:
+        assert urlopen("http://127.0.0.1:{}/metrics".format(server.server_address[1])).read().decode("utf-8") == metrics.prometheus()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_reset():
+    metrics = Metrics()
+    session(metrics)
+    metrics.reset()
+    assert metrics.snapshot()["transactions"] == 0
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import pytest
+
+from MFRC522 import MFRC522
+from MFRC522Pool import MFRC522Pool
+from simulator import SimulatedTransport, VirtualClassic1K
+
+PRESENCE = dict(min_interval=0, max_interval=0, present_interval=0)
+
+
+class ClosingTransport(SimulatedTransport):
+    def __init__(self, *args, **kwargs):
+        SimulatedTransport.__init__(self, *args, **kwargs)
+        self.closed = 0
+
+    def close(self):
+        self.closed += 1
+
+
+def test_pool_reports_every_lane():
+    pool = MFRC522Pool(**PRESENCE)
+    pool.add("lane1", transport=SimulatedTransport([VirtualClassic1K(uid=[1, 2, 3, 4])]))
+    pool.add("lane2", transport=SimulatedTransport([VirtualClassic1K(uid=[5, 6, 7, 8])]))
+    events = []
+    for _ in range(0, 4):
+        events += pool.poll()
+    assert sorted((name, event, bytes(uid)) for (name, event, uid) in events) == [
+        ("lane1", MFRC522.CARD_ARRIVED, bytes([1, 2, 3, 4])),
+        ("lane2", MFRC522.CARD_ARRIVED, bytes([5, 6, 7, 8])),
+    ]
+    stats = pool.stats()
+    assert stats["lane1"]["polls"] == stats["lane2"]["polls"] == 2
+    assert stats["lane1"]["arrivals"] == 1
+
+
+def test_priority_schedule():
+    pool = MFRC522Pool(schedule=MFRC522Pool.SCHEDULE_PRIORITY, **PRESENCE)
+    pool.add("low", transport=SimulatedTransport())
+    pool.add("high", transport=SimulatedTransport(), priority=2)
+    for _ in range(0, 3):
+        pool.poll()
+    assert pool.stats()["high"]["polls"] == 3
+    assert pool.stats()["low"]["polls"] == 0
+
+
+def test_unknown_schedule():
+    with pytest.raises(ValueError):
+        MFRC522Pool(schedule="random")
+
+
+def test_remove_closes_once():
+    pool = MFRC522Pool(**PRESENCE)
+    bus = ClosingTransport()
+    reader = pool.add("lane1", transport=bus)
+    with pytest.raises(ValueError):
+        pool.add("lane1", transport=SimulatedTransport())
+    pool.close()
+    assert pool.readers == {}
+    reader.Close()
+    del reader
+    assert bus.closed == 1
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+from MFRC522 import MFRC522, CardPresence
+
+from helpers import UID, simulated
+
+
+def test_presence_debounces_departure():
+    presence = CardPresence(debounce=2)
+    assert presence.update(bytes(UID)) == [(MFRC522.CARD_ARRIVED, bytes(UID))]
+    assert presence.update(None) == []
+    assert presence.update(bytes(UID)) == []
+    assert presence.update(None) == []
+    assert presence.update(None) == [(MFRC522.CARD_DEPARTED, bytes(UID))]
+
+
+def test_presence_backs_off_while_empty():
+    presence = CardPresence(min_interval=0.01, max_interval=0.05, present_interval=0.02, backoff=2.0)
+    intervals = []
+    for _ in range(0, 5):
+        presence.update(None)
+        intervals.append(presence.interval)
+    assert intervals == [0.01, 0.02, 0.04, 0.05, 0.05]
+    presence.update(bytes(UID))
+    assert presence.interval == 0.02
+
+
+def test_presence_reports_swapped_tags():
+    presence = CardPresence()
+    presence.update(b"\x01\x02\x03\x04")
+    assert presence.update(b"\x05\x06\x07\x08") == [
+        (MFRC522.CARD_DEPARTED, b"\x01\x02\x03\x04"),
+        (MFRC522.CARD_ARRIVED, b"\x05\x06\x07\x08"),
+    ]
+
+
+def test_cards_streams_events():
+    (reader, bus) = simulated()
+    polls = []
+
+    def stop():
+        # The tag leaves the field after the third poll
+        polls.append(None)
+        if len(polls) == 4:
+            bus.cards = []
+        return len(polls) > 8
+
+    events = list(reader.cards(min_interval=0, max_interval=0, present_interval=0, stop=stop))
+    assert events == [(MFRC522.CARD_ARRIVED, bytes(UID)), (MFRC522.CARD_DEPARTED, bytes(UID))]
+
+
+def test_poll_finds_halted_tag():
+    (reader, bus) = simulated()
+    assert bytes(reader.Poll()) == bytes(UID)
+    reader.Halt()
+    assert bytes(reader.Poll()) == bytes(UID)
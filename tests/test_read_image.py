@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+from image import ClassicImage
+from layout import CLASSIC_1K
+from simulator import VirtualClassic1K
+
+from helpers import KEY, UID, select, simulated
+
+
+class CountingCard(VirtualClassic1K):
+    def __init__(self, *args, **kwargs):
+        VirtualClassic1K.__init__(self, *args, **kwargs)
+        self.authentications = 0
+
+    def authenticate(self, auth_mode, block, key, uid):
+        self.authentications += 1
+        return VirtualClassic1K.authenticate(self, auth_mode, block, key, uid)
+
+
+def test_read_image_authenticates_every_sector_once():
+    card = CountingCard(uid=UID)
+    for block in CLASSIC_1K.data_blocks:
+        card.blocks[block] = [block] * 16
+    (reader, bus) = simulated([card])
+    (uid, sak) = select(reader)
+    image = reader.ReadImage(KEY, uid)
+    assert card.authentications == CLASSIC_1K.sectors
+    assert image.read_blocks == set(range(0, CLASSIC_1K.blocks))
+    assert len(image.buffer) == CLASSIC_1K.size
+    assert all(bytes(image.block(block)) == bytes([block] * 16) for block in CLASSIC_1K.data_blocks)
+    assert bytes(image.block(0))[0:4] == bytes(UID)
+    # Key A never reads back
+    assert bytes(image.trailer(1))[0:6] == bytes(6)
+
+
+def test_read_image_sectors():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    image = reader.ReadImage(KEY, uid, sectors=[2, 5])
+    assert image.read_blocks == set(range(8, 12)) | set(range(20, 24))
+    assert bytes(image.sector(3)) == bytes(64)
+
+
+def test_image_copy():
+    image = ClassicImage()
+    image.block(4)[:] = bytes([0x44] * 16)
+    image.read_blocks.update([4, 5])
+    copy = image.copy([4])
+    assert copy.read_blocks == set([4])
+    assert bytes(copy.block(4)) == bytes([0x44] * 16)
+    image.block(4)[0] = 0
+    assert copy.block(4)[0] == 0x44
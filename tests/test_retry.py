@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import time
+
+import pytest
+
+import errors
+from layout import CLASSIC_1K
+from MFRC522 import MFRC522
+from retry import OperationResult, RetryPolicy
+from simulator import SimulatedTransport, VirtualClassic1K
+
+from helpers import KEY, READ_ONLY, UID, select, simulated
+
+
+def test_backoff_grows():
+    policy = RetryPolicy(attempts=5, backoff=0.01, factor=2.0, max_backoff=0.03)
+    assert [policy.delay(attempts) for attempts in range(1, 5)] == [0.01, 0.02, 0.03, 0.03]
+    with pytest.raises(ValueError):
+        RetryPolicy(attempts=0)
+
+
+def test_retry_under_dropout():
+    card = VirtualClassic1K(uid=[1, 2, 3, 4])
+    for block in CLASSIC_1K.data_blocks:
+        card.blocks[block] = [block] * 16
+    bus = SimulatedTransport([card], seed=3)
+    reader = MFRC522(transport=bus, retry=RetryPolicy(attempts=8, backoff=0.0))
+    (uid, sak) = select(reader)
+    bus.dropout = 0.02
+    image = reader.ReadImage(KEY, uid)
+    assert bus.dropouts > 0
+    assert any(result.attempts > 1 for result in reader.results)
+    assert all(result.ok for result in reader.results)
+    assert len(image.read_blocks) == CLASSIC_1K.blocks
+    assert all(bytes(image.block(block)) == bytes([block] * 16) for block in CLASSIC_1K.data_blocks)
+
+
+def test_read_image_raises_without_retries():
+    bus = SimulatedTransport([VirtualClassic1K(key_a=[0x00] * 6)])
+    reader = MFRC522(transport=bus, retry=RetryPolicy(attempts=1))
+    (uid, sak) = select(reader)
+    with pytest.raises(errors.AuthenticationException) as raised:
+        reader.ReadImage(KEY, uid)
+    assert raised.value.image.read_blocks == set()
+    assert reader.ReadImage(KEY, uid, partial=True).read_blocks == set()
+
+
+def test_denied_write_is_not_retried():
+    (reader, bus) = simulated([VirtualClassic1K(uid=UID, access=READ_ONLY)], retry=RetryPolicy(attempts=5, backoff=1.0))
+    (uid, sak) = select(reader)
+    started = time.monotonic()
+    assert reader.WriteText(KEY, uid, "denied") == []
+    assert time.monotonic() - started < 0.5
+    write = reader.results[-1]
+    assert (write.operation, write.block, write.ok, write.attempts, write.denied) == ("write", 4, False, 1, True)
+
+
+def test_transient_failure_is_not_denied():
+    (reader, bus) = simulated(retry=RetryPolicy(attempts=2, backoff=0.0))
+    (uid, sak) = select(reader)
+    reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    bus.dropout = 1.0
+    assert reader.Read(4) is None
+    read = reader.results[-1]
+    assert (read.ok, read.attempts, read.denied) == (False, 2, False)
+    assert repr(read) == repr(OperationResult("read", 4, False, 2, False))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+from helpers import simulated
+
+
+def test_bit_masks_read_shadowed_registers_from_memory():
+    (reader, bus) = simulated()
+    reader.Write_MFRC522(reader.BitFramingReg, 0x00)
+    bus.reset_counters()
+    reader.SetBitMask(reader.BitFramingReg, 0x80)
+    reader.ClearBitMask(reader.BitFramingReg, 0x80)
+    assert bus.register_reads[reader.BitFramingReg] == 0
+    assert bus.register_writes[reader.BitFramingReg] == 2
+    assert bus.registers[reader.BitFramingReg] == reader.shadow[reader.BitFramingReg]
+
+
+def test_volatile_registers_are_never_shadowed():
+    (reader, bus) = simulated()
+    reader.Write_MFRC522(reader.CommIrqReg, 0x7F)
+    bus.reset_counters()
+    reader.Read_MFRC522(reader.CommIrqReg)
+    reader.Read_MFRC522(reader.CommIrqReg)
+    assert reader.CommIrqReg not in reader.shadow
+    assert bus.register_reads[reader.CommIrqReg] == 2
+
+
+def test_first_read_fills_the_shadow():
+    (reader, bus) = simulated()
+    reader.shadow.pop(reader.RFCfgReg, None)
+    bus.reset_counters()
+    value = reader.Read_MFRC522(reader.RFCfgReg)
+    assert reader.Read_MFRC522(reader.RFCfgReg) == value
+    assert bus.register_reads[reader.RFCfgReg] == 1
+
+
+def test_reset_clears_the_shadow():
+    (reader, bus) = simulated()
+    assert reader.shadow
+    reader.Reset()
+    assert reader.shadow == {}
+    reader.Init()
+    assert reader.shadow[reader.ModeReg] == 0x3D
+
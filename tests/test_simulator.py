@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# coding=utf-8
+"""
+The simulated reader and tags themselves. Every test module drives the driver against
+`simulator.SimulatedTransport`, no hardware needed:
+
+    python3 -m pytest tests
+"""
+
+from simulator import SimulatedTransport, VirtualClassic1K
+
+from helpers import KEY, READ_ONLY, UID, select, simulated
+
+
+def test_empty_field():
+    (reader, bus) = simulated([])
+    (status, TagType) = reader.Request(reader.PICC_REQIDL)
+    assert status != reader.MI_OK
+    assert reader.Read_MFRC522(reader.VersionReg) == SimulatedTransport.VERSION
+
+
+def test_halted_tag_only_answers_wake_up():
+    (reader, bus) = simulated()
+    select(reader)
+    reader.Halt()
+    assert bus.cards[0].state == VirtualClassic1K.STATE_HALT
+    assert reader.Request(reader.PICC_REQIDL)[0] != reader.MI_OK
+    assert reader.Request(reader.PICC_REQALL)[0] == reader.MI_OK
+    assert reader.SelectCascade()[0] == reader.MI_OK
+    assert bus.cards[0].state == VirtualClassic1K.STATE_ACTIVE
+
+
+def test_wrong_key_resets_tag():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, [0x00] * 6, uid) != reader.MI_OK
+    assert bus.cards[0].state == VirtualClassic1K.STATE_IDLE
+    assert reader.Read_MFRC522(reader.Status2Reg) & 0x08 == 0
+
+
+def test_access_bits_deny_write():
+    card = VirtualClassic1K(uid=UID, access=READ_ONLY)
+    card.blocks[4] = [0x42] * 16
+    (reader, bus) = simulated([card])
+    (uid, sak) = select(reader)
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid) == reader.MI_OK
+    assert bytes(reader.Read(4)) == bytes([0x42] * 16)
+    assert reader.Write(4, [0x00] * 16) != reader.MI_OK
+    assert card.blocks[4] == [0x42] * 16
+    # Key A of the trailer never reads back
+    select(reader)
+    reader.Auth(reader.PICC_AUTHENT1A, 7, KEY, uid)
+    assert bytes(reader.Read(7))[0:6] == bytes(6)
+
+
+def test_dropout_resets_tags():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid) == reader.MI_OK
+    bus.dropout = 1.0
+    assert reader.Read(4) is None
+    assert bus.dropouts > 0
+    assert bus.cards[0].state == VirtualClassic1K.STATE_IDLE
+
+
+def test_overclocked_link_flips_bits():
+    bus = SimulatedTransport(spd=20000000, max_speed=10000000)
+    versions = set(bus.transfer([0x80 | (SimulatedTransport.VersionReg << 1), 0x00])[1] for _ in range(0, 14))
+    assert versions == set([SimulatedTransport.VERSION, SimulatedTransport.VERSION ^ 0x01])
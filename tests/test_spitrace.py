@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import pytest
+
+import errors
+import spitrace
+from MFRC522 import MFRC522
+from simulator import SimulatedTransport, VirtualClassic1K
+
+from helpers import KEY, select
+
+
+def session(reader):
+    (uid, sak) = select(reader)
+    text = reader.ReadImage(KEY, uid).text()
+    reader.WriteText(KEY, uid, "trace me")
+    return (uid, text, reader.ReadImage(KEY, uid, [1]).text())
+
+
+def test_trace_replay(tmp_path):
+    path = str(tmp_path / "session.trace")
+    reader = MFRC522(transport=SimulatedTransport([VirtualClassic1K()]), trace=path)
+    recorded = session(reader)
+    reader.Close()
+
+    replay = MFRC522(transport=spitrace.ReplayTransport(path))
+    assert session(replay) == recorded
+    with pytest.raises(errors.TraceException):
+        replay.Request(replay.PICC_REQIDL)
+
+
+class NullTransport:
+    def transfer(self, data):
+        return bytes(len(data))
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("capacity", [100, 1000])
+def test_trace_ring_wraps(tmp_path, capacity):
+    path = str(tmp_path / "ring.trace")
+    recorder = spitrace.TraceRecorder(NullTransport(), path, capacity=capacity)
+    sent = []
+    for i in range(0, 500):
+        data = bytes([i & 0xFF]) + bytes([0x00] * (i % 17))
+        recorder.transfer(data)
+        sent.append(data)
+    recorder.close()
+    (info, records) = spitrace.read_trace(path)
+    assert info["total"] == 500
+    assert 0 < len(records) < 500
+    # The newest records survive, in order
+    assert [record.tx for record in records] == sent[-len(records):]
+    with pytest.raises(errors.TraceException):
+        spitrace.ReplayTransport(path)
+
+
+def test_analyze_attributes_phases(tmp_path):
+    path = str(tmp_path / "session.trace")
+    reader = MFRC522(transport=SimulatedTransport([VirtualClassic1K()]), trace=path, crc_check=True)
+    (uid, sak) = select(reader)
+    reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    reader.Read(4)
+    reader.Close()
+    (info, records) = spitrace.read_trace(path)
+    result = spitrace.analyze(records)
+    assert info["total"] == len(records)
+    assert result["transactions"] == sum(1 for record in records if record.kind == spitrace.KIND_TRANSFER)
+    assert result["exchanges"]["AUTHENT"] == 1
+    # REQA, two anticollision/select frames and the read
+    assert result["exchanges"]["TRANSCEIVE"] >= 3
+    assert result["exchanges"]["CALCCRC"] > 0
+    assert sum(phase["transactions"] for phase in result["phases"].values()) == len(records)
+    assert result["phases"]["wait"]["transactions"] > 0
+    assert spitrace.main(["analyze", path]) == 0
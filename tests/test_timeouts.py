@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import pytest
+
+from MFRC522 import MFRC522
+
+from helpers import KEY, select, simulated
+
+
+@pytest.mark.parametrize("timeouts", [MFRC522.TIMEOUTS, {"request": 500, "write": 20000}, {"slow": 5000000}])
+def test_timer_settings_cover_every_timeout(timeouts):
+    (prescaler, reloads) = MFRC522.TimerSettings(timeouts)
+    assert 0 <= prescaler <= 0xFFF
+    for (name, us) in timeouts.items():
+        ticks = (reloads[name] + 1) * 256
+        seconds = ticks * (2 * prescaler + 1) / float(MFRC522.TIMER_CLOCK)
+        # Rounded up to the next step of the timer, but never shorter
+        assert seconds >= us / 1000000.0 or reloads[name] == 0xFF
+        assert 0 <= reloads[name] <= 0xFF
+
+
+def test_timeouts_can_be_overridden():
+    (reader, bus) = simulated(timeouts={"request": 500, "write": 20000})
+    assert reader.timeouts["request"] == 500
+    assert reader.timeouts["read"] == MFRC522.TIMEOUTS["read"]
+    assert reader.timer_reloads["write"] > reader.timer_reloads["read"]
+    assert bus.registers[reader.TPrescalerReg] == reader.timer_prescaler & 0xFF
+
+
+def test_exchanges_switch_profiles():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    assert bus.registers[reader.TReloadRegH] == reader.timer_reloads["request"]
+    reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    assert bus.registers[reader.TReloadRegH] == reader.timer_reloads["auth"]
+
+
+def test_empty_field_fails_fast():
+    (reader, bus) = simulated([])
+    bus.reset_counters()
+    (status, TagType) = reader.Request(reader.PICC_REQIDL)
+    assert status != reader.MI_OK
+    # The timer interrupt ends the wait at the first poll
+    assert bus.register_reads[reader.CommIrqReg] == 1
+
+
+def test_unchanged_timeout_is_not_written():
+    (reader, bus) = simulated()
+    reader.SetTimeout("read")
+    bus.reset_counters()
+    # Reads and writes share their timeout
+    reader.SetTimeout("read")
+    reader.SetTimeout("write")
+    assert bus.register_writes[reader.TReloadRegH] == 0
+    reader.SetTimeout("request")
+    assert bus.register_writes[reader.TReloadRegH] == 1
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import pytest
+
+import errors
+from image import ClassicImage, decode_value, encode_value
+
+from helpers import KEY, select, simulated
+
+
+@pytest.fixture
+def reader():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    assert reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid) == reader.MI_OK
+    return reader
+
+
+@pytest.mark.parametrize("value, addr", [(0, 4), (100, 5), (-1, 6), (0x7FFFFFFF, 0), (-0x80000000, 0xFF)])
+def test_value_layout(value, addr):
+    data = encode_value(value, addr)
+    assert len(data) == 16
+    assert decode_value(data) == (value, addr)
+
+
+def test_value_layout_rejects():
+    assert decode_value(bytes(16)) is None
+    with pytest.raises(errors.InvalidValueException):
+        encode_value(0x80000000, 4)
+    image = ClassicImage()
+    image.set_value(5, -7)
+    assert image.value(5) == (-7, 5)
+
+
+def test_increment_decrement_restore(reader):
+    assert reader.FormatValue(4, 100) == reader.MI_OK
+    assert reader.Increment(4, 25) == reader.MI_OK
+    assert reader.Decrement(4, 5) == reader.MI_OK
+    assert reader.ReadValue(4) == 120
+    # Backup to another block of the sector
+    assert reader.Restore(4, 5) == reader.MI_OK
+    assert reader.ReadValue(5) == 120
+    assert reader.Decrement(4, 200, transferAddr=6) == reader.MI_OK
+    assert reader.ReadValue(6) == -80
+    assert reader.ReadValue(4) == 120
+
+
+def test_value_ops_need_a_value_block(reader):
+    assert reader.Write(4, [0x00] * 16) == reader.MI_OK
+    assert reader.Increment(4, 1) == reader.MI_ERR
+    assert reader.ReadValue(4) is None
+    with pytest.raises(errors.InvalidValueException):
+        reader.Increment(4, -1)
+
+
+def test_update_values_reports_results():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    reader.Auth(reader.PICC_AUTHENT1A, 4, KEY, uid)
+    reader.FormatValue(4, 10)
+    reader.FormatValue(8, 10)
+    assert reader.UpdateValues(KEY, uid, {4: 5, 8: -3, 9: 1}) == [4, 8]
+    assert [(result.operation, result.block, result.ok) for result in reader.results] == [
+        ("auth", 4, True), ("value", 4, True), ("transfer", 4, True),
+        ("auth", 8, True), ("value", 8, True), ("transfer", 8, True),
+        ("value", 9, False),
+    ]
+    reader.Reselect(uid)
+    reader.Auth(reader.PICC_AUTHENT1A, 8, KEY, uid)
+    assert reader.ReadValue(8) == 7
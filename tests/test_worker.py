@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from image import ClassicImage
+from MFRC522Worker import MFRC522Worker
+from simulator import VirtualClassic1K
+
+from helpers import KEY, UID, simulated
+
+LONG_UID = [0x81, 2, 3, 4, 5, 6, 7]
+
+
+@pytest.fixture
+def worker():
+    card = VirtualClassic1K(uid=UID)
+    card.blocks[4] = [0x04] * 16
+    (reader, bus) = simulated([card])
+    worker = MFRC522Worker(reader)
+    yield worker
+    worker.close()
+
+
+def blocked(worker):
+    """
+    Returns:
+        threading.Event: Keeps the worker thread busy until it is set.
+    """
+    release = threading.Event()
+    started = threading.Event()
+
+    def wait():
+        started.set()
+        release.wait(5)
+    worker.submit(wait)
+    started.wait(5)
+    return release
+
+
+def test_poll_feeds_presence(worker):
+    events = []
+    worker.subscribe(lambda event, uid: events.append((event, bytes(uid))))
+    assert bytes(worker.poll().result(5)) == bytes(UID)
+    assert bytes(worker.current) == bytes(UID)
+    assert events == [(MFRC522Worker.CARD_ARRIVED, bytes(UID))]
+
+
+def test_read_and_write_the_current_tag(worker):
+    worker.poll().result(5)
+    image = worker.read_sector(KEY, 1).result(5)
+    assert bytes(image.block(4)) == bytes([0x04] * 16)
+    image = ClassicImage()
+    image.block(5)[:] = bytes([0x05] * 16)
+    assert worker.write_image(KEY, image, blocks=[5]).result(5) == [5]
+    assert bytes(worker.read_sector(KEY, 1).result(5).block(5)) == bytes([0x05] * 16)
+
+
+def test_long_uid():
+    (reader, bus) = simulated([VirtualClassic1K(uid=LONG_UID)])
+    worker = MFRC522Worker(reader)
+    try:
+        assert list(worker.poll().result(5)) == LONG_UID
+        assert worker.read_sector(KEY, 1).result(5).read_blocks == set(range(4, 8))
+    finally:
+        worker.close()
+
+
+def test_no_tag(worker):
+    assert worker.read_sector(KEY, 1).result(5) is None
+
+
+def test_priorities_and_coalescing(worker):
+    order = []
+    release = blocked(worker)
+    worker.submit(order.append, "poll", priority=MFRC522Worker.PRIORITY_POLL)
+    first = worker.submit(order.append, "read", coalesce="read")
+    assert worker.submit(order.append, "read again", coalesce="read") is first
+    worker.submit(order.append, "write", priority=MFRC522Worker.PRIORITY_HIGH)
+    # Moved up, but still run once
+    assert worker.submit(order.append, "read", priority=MFRC522Worker.PRIORITY_HIGH, coalesce="read") is first
+    release.set()
+    worker.submit(lambda: None, priority=MFRC522Worker.PRIORITY_POLL).result(5)
+    assert order == ["write", "read", "poll"]
+
+
+def test_errors_reach_the_caller(worker):
+    with pytest.raises(ZeroDivisionError):
+        worker.call(lambda: 1 // 0).result(5)
+    assert worker.call(lambda: 42).result(5) == 42
+
+
+def test_close_cancels_pending(worker):
+    release = blocked(worker)
+    pending = worker.call(lambda: None)
+    closing = threading.Thread(target=worker.close)
+    closing.start()
+    # Only let the busy operation finish once the worker is told to stop
+    while not worker.__stopped__:
+        time.sleep(0.001)
+    release.set()
+    closing.join(5)
+    with pytest.raises(CancelledError):
+        pending.result(5)
+    with pytest.raises(RuntimeError):
+        worker.call(lambda: None)
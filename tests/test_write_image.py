@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import pytest
+
+import errors
+from image import ClassicImage
+
+from helpers import KEY, select, simulated
+
+
+def writes(reader):
+    return [result.block for result in reader.results if result.operation == "write"]
+
+
+def test_only_changed_blocks_are_written():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    current = reader.ReadImage(KEY, uid)
+    image = current.copy()
+    image.block(5)[:] = bytes([0x55] * 16)
+    image.block(9)[:] = bytes([0x99] * 16)
+    assert image.diff(current) == [5, 9]
+    assert reader.WriteImage(KEY, uid, image, current=current) == [5, 9]
+    assert writes(reader) == [5, 9]
+    assert bus.cards[0].blocks[9] == [0x99] * 16
+    # current follows the tag, writing again changes nothing
+    assert reader.WriteImage(KEY, uid, image, current=current) == []
+    assert reader.results == []
+
+
+def test_unknown_blocks_are_read_first():
+    (reader, bus) = simulated()
+    bus.cards[0].blocks[4] = [0x44] * 16
+    (uid, sak) = select(reader)
+    image = ClassicImage()
+    image.block(4)[:] = bytes([0x44] * 16)
+    image.block(5)[:] = bytes([0x55] * 16)
+    assert reader.WriteImage(KEY, uid, image, blocks=[4, 5]) == [5]
+    assert [result.operation for result in reader.results] == ["auth", "read", "read", "write"]
+
+
+def test_full_write_and_verify():
+    (reader, bus) = simulated()
+    (uid, sak) = select(reader)
+    image = ClassicImage()
+    assert reader.WriteImage(KEY, uid, image, blocks=[0, 4, 5], incremental=False, verify=True) == [4, 5]
+
+
+def test_verify_detects_lost_write():
+    (reader, bus) = simulated()
+    card = bus.cards[0]
+    frame = card.frame
+
+    def forgetful(data, bits):
+        # Acknowledges the data of a write without storing it
+        before = [list(block) for block in card.blocks]
+        response = frame(data, bits)
+        card.blocks[:] = before
+        return response
+
+    (uid, sak) = select(reader)
+    card.frame = forgetful
+    image = ClassicImage()
+    image.block(4)[:] = bytes([0x44] * 16)
+    with pytest.raises(errors.VerificationException):
+        reader.WriteImage(KEY, uid, image, blocks=[4], verify=True)
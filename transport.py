@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+import RPi.GPIO as GPIO
+import spi
+
+
+class SpiTransport:
+    """
+    Transport that talks to a physical MFRC522 through SPI-Py and RPi.GPIO.
+
+    A transport is anything providing `transfer(data)`, `set_reset(level)`,
+    `wait_for_irq(timeout)` and `close()`, optionally `set_speed(spd)`. `transfer` clocks
+    the passed bytes out in one SPI transaction and returns the bytes clocked in at the
+    same time. See `simulator.SimulatedTransport` for a software stand-in.
+
+    Several transports can live in one process. SPI-Py only keeps one device open at a
+    time, so the device is reopened whenever a transport on another socket (or speed)
+    was used in between. Readers sharing a socket can be told apart by a GPIO driven
+    chip select line, which is pulled low for the duration of every transaction. The
+    hardware chip select of the socket is asserted all the same, so it must not select a
+    reader of its own: leave it unconnected and keep readers on hardware chip selects on
+    another bus.
+
+    Args:
+        dev (string): The socket to use. "/dev/spidev0.0" by default.
+        spd (int): The speed at which to clock. 1000000 by default.
+        reset_pin (int): The board pin wired to the RST/NRSTPD line. 22 by default.
+        irq_pin (int): The board pin wired to the IRQ line. None (not wired) by default.
+        cs_pin (int): The board pin wired to the SDA (chip select) line. None (hardware chip select of `dev`) by default.
+    """
+    # (dev, spd) currently opened by SPI-Py
+    __opened__ = None
+
+    def __init__(self, dev='/dev/spidev0.0', spd=1000000, reset_pin=22, irq_pin=None, cs_pin=None):
+        self.dev = dev
+        self.spd = spd
+        self.reset_pin = reset_pin
+        self.irq_pin = irq_pin
+        self.cs_pin = cs_pin
+        self.__open__()
+        GPIO.setmode(GPIO.BOARD)
+        GPIO.setup(self.reset_pin, GPIO.OUT)
+        if self.irq_pin is not None:
+            GPIO.setup(self.irq_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        if self.cs_pin is not None:
+            GPIO.setup(self.cs_pin, GPIO.OUT, initial=GPIO.HIGH)
+
+    def __open__(self):
+        if SpiTransport.__opened__ is not None:
+            spi.closeSPI()
+        spi.openSPI(device=self.dev, speed=self.spd)
+        SpiTransport.__opened__ = (self.dev, self.spd)
+
+    def transfer(self, data):
+        if SpiTransport.__opened__ != (self.dev, self.spd):
+            self.__open__()
+        if self.cs_pin is None:
+            return spi.transfer(tuple(data))
+        GPIO.output(self.cs_pin, GPIO.LOW)
+        try:
+            return spi.transfer(tuple(data))
+        finally:
+            GPIO.output(self.cs_pin, GPIO.HIGH)
+
+    def set_speed(self, spd):
+        """Change the SPI clock, the device is reopened with the next transfer."""
+        self.spd = spd
+
+    def set_reset(self, level):
+        GPIO.output(self.reset_pin, level)
+
+    def wait_for_irq(self, timeout):
+        """
+        Block until the (active low) IRQ line is asserted.
+
+        Args:
+            timeout (int): The maximum time to wait in milliseconds.
+
+        Returns:
+            boolean: Whether or not the line got asserted in time.
+        """
+        # The line may have been asserted before we got here, in which case there is no edge left to wait for
+        if GPIO.input(self.irq_pin) == GPIO.LOW:
+            return True
+        return GPIO.wait_for_edge(self.irq_pin, GPIO.FALLING, timeout=timeout) is not None
+
+    def close(self):
+        # Only release our own pins, other readers in the same process keep working
+        GPIO.cleanup([pin for pin in (self.reset_pin, self.irq_pin, self.cs_pin) if pin is not None])